@@ -0,0 +1,18 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('albums', '0003_alter_album_image'),
+        ('artists', '0010_artist_artist_created_at_uuid_idx'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='album',
+            index=models.Index(fields=['created_at'], name='album_created_at_idx'),
+        ),
+    ]
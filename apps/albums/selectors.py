@@ -4,11 +4,15 @@ from rest_framework.exceptions import APIException
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
-from apps.albums.serializers import AlbumSerializer
+from apps.albums.serializers import AlbumSerializer, compiled_album_serializer
+from apps.core import json_lists
+from apps.core.loaders import load_album_relations, load_music_relations
 from apps.core.models import Album, Music
+from apps.core.pagination import RawQueryList
+from apps.core.rows import fetch_records
 from apps.core.utils import convert_tuples_to_dicts
-from apps.musics.serializers import MusicSerializer
-from apps.users.utils import get_payload
+from apps.musics.serializers import compiled_music_serializer
+from apps.users.principal import get_principal
 
 
 class AlbumSelector:
@@ -18,106 +22,73 @@ class AlbumSelector:
         self.request = request
         self.page_size = request.query_params.get("page_size", 10)
 
-    def get_album_artist(self, user_id):
-        with connection.cursor() as c:
-            ###### Get artist id from user id
-            c.execute(
-                """
-                SELECT uuid
-                FROM artists_artist
-                WHERE user_id = %s
-                """,
-                [user_id],
-            )
-            artist = c.fetchone()
-            if artist is None:
-                return Response(
-                    {"detail": "Artist not found"}, status=status.HTTP_404_NOT_FOUND
-                )
-            artist_id = artist[0]
-
-            ##### Get albums by artist
-            c.execute(
-                """
-                SELECT  a.*
-                FROM albums_album a
-                JOIN artists_artist b ON a.owner_id = b.uuid
-                WHERE a.owner_id = %s
-                """,
-                [artist_id],
-            )
-            albums = c.fetchall()
-            columns = [col[0] for col in c.description]
-            if albums is None:
-                raise APIException("Albums not found", status.HTTP_404_NOT_FOUND)
-            albums_dict = convert_tuples_to_dicts(albums, columns)
-            albums_instance = [Album(**album) for album in albums_dict]
-
-            # paginate
-            paginator = PageNumberPagination()
-            paginator.page_size = self.page_size
-            paginated_albums = paginator.paginate_queryset(
-                albums_instance, request=self.request
-            )
+    def paginate_albums(self, query, count_query, params=None):
+        paginator = PageNumberPagination()
+        paginator.page_size = self.page_size
 
-            serializer = AlbumSerializer(paginated_albums, many=True)
-            return Response(
-                paginator.get_paginated_response(serializer.data).data,
-                status=status.HTTP_200_OK,
+        if json_lists.enabled():
+            albums = json_lists.JSONQueryList(
+                json_lists.album_object, query, count_query, params
             )
-
-    def get_album_manager(self, user_id):
-        with connection.cursor() as c:
-            # Get manager id from user id
-            c.execute(
-                """
-                SELECT uuid
-                FROM profiles_userprofile
-                WHERE user_id = %s
-                """,
-                [user_id],
-            )
-            manager = c.fetchone()
-            if manager is None:
-                raise APIException("Manager not found", status.HTTP_404_NOT_FOUND)
-            manager_id = manager[0]
-
-            # Get albums of manager's artists
-            c.execute(
-                """
-                SELECT  a.*
-                FROM albums_album a
-                JOIN artists_artist b ON a.owner_id = b.uuid
-                WHERE b.manager_id = %s
-                """,
-                [manager_id],
-            )
-            albums = c.fetchall()
-            columns = [col[0] for col in c.description]
-            if albums is None:
-                return APIException("Albums not found", status.HTTP_404_NOT_FOUND)
-            albums_dict = convert_tuples_to_dicts(albums, columns)
-            albums_instance = [Album(**album) for album in albums_dict]
-
-            # paginate
-            paginator = PageNumberPagination()
-            paginator.page_size = self.page_size
-            paginated_artists = paginator.paginate_queryset(
-                albums_instance, request=self.request
-            )
-
-            serializer = AlbumSerializer(paginated_artists, many=True)
+            page = paginator.paginate_queryset(albums, request=self.request)
+            return json_lists.page_response(paginator, page)
+
+        albums = RawQueryList(
+            Album, f"{query} ORDER BY a.created_at, a.uuid", count_query, params
+        )
+        paginated_albums = paginator.paginate_queryset(albums, request=self.request)
+
+        load_album_relations(paginated_albums)
+        data = compiled_album_serializer.many(paginated_albums)
+        return Response(
+            paginator.get_paginated_response(data).data,
+            status=status.HTTP_200_OK,
+        )
+
+    def get_album_artist(self, artist_id):
+        if artist_id is None:
             return Response(
-                paginator.get_paginated_response(serializer.data).data,
-                status=status.HTTP_200_OK,
+                {"detail": "Artist not found"}, status=status.HTTP_404_NOT_FOUND
             )
+        return self.paginate_albums(
+            """
+            SELECT a.*
+            FROM albums_album a
+            WHERE a.owner_id = %s
+            """,
+            """
+            SELECT count(*)
+            FROM albums_album a
+            WHERE a.owner_id = %s
+            """,
+            [artist_id],
+        )
+
+    def get_album_manager(self, manager_id):
+        if manager_id is None:
+            raise APIException("Manager not found", status.HTTP_404_NOT_FOUND)
+        # Albums of the manager's artists
+        return self.paginate_albums(
+            """
+            SELECT a.*
+            FROM albums_album a
+            JOIN artists_artist b ON a.owner_id = b.uuid
+            WHERE b.manager_id = %s
+            """,
+            """
+            SELECT count(*)
+            FROM albums_album a
+            JOIN artists_artist b ON a.owner_id = b.uuid
+            WHERE b.manager_id = %s
+            """,
+            [manager_id],
+        )
 
     def get_albums(self):
-        user_payload = get_payload(self.headers)
-        if user_payload is None:
+        principal = get_principal(self.request)
+        if principal is None:
             return Response(status=status.HTTP_401_UNAUTHORIZED)
-        user_role = user_payload.get("role", "")  # Get user role
-        user_id = user_payload.get("user_id", "")  # Get user id
+        user_role = principal.role  # Get user role
 
         # Unauthorized other than artist and artist manager
         if (
@@ -128,36 +99,21 @@ class AlbumSelector:
             return Response(status=status.HTTP_401_UNAUTHORIZED)
 
         if user_role == "ARTIST":
-            return self.get_album_artist(user_id)
+            return self.get_album_artist(principal.artist_id)
 
         if user_role == "ARTIST_MANAGER":
-            return self.get_album_manager(user_id)
-
-        with connection.cursor() as c:
-            c.execute(
-                """
-                SELECT * FROM albums_album
-                """
-            )
-            albums = c.fetchall()
-            columns = [col[0] for col in c.description]
-            if albums is None:
-                raise APIException("Albums not found", status.HTTP_404_NOT_FOUND)
-            albums_dict = convert_tuples_to_dicts(albums, columns)
-            albums_instance = [Album(**album) for album in albums_dict]
-
-            # paginate
-            paginator = PageNumberPagination()
-            paginator.page_size = self.page_size
-            paginated_albums = paginator.paginate_queryset(
-                albums_instance, request=self.request
-            )
-
-            serializer = AlbumSerializer(paginated_albums, many=True)
-            return Response(
-                paginator.get_paginated_response(serializer.data).data,
-                status=status.HTTP_200_OK,
-            )
+            return self.get_album_manager(principal.manager_id)
+
+        return self.paginate_albums(
+            """
+            SELECT a.*
+            FROM albums_album a
+            """,
+            """
+            SELECT count(*)
+            FROM albums_album a
+            """,
+        )
 
     def get_album_by_id(self, uuid):
         with connection.cursor() as c:
@@ -178,7 +134,17 @@ class AlbumSelector:
         serializer = AlbumSerializer(album_instance[0])
 
         # Get musics by album id
-        musics = Music.objects.filter(album__uuid=uuid)
+        with connection.cursor() as c:
+            c.execute(
+                """
+                SELECT m.*
+                FROM musics_music m
+                WHERE m.album_id = %s
+                ORDER BY m.created_at, m.uuid
+                """,
+                [uuid],
+            )
+            musics = load_music_relations(fetch_records(c, Music))
         response_data = serializer.data
-        response_data["musics"] = MusicSerializer(musics, many=True).data
+        response_data["musics"] = compiled_music_serializer.many(musics)
         return Response(response_data, status=status.HTTP_200_OK)
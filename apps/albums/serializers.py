@@ -2,6 +2,7 @@ from django.db import connection
 from rest_framework import serializers
 
 from apps.artists.serializers import ArtistSerializer
+from apps.core.compiled import compile_serializer
 from apps.core.models import Artist
 from apps.core.utils import convert_tuples_to_dicts
 
@@ -13,3 +14,7 @@ class AlbumSerializer(serializers.Serializer):
     no_of_tracks = serializers.IntegerField(read_only=True)
     image = serializers.ImageField(required=False, allow_null=True)
     created_at = serializers.DateTimeField(read_only=True)
+
+
+# Read-only fast path generated from the declarations above
+compiled_album_serializer = compile_serializer(AlbumSerializer)
@@ -9,8 +9,9 @@ from rest_framework.response import Response
 
 from apps.albums.selectors import AlbumSelector
 from apps.albums.serializers import AlbumSerializer
+from apps.core import counters
 from apps.core.utils import convert_tuples_to_dicts
-from apps.users.utils import get_payload
+from apps.users.principal import get_principal
 
 
 class AlbumService:
@@ -36,20 +37,19 @@ class AlbumService:
 
     def insert_to_the_database(self, owner_id, image_path):
         data = self.data
-        with connection.cursor() as c:
+        with transaction.atomic(), connection.cursor() as c:
             # Inserting album data into database
             c.execute(
                 """
                 INSERT INTO albums_album
                 (name, owner_id, image, no_of_tracks, created_at, updated_at)
-                VALUES (%s, %s, %s, %s, NOW(), NOW())
+                VALUES (%s, %s, %s, 0, NOW(), NOW())
                 RETURNING uuid, name, owner_id, no_of_tracks, image
                 """,
                 [
                     data.get("name", ""),
                     owner_id,
                     image_path,
-                    data.get("no_of_tracks", 0),
                 ],
             )
             album = c.fetchone()
@@ -57,26 +57,30 @@ class AlbumService:
             if album is None:
                 raise APIException("Error creating an album", status.HTTP_404_NOT_FOUND)
             album_dict = convert_tuples_to_dicts(album, columns)[0]
-            self.increment_album_count(owner_id)
+            counters.album_added(owner_id)
         return Response(album_dict, status=status.HTTP_201_CREATED)
 
     def update_to_the_database(self, album_id, image_path):
         data = self.data
-        with connection.cursor() as c:
+        with transaction.atomic(), connection.cursor() as c:
             # Updating album data into database
             c.execute(
                 """
-                UPDATE albums_album
-                SET name = %s, owner_id = %s, image = %s, no_of_tracks = %s, updated_at = NOW()
-                WHERE uuid = %s
-                RETURNING uuid, name, owner_id, no_of_tracks, image
+                WITH previous AS (
+                    SELECT uuid, owner_id FROM albums_album WHERE uuid = %s FOR UPDATE
+                )
+                UPDATE albums_album a
+                SET name = %s, owner_id = %s, image = %s, updated_at = NOW()
+                FROM previous
+                WHERE a.uuid = previous.uuid
+                RETURNING a.uuid, a.name, a.owner_id, a.no_of_tracks, a.image,
+                    previous.owner_id AS previous_owner_id
                 """,
                 [
+                    album_id,
                     data.get("name", ""),
                     data.get("owner", None),
                     image_path,
-                    data.get("no_of_tracks", 0),
-                    album_id,
                 ],
             )
             album = c.fetchone()
@@ -87,10 +91,12 @@ class AlbumService:
                     status=status.HTTP_400_BAD_REQUEST,
                 )
             album_dict = convert_tuples_to_dicts(album, columns)[0]
+            previous_owner_id = album_dict.pop("previous_owner_id")
+            counters.album_moved(previous_owner_id, album_dict["owner_id"])
         return Response(album_dict, status=status.HTTP_200_OK)
 
     def create_update_album_artist(
-        self, user_id=None, album_id=None, update_image_path=None
+        self, artist_id=None, album_id=None, update_image_path=None
     ):
         data = self.data.copy()  # Making a copy of the data
         image = self.files.get("image", None)
@@ -101,21 +107,8 @@ class AlbumService:
         if album_id:
             return self.update_to_the_database(album_id, image_path)
 
-        with connection.cursor() as c:
-            # Get artist id from user_id
-            c.execute(
-                """
-                SELECT uuid
-                FROM artists_artist
-                WHERE user_id = %s
-                """,
-                [user_id],
-            )
-            artist = c.fetchone()
-        if artist is None:
+        if artist_id is None:
             raise APIException("Error creating an album", status.HTTP_404_NOT_FOUND)
-        artist_dict = convert_tuples_to_dicts(artist, ["uuid"])[0]
-        artist_id = artist_dict["uuid"]
         return self.insert_to_the_database(artist_id, image_path)
 
     def create_album_manager(self):
@@ -131,12 +124,11 @@ class AlbumService:
         return self.insert_to_the_database(owner_id, image_path)
 
     def create_album(self):
-        user_payload = get_payload(self.headers)
-        if user_payload is None:
+        principal = get_principal(self.request)
+        if principal is None:
             return Response(status=status.HTTP_401_UNAUTHORIZED)  # unauthorized user
 
-        user_role = user_payload.get("role", "")
-        user_id = user_payload.get("user_id", "")
+        user_role = principal.role
 
         # Unauthorized other than artist and artist manager
         if (
@@ -147,7 +139,7 @@ class AlbumService:
             return Response(status=status.HTTP_401_UNAUTHORIZED)
 
         if user_role == "ARTIST":
-            return self.create_update_album_artist(user_id=user_id)
+            return self.create_update_album_artist(artist_id=principal.artist_id)
 
         if user_role == "ARTIST_MANAGER" or user_role == "SUPER_ADMIN":
             return self.create_album_manager()
@@ -192,33 +184,8 @@ class AlbumService:
                     [uuid],
                 )
                 is_deleted = c.fetchone()[0]
-                self.decrement_album_count(artist[0])
+                counters.album_removed(artist[0])
 
             if is_deleted is not True:
                 return Response(status=status.HTTP_404_NOT_FOUND)
             return Response(status=status.HTTP_204_NO_CONTENT)
-
-    def increment_album_count(self, uuid):
-        with connection.cursor() as c:
-
-            c.execute(
-                """
-                UPDATE artists_artist
-                SET no_of_album_released = no_of_album_released + 1
-                WHERE uuid = %s
-                """,
-                [uuid],
-            )
-        return
-
-    def decrement_album_count(self, uuid):
-        with connection.cursor() as c:
-            c.execute(
-                """
-                UPDATE artists_artist
-                SET no_of_album_released = no_of_album_released - 1
-                WHERE uuid = %s
-                """,
-                [uuid],
-            )
-        return
@@ -0,0 +1,20 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:14
+
+from django.conf import settings
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('artists', '0009_alter_artist_manager'),
+        ('profiles', '0003_alter_userprofile_first_name_and_more'),
+        migrations.swappable_dependency(settings.AUTH_USER_MODEL),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='artist',
+            index=models.Index(fields=['created_at', 'uuid'], name='artist_created_at_uuid_idx'),
+        ),
+    ]
@@ -7,11 +7,14 @@ from rest_framework.exceptions import APIException
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
-from apps.artists.serializers import ArtistSerializer
+from apps.artists.serializers import ArtistSerializer, compiled_artist_serializer
+from apps.core import json_lists
+from apps.core.loaders import load_artist_relations
 from apps.core.models import Artist
+from apps.core.pagination import RawQueryList
 from apps.core.utils import convert_tuples_to_dicts
 from apps.profiles.selectors import ManagerSelector
-from apps.users.utils import get_payload
+from apps.users.principal import get_principal
 
 
 class ArtistSelector:
@@ -21,40 +24,41 @@ class ArtistSelector:
         self.page_size = request.query_params.get("page_size", 10)
 
     def get_artists_data(self):
-        payload = get_payload(self.headers)
-        if payload is None:
+        principal = get_principal(self.request)
+        if principal is None:
             return Response(status=status.HTTP_401_UNAUTHORIZED)
-        if payload["role"] == "ARTIST":
+        if principal.role == "ARTIST":
             with connection.cursor() as c:
                 c.execute(
                     """
-                    SELECT 
-                    a.name, count(DISTINCT al.uuid) as album, count(DISTINCT mu.uuid) as music
+                    SELECT
+                    a.name, COALESCE(st.album_count, 0), COALESCE(st.music_count, 0)
                     FROM artists_artist a
-                    LEFT JOIN albums_album al ON a.uuid = al.owner_id
-                    LEFT JOIN musics_music mu ON a.uuid = mu.artist_id
+                    LEFT JOIN catalog_stats st
+                    ON st.scope = 'ARTIST' AND st.scope_id = a.uuid
                     WHERE a.user_id = %s
-                    GROUP BY a.name
                     """,
-                    [payload["user_id"]],
+                    [principal.user_id],
                 )
                 artists = c.fetchall()
             if artists is None:
                 return Response(status=status.HTTP_404_NOT_FOUND)
             artists_dict = convert_tuples_to_dicts(artists, ["name", "album", "music"])
             return Response(artists_dict, status=status.HTTP_200_OK)
-        if payload["role"] == "SUPER_ADMIN":
+        if principal.role == "SUPER_ADMIN":
             with connection.cursor() as c:
                 c.execute(
                     """
-                    SELECT 
-                    a.name, count(DISTINCT al.uuid) as album, count(DISTINCT mu.uuid) as music
-                    FROM artists_artist a
-                    LEFT JOIN albums_album al ON a.uuid = al.owner_id
-                    LEFT JOIN musics_music mu ON a.uuid = mu.artist_id
-                    GROUP BY a.name
-                    ORDER BY album DESC
-                    LIMIT 5
+                    SELECT a.name, top.album_count, top.music_count
+                    FROM (
+                        SELECT scope_id, album_count, music_count
+                        FROM catalog_stats
+                        WHERE scope = 'ARTIST'
+                        ORDER BY album_count DESC
+                        LIMIT 5
+                    ) top
+                    JOIN artists_artist a ON a.uuid = top.scope_id
+                    ORDER BY top.album_count DESC
                     """
                 )
                 artists = c.fetchall()
@@ -62,34 +66,23 @@ class ArtistSelector:
                 return Response(status=status.HTTP_404_NOT_FOUND)
             artists_dict = convert_tuples_to_dicts(artists, ["name", "album", "music"])
             return Response(artists_dict, status=status.HTTP_200_OK)
-        if payload["role"] == "ARTIST_MANAGER":
-            user_id = payload["user_id"]
+        if principal.role == "ARTIST_MANAGER":
+            manager_id = principal.manager_id
+            if manager_id is None:
+                return Response(status=status.HTTP_404_NOT_FOUND)
             with connection.cursor() as c:
-                c.execute(
-                    """
-                    SELECT uuid
-                    FROM profiles_userprofile
-                    WHERE user_id = %s
-                    """,
-                    [user_id],
-                )
-                manager = c.fetchone()
-                if manager is None:
-                    return Response(status=status.HTTP_404_NOT_FOUND)
-
                 c.execute(
                     """
                 SELECT
-                a.name, count(DISTINCT al.uuid) as album, count(DISTINCT mu.uuid) as music
+                a.name, COALESCE(st.album_count, 0) as album, COALESCE(st.music_count, 0) as music
                 FROM artists_artist a
-                LEFT JOIN albums_album al ON a.uuid = al.owner_id
-                LEFT JOIN musics_music mu ON a.uuid = mu.artist_id
+                LEFT JOIN catalog_stats st
+                ON st.scope = 'ARTIST' AND st.scope_id = a.uuid
                 WHERE a.manager_id = %s
-                GROUP BY a.name
                 ORDER BY album DESC
                 LIMIT 4
                 """,
-                    [manager[0]],
+                    [manager_id],
                 )
                 artists = c.fetchall()
                 if artists is None:
@@ -97,99 +90,89 @@ class ArtistSelector:
             artists_dict = convert_tuples_to_dicts(artists, ["name", "album", "music"])
             return Response(artists_dict, status=status.HTTP_200_OK)
 
+    def counts_response(self, entities, counts):
+        """
+        Map a ``(total, recent, total, recent, ...)`` row onto the dashboard's
+        ``<entity>_count`` / ``<entity>s_last_15_minutes`` keys.
+        """
+        if counts is None:
+            return Response(status=status.HTTP_404_NOT_FOUND)
+        data = {}
+        for index, entity in enumerate(entities):
+            data[f"{entity}_count"] = counts[2 * index]
+            data[f"{entity}s_last_15_minutes"] = counts[2 * index + 1]
+        return Response(data, status=status.HTTP_200_OK)
+
     def get_artists_count_manager(self, manager_id):
         time_15_minutes_ago = timezone.now() - timedelta(minutes=15)
         with connection.cursor() as c:
             c.execute(
                 """
-            SELECT
-                (SELECT count(*) FROM artists_artist WHERE manager_id = %s),
-                (SELECT count(*) FROM artists_artist WHERE created_at > %s AND manager_id = %s);
-            """,
-                [manager_id, time_15_minutes_ago, manager_id],
-            )
-            artist_result = c.fetchone()
-            c.execute(
-                """
-            SELECT
-                (
-                SELECT count(a.*) FROM albums_album a
-                LEFT JOIN artists_artist ar ON a.owner_id = ar.uuid
-                WHERE ar.manager_id = %s
-                ),
-                (
-                SELECT count(a.*) FROM albums_album a
-                LEFT JOIN artists_artist ar ON a.owner_id = ar.uuid
-                WHERE a.created_at > %s AND ar.manager_id = %s
-                );
-                """,
-                [manager_id, time_15_minutes_ago, manager_id],
-            )
-            album_result = c.fetchone()
-            c.execute(
-                """
-            SELECT
-                (
-                SELECT count(m.*) FROM musics_music m
-                LEFT JOIN artists_artist ar ON m.artist_id = ar.uuid
-                WHERE ar.manager_id = %s
-                ),
-                (
-                SELECT count(m.*) FROM musics_music m
-                LEFT JOIN artists_artist ar ON m.artist_id = ar.uuid
-                WHERE ar.manager_id = %s
-                AND m.created_at > %s
-                );
+                WITH managed AS (
+                    SELECT uuid, created_at FROM artists_artist WHERE manager_id = %s
+                )
+                SELECT
+                    ar.total, ar.recent,
+                    COALESCE(st.album_count, 0), al.recent,
+                    COALESCE(st.music_count, 0), mu.recent
+                FROM
+                    (
+                    SELECT count(*) AS total,
+                        count(*) FILTER (WHERE created_at > %s) AS recent
+                    FROM managed
+                    ) ar,
+                    (
+                    SELECT count(*) AS recent
+                    FROM albums_album a
+                    JOIN managed ON a.owner_id = managed.uuid
+                    WHERE a.created_at > %s
+                    ) al,
+                    (
+                    SELECT count(*) AS recent
+                    FROM musics_music m
+                    JOIN managed ON m.artist_id = managed.uuid
+                    WHERE m.created_at > %s
+                    ) mu
+                    LEFT JOIN catalog_stats st
+                    ON st.scope = 'MANAGER' AND st.scope_id = %s;
                 """,
-                [manager_id, manager_id, time_15_minutes_ago],
+                [manager_id] + [time_15_minutes_ago] * 3 + [manager_id],
             )
-            music_result = c.fetchone()
-        if artist_result is None or album_result is None or music_result is None:
-            return Response(status=status.HTTP_404_NOT_FOUND)
-        return Response(
-            {
-                "artist_count": artist_result[0],
-                "artists_last_15_minutes": artist_result[1],
-                "album_count": album_result[0],
-                "albums_last_15_minutes": album_result[1],
-                "music_count": music_result[0],
-                "musics_last_15_minutes": music_result[1],
-            },
-            status=status.HTTP_200_OK,
-        )
+            counts = c.fetchone()
+        return self.counts_response(["artist", "album", "music"], counts)
 
     def get_artists_count_artist(self, artist_id):
         time_15_minutes_ago = timezone.now() - timedelta(minutes=15)
         with connection.cursor() as c:
             c.execute(
                 """
-                SELECT 
-                (SELECT count(*) FROM albums_album WHERE owner_id = %s),
-                (SELECT count(*) FROM albums_album WHERE created_at > %s AND owner_id = %s);
-                """,
-                [artist_id, time_15_minutes_ago, artist_id],
-            )
-            album_count = c.fetchone()
-            c.execute(
-                """
-                SELECT 
-                (SELECT count(*) FROM musics_music WHERE artist_id = %s),
-                (SELECT count(*) FROM musics_music WHERE created_at > %s AND artist_id = %s);
+                SELECT
+                    COALESCE(st.album_count, 0), al.recent,
+                    COALESCE(st.music_count, 0), mu.recent
+                FROM
+                    (
+                    SELECT count(*) AS recent
+                    FROM albums_album
+                    WHERE owner_id = %s AND created_at > %s
+                    ) al,
+                    (
+                    SELECT count(*) AS recent
+                    FROM musics_music
+                    WHERE artist_id = %s AND created_at > %s
+                    ) mu
+                    LEFT JOIN catalog_stats st
+                    ON st.scope = 'ARTIST' AND st.scope_id = %s;
                 """,
-                [artist_id, time_15_minutes_ago, artist_id],
+                [
+                    artist_id,
+                    time_15_minutes_ago,
+                    artist_id,
+                    time_15_minutes_ago,
+                    artist_id,
+                ],
             )
-            music_count = c.fetchone()
-        if album_count is None or music_count is None:
-            return Response(status=status.HTTP_404_NOT_FOUND)
-        return Response(
-            {
-                "album_count": album_count[0],
-                "albums_last_15_minutes": album_count[1],
-                "music_count": music_count[0],
-                "musics_last_15_minutes": music_count[1],
-            },
-            status=status.HTTP_200_OK,
-        )
+            counts = c.fetchone()
+        return self.counts_response(["album", "music"], counts)
 
     def get_users_count_admin(self):
         time_15_minutes_ago = timezone.now() - timedelta(minutes=15)
@@ -197,65 +180,42 @@ class ArtistSelector:
             c.execute(
                 """
                 SELECT
-                    (SELECT count(p.*) FROM profiles_userprofile p
+                    mg.total, mg.recent, ar.total, ar.recent,
+                    al.total, al.recent, mu.total, mu.recent
+                FROM
+                    (
+                    SELECT count(*) AS total,
+                        count(*) FILTER (WHERE p.created_at > %s) AS recent
+                    FROM profiles_userprofile p
                     JOIN core_user u ON u.uuid = p.user_id
-                    WHERE u.role = 'ARTIST_MANAGER'),
-                    (SELECT count(*) FROM profiles_userprofile p 
-                    JOIN core_user u ON u.uuid = p.user_id
-                    WHERE u.role = 'ARTIST_MANAGER' AND p.created_at > %s);
-                """,
-                [time_15_minutes_ago],
-            )
-            manager_result = c.fetchone()
-            c.execute(
-                """
-                SELECT 
-                    (SELECT count(*) FROM artists_artist),
-                    (SELECT count(*) FROM artists_artist WHERE created_at > %s);
-                """,
-                [time_15_minutes_ago],
-            )
-            artist_result = c.fetchone()
-            c.execute(
-                """
-                SELECT
-                    (SELECT count(*) FROM albums_album),
-                    (SELECT count(*) FROM albums_album WHERE created_at > %s);
-                """,
-                [time_15_minutes_ago],
-            )
-            album_result = c.fetchone()
-            c.execute(
-                """
-                SELECT
-                    (SELECT count(*) FROM musics_music),
-                    (SELECT count(*) FROM musics_music WHERE created_at > %s);
+                    WHERE u.role = 'ARTIST_MANAGER'
+                    ) mg,
+                    (
+                    SELECT count(*) AS total,
+                        count(*) FILTER (WHERE created_at > %s) AS recent
+                    FROM artists_artist
+                    ) ar,
+                    (
+                    SELECT count(*) AS total,
+                        count(*) FILTER (WHERE created_at > %s) AS recent
+                    FROM albums_album
+                    ) al,
+                    (
+                    SELECT count(*) AS total,
+                        count(*) FILTER (WHERE created_at > %s) AS recent
+                    FROM musics_music
+                    ) mu;
                 """,
-                [time_15_minutes_ago],
+                [time_15_minutes_ago] * 4,
             )
-            music_result = c.fetchone()
-        if artist_result is None or album_result is None or music_result is None:
-            return Response(status=status.HTTP_404_NOT_FOUND)
-        return Response(
-            {
-                "manager_count": manager_result[0],
-                "managers_last_15_minutes": manager_result[1],
-                "artist_count": artist_result[0],
-                "artists_last_15_minutes": artist_result[1],
-                "album_count": album_result[0],
-                "albums_last_15_minutes": album_result[1],
-                "music_count": music_result[0],
-                "musics_last_15_minutes": music_result[1],
-            },
-            status=status.HTTP_200_OK,
-        )
+            counts = c.fetchone()
+        return self.counts_response(["manager", "artist", "album", "music"], counts)
 
     def get_artists_count(self):
-        payload = get_payload(self.headers)
-        if payload is None:
+        principal = get_principal(self.request)
+        if principal is None:
             return Response(status=status.HTTP_401_UNAUTHORIZED)
-        user_id = payload["user_id"]
-        role = payload["role"]
+        role = principal.role
         if role != "ARTIST_MANAGER" and role != "ARTIST" and role != "SUPER_ADMIN":
             return Response(status=status.HTTP_401_UNAUTHORIZED)
 
@@ -263,101 +223,77 @@ class ArtistSelector:
             return self.get_users_count_admin()
 
         if role == "ARTIST_MANAGER":
-            with connection.cursor() as c:
-                c.execute(
-                    """
-                    SELECT uuid
-                    FROM profiles_userprofile
-                    WHERE user_id = %s
-                    """,
-                    [user_id],
-                )
-                manager = c.fetchone()
-                if manager is None:
-                    raise APIException("Manager not found", status.HTTP_404_NOT_FOUND)
-            manager_id = manager[0]
+            manager_id = principal.manager_id
+            if manager_id is None:
+                raise APIException("Manager not found", status.HTTP_404_NOT_FOUND)
             return self.get_artists_count_manager(manager_id)
 
         if role == "ARTIST":
-            with connection.cursor() as c:
-                c.execute(
-                    """
-                    SELECT uuid
-                    FROM artists_artist
-                    WHERE user_id = %s
-                    """,
-                    [user_id],
-                )
-                artist = c.fetchone()
-                if artist is None:
-                    raise APIException("Artist not found", status.HTTP_404_NOT_FOUND)
-                artist_id = artist[0]
+            artist_id = principal.artist_id
+            if artist_id is None:
+                raise APIException("Artist not found", status.HTTP_404_NOT_FOUND)
             return self.get_artists_count_artist(artist_id)
 
     def get_currect_artist(self):
-        payload = get_payload(self.headers)
-        if payload is None:
+        principal = get_principal(self.request)
+        if principal is None:
             return Response(status=status.HTTP_401_UNAUTHORIZED)
 
-        with connection.cursor() as c:
-            c.execute(
-                """
-                SELECT uuid
-                FROM artists_artist
-                WHERE user_id = %s
-                """,
-                [payload["user_id"]],
+        artist_id = principal.artist_id
+        if artist_id is None:
+            return Response(
+                {"message": "Artist not found"}, status=status.HTTP_404_NOT_FOUND
             )
-            artist = c.fetchone()
-            if artist is None:
-                return Response(
-                    {"message": "Artist not found"}, status=status.HTTP_404_NOT_FOUND
-                )
-        artist_dict = convert_tuples_to_dicts(artist, ["uuid"])[0]
-        if payload["role"] == "ARTIST":
-            return self.get_artist_by_id(artist_dict["uuid"])
+        if principal.role == "ARTIST":
+            return self.get_artist_by_id(artist_id)
 
-        if payload["role"] == "ARTIST_MANAGER":
-            managerSelector = ManagerSelector(self.headers)
-            return managerSelector.get_manager_by_id(payload["user_id"])
+        if principal.role == "ARTIST_MANAGER":
+            managerSelector = ManagerSelector(self.request)
+            return managerSelector.get_manager_by_id(principal.manager_id)
         return Response(status=status.HTTP_401_UNAUTHORIZED)
 
-    def get_artists_artist(self):
-        with connection.cursor() as c:
-            c.execute(
-                """
-                SELECT a.*
-                FROM artists_artist a
-                JOIN core_user u ON a.user_id = u.uuid
-                """
-            )
-
-            artists = c.fetchall()
-            columns = [col[0] for col in c.description]
-        if artists is None:
-            return Response(status=status.HTTP_404_NOT_FOUND)
-        artists_dict = convert_tuples_to_dicts(artists, columns)
-        artists_instances = [Artist(**artist) for artist in artists_dict]
-
-        # paginate
+    def paginate_artists(self, query, count_query, params=None):
         paginator = PageNumberPagination()
         paginator.page_size = self.page_size
-        paginated_artists = paginator.paginate_queryset(
-            artists_instances, request=self.request
+
+        if json_lists.enabled():
+            artists = json_lists.JSONQueryList(
+                json_lists.artist_object, query, count_query, params
+            )
+            page = paginator.paginate_queryset(artists, request=self.request)
+            return json_lists.page_response(paginator, page)
+
+        artists = RawQueryList(
+            Artist, f"{query} ORDER BY a.created_at, a.uuid", count_query, params
         )
+        paginated_artists = paginator.paginate_queryset(artists, request=self.request)
 
-        serializer = ArtistSerializer(paginated_artists, many=True)
+        load_artist_relations(paginated_artists)
+        data = compiled_artist_serializer.many(paginated_artists)
         return Response(
-            paginator.get_paginated_response(serializer.data).data,
+            paginator.get_paginated_response(data).data,
             status=status.HTTP_200_OK,
         )
 
+    def get_artists_artist(self):
+        return self.paginate_artists(
+            """
+            SELECT a.*
+            FROM artists_artist a
+            JOIN core_user u ON a.user_id = u.uuid
+            """,
+            """
+            SELECT count(*)
+            FROM artists_artist a
+            JOIN core_user u ON a.user_id = u.uuid
+            """,
+        )
+
     def get_artists(self):
-        payload = get_payload(self.headers)
-        if payload is None:
+        principal = get_principal(self.request)
+        if principal is None:
             return Response(status=status.HTTP_401_UNAUTHORIZED)
-        role = payload.get("role", "")
-        user_id = payload.get("user_id", "")
+        role = principal.role
 
         if role != "ARTIST_MANAGER" and role != "ARTIST" and role != "SUPER_ADMIN":
             return Response(status=status.HTTP_401_UNAUTHORIZED)
@@ -366,66 +302,30 @@ class ArtistSelector:
             return self.get_artists_artist()  # Get all artists
 
         if role == "SUPER_ADMIN":
-            with connection.cursor() as c:
-                c.execute(
-                    """
-                    SELECT * from artists_artist
-                    """
-                )
-                artists = c.fetchall()
-                columns = [col[0] for col in c.description]
-                if artists is None:
-                    return Response(
-                        {"message": "No artists found"},
-                        status=status.HTTP_404_NOT_FOUND,
-                    )
-            artists_dict = convert_tuples_to_dicts(artists, columns)
-            artists_instances = [Artist(**artist) for artist in artists_dict]
-
-            # paginate
-            paginator = PageNumberPagination()
-            paginator.page_size = self.page_size
-            paginated_artists = paginator.paginate_queryset(
-                artists_instances, request=self.request
-            )
-
-            serializer = ArtistSerializer(paginated_artists, many=True)
-            return Response(
-                paginator.get_paginated_response(serializer.data).data,
-                status=status.HTTP_200_OK,
-            )
-
-        # If role is an artist manager
-        with connection.cursor() as c:
-            c.execute(
+            return self.paginate_artists(
                 """
-                SELECT a.* 
+                SELECT a.*
+                FROM artists_artist a
+                """,
+                """
+                SELECT count(*)
                 FROM artists_artist a
-                LEFT JOIN core_user u ON a.user_id = u.uuid
-                LEFT JOIN profiles_userprofile m ON a.manager_id = m.uuid
-                WHERE m.user_id = %s
                 """,
-                [user_id],
             )
 
-            artists = c.fetchall()
-            columns = [col[0] for col in c.description]
-        if artists is None:
-            return Response(status=status.HTTP_404_NOT_FOUND)
-        artists_dict = convert_tuples_to_dicts(artists, columns)
-        artists_instances = [Artist(**artist) for artist in artists_dict]
-
-        # paginate
-        paginator = PageNumberPagination()
-        paginator.page_size = self.page_size
-        paginated_artists = paginator.paginate_queryset(
-            artists_instances, request=self.request
-        )
-
-        serializer = ArtistSerializer(paginated_artists, many=True)
-        return Response(
-            paginator.get_paginated_response(serializer.data).data,
-            status=status.HTTP_200_OK,
+        # If role is an artist manager
+        return self.paginate_artists(
+            """
+            SELECT a.*
+            FROM artists_artist a
+            WHERE a.manager_id = %s
+            """,
+            """
+            SELECT count(*)
+            FROM artists_artist a
+            WHERE a.manager_id = %s
+            """,
+            [principal.manager_id],
         )
 
     def get_artist_by_id(self, uuid):
@@ -3,6 +3,7 @@ from datetime import datetime
 from rest_framework import serializers
 from rest_framework.exceptions import ValidationError
 
+from apps.core.compiled import compile_serializer
 from apps.core.models import Artist, User, UserProfile
 from apps.profiles.serializers import UserProfileSerializer
 from apps.users.serializers import UserSerializer
@@ -57,3 +58,7 @@ class ArtistSerializer(serializers.Serializer):
 
     def validate_first_released_year(self, value):
         return value if value is not None else 0
+
+
+# Read-only fast path generated from the declarations above
+compiled_artist_serializer = compile_serializer(ArtistSerializer)
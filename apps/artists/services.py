@@ -6,9 +6,11 @@ from rest_framework.response import Response
 
 from apps.artists.selectors import ArtistSelector
 from apps.artists.serializers import ArtistSerializer
+from apps.core import catalog_stats, scopes
 from apps.core.models import Artist
 from apps.core.utils import convert_tuples_to_dicts
-from apps.users.utils import get_payload
+from apps.users.authentication import invalidate_cached_user
+from apps.users.principal import get_principal
 
 
 class ArtistService:
@@ -56,35 +58,23 @@ class ArtistService:
         if not data:
             raise APIException("No data provided", status.HTTP_400_BAD_REQUEST)
         self.serialize_data(data)
-        payload = get_payload(self.headers)
-        if payload is None:
+        principal = get_principal(self.request)
+        if principal is None:
             raise APIException("Failed to create artist", status.HTTP_401_UNAUTHORIZED)
 
         manager_id = None
-        if payload["role"] == "SUPER_ADMIN":
+        if principal.role == "SUPER_ADMIN":
             manager = data.get("manager", None)
             manager_id = manager.get("uuid", None)
             if not manager_id:
                 raise APIException("Manager not provided", status.HTTP_400_BAD_REQUEST)
-        if payload["role"] == "ARTIST_MANAGER":
-            manager_userid = payload.get("user_id", None)
-
-            with connection.cursor() as c:  # getting manager id
-                c.execute(
-                    """
-                    SELECT uuid
-                    FROM profiles_userprofile
-                    WHERE user_id = %s
-                    """,
-                    [manager_userid],
+        if principal.role == "ARTIST_MANAGER":
+            manager_id = principal.manager_id
+            if manager_id is None:
+                return Response(
+                    {"message": "Manager not found"},
+                    status=status.HTTP_404_NOT_FOUND,
                 )
-                manager_id = c.fetchone()
-                if manager_id is None:
-                    return Response(
-                        {"message": "Manager not found"},
-                        status=status.HTTP_404_NOT_FOUND,
-                    )
-            manager_id = manager_id[0]
 
         with transaction.atomic():
             with connection.cursor() as c:
@@ -95,13 +85,12 @@ class ArtistService:
                     """
                     INSERT INTO artists_artist
                     (name, first_released_year, no_of_album_released, dob, gender, address, manager_id, created_at, updated_at, user_id)
-                    VALUES (%s, %s, %s, %s, %s, %s, %s, NOW(), NOW(), %s)
+                    VALUES (%s, %s, 0, %s, %s, %s, %s, NOW(), NOW(), %s)
                     RETURNING uuid, name, first_released_year, no_of_album_released, dob, gender, address, manager_id, user_id
                     """,
                     [
                         data.get("name", ""),
                         data.get("first_released_year", 0),
-                        data.get("no_of_album_released", 0),
                         data.get("dob", ""),
                         data.get("gender", ""),
                         data.get("address", ""),
@@ -111,8 +100,11 @@ class ArtistService:
                 )
                 artist = c.fetchone()
                 columns = [col[0] for col in c.description]
+                if artist is not None:
+                    catalog_stats.apply_delta(artist[0])
         if artist is None:
             raise APIException("Failed to create artist", status.HTTP_400_BAD_REQUEST)
+        scopes.invalidate(user_id)
         artist_dict = convert_tuples_to_dicts(artist, columns)[0]
         return Response(artist_dict, status=status.HTTP_201_CREATED)
 
@@ -133,6 +125,7 @@ class ArtistService:
                 """,
                 [email, hashed_password, user_id],
             )
+        invalidate_cached_user(user_id)
         return Response(status=status.HTTP_200_OK)
 
     def update_artist(self, uuid):
@@ -144,40 +137,30 @@ class ArtistService:
         artist = artistSelector.get_artist_by_id(uuid).data
         if artist is None:
             return APIException("Artist not found", status.HTTP_404_NOT_FOUND)
-        payload = get_payload(self.headers)
-        if payload is None:
+        principal = get_principal(self.request)
+        if principal is None:
             return Response(status=status.HTTP_401_UNAUTHORIZED)
         manager = artist.get("manager", None)
         manager_id = None
         if manager is not None:
             manager_id = manager.get("uuid", None)
-        if payload["role"] == "SUPER_ADMIN":
+        previous_manager_id = manager_id
+        if principal.role == "SUPER_ADMIN":
             manager = data.get("manager", None)
             manager_id = manager.get("uuid", artist.get("manager", None))
-        if payload["role"] == "ARTIST_MANAGER":
-            manager_userid = payload.get("user_id", None)
-            with connection.cursor() as c:  # getting manager id
-                c.execute(
-                    """
-                    SELECT uuid
-                    FROM profiles_userprofile
-                    WHERE user_id = %s
-                    """,
-                    [manager_userid],
+        if principal.role == "ARTIST_MANAGER":
+            manager_id = principal.manager_id
+            if manager_id is None:
+                return Response(
+                    {"message": "Manager not found"},
+                    status=status.HTTP_404_NOT_FOUND,
                 )
-                manager_id = c.fetchone()
-                if manager_id is None:
-                    return Response(
-                        {"message": "Manager not found"},
-                        status=status.HTTP_404_NOT_FOUND,
-                    )
-            manager_id = manager_id[0]
 
         if artist is None:
             return Response(status=status.HTTP_404_NOT_FOUND)
         with transaction.atomic():
             # password = data.get("password", None) or None
-            # if password is not None and payload["role"] != "ARTIST":
+            # if password is not None and principal.role != "ARTIST":
             #     self.update_user_account(artist.get("user", None).get("uuid", None))
             with connection.cursor() as c:
                 c.execute(
@@ -204,6 +187,7 @@ class ArtistService:
                 if artist is None:
                     return Response(status=status.HTTP_400_BAD_REQUEST)
                 columns = [col[0] for col in c.description]
+                catalog_stats.move_artist(uuid, previous_manager_id, manager_id)
         artist_dict = convert_tuples_to_dicts(artist, columns)
         return Response(artist_dict, status=status.HTTP_200_OK)
 
@@ -214,9 +198,12 @@ class ArtistService:
             return Response(status=status.HTTP_404_NOT_FOUND)
         email = artist.data["user"]["email"]
         with transaction.atomic():
+            catalog_stats.remove_artist(uuid)
             with connection.cursor() as c:
                 c.execute("DELETE FROM artists_artist WHERE uuid = %s;", [uuid])
                 c.execute("DELETE FROM core_user WHERE email = %s;", [email])
+            invalidate_cached_user(artist.data["user"]["uuid"])
+            scopes.invalidate(artist.data["user"]["uuid"])
 
             return Response(status=status.HTTP_204_NO_CONTENT)
         return APIException("Failed to delete artist", status.HTTP_400_BAD_REQUEST)
@@ -0,0 +1,74 @@
+from django.test import TestCase
+from rest_framework.test import APIClient
+
+from apps.core import counters
+from apps.core.models import Artist, User, UserProfile
+from apps.core.testing import CatalogTestCase
+from apps.users.authentication import user_cache
+from apps.users.utils import JWTManager
+
+
+class ArtistListQueryCountTests(TestCase):
+    @classmethod
+    def setUpTestData(cls):
+        cls.admin = User.objects.create(
+            email="admin@artists.test", role=User.Role.SUPER_ADMIN
+        )
+        cls.manager = User.objects.create(
+            email="manager@artists.test", role=User.Role.ARTIST_MANAGER
+        )
+        profile = UserProfile.objects.create(first_name="Manager", user=cls.manager)
+        for n in range(6):
+            Artist.objects.create(
+                name=f"Artist {n}",
+                user=User.objects.create(
+                    email=f"artist{n}@artists.test", role=User.Role.ARTIST
+                ),
+                manager=profile,
+            )
+
+    def client_for(self, user):
+        access, _ = JWTManager(
+            {"uuid": user.uuid, "email": user.email, "role": user.role}
+        ).generate_jwt_token()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        return client
+
+    def get_page(self, client, page_size):
+        # A cached user would skip the principal's query
+        user_cache.clear()
+        return client.get(f"/api/v1/artists/?page_size={page_size}")
+
+    def test_query_count_does_not_grow_with_page_size(self):
+        # Principal user, count, page, managers, users: one query per level
+        for user, page_sizes in [(self.admin, (1, 3, 6)), (self.manager, (1, 3))]:
+            client = self.client_for(user)
+            for page_size in page_sizes:
+                with self.subTest(role=user.role, page_size=page_size):
+                    with self.assertNumQueries(5):
+                        response = self.get_page(client, page_size)
+                    self.assertEqual(response.status_code, 200)
+                    results = response.json()["results"]
+                    self.assertEqual(len(results), page_size)
+                    self.assertIsNotNone(results[0]["manager"]["user"])
+
+
+class CreateArtistTests(CatalogTestCase):
+    def test_album_count_starts_at_zero(self):
+        response = self.client_for("ARTIST_MANAGER").post(
+            "/api/v1/artists/",
+            {
+                "user": {"email": "new-artist@budget.test", "password": "secret"},
+                "name": "New artist",
+                "first_released_year": 2015,
+                "no_of_album_released": 7,
+                "dob": "1990-01-01",
+                "gender": "F",
+                "address": "Kathmandu",
+            },
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(response.json()["no_of_album_released"], 0)
+        self.assertEqual(counters.find_drift()["albums"], [])
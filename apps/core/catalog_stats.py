@@ -0,0 +1,154 @@
+"""
+Maintenance of the ``catalog_stats`` rollup.
+
+Every write path that adds, moves or removes an album, a music or an artist
+calls into this module (album and music writes through ``apps.core.counters``)
+inside its own transaction, so the per-artist and
+per-manager counters always match the catalog and dashboard reads stay
+primary-key lookups. ``rebuild`` recomputes the whole table from scratch.
+"""
+
+from django.db import connection
+
+ARTIST = "ARTIST"
+MANAGER = "MANAGER"
+
+
+def apply_delta(artist_id, albums=0, musics=0):
+    """
+    Add ``albums``/``musics`` to the counters of an artist and its manager.
+
+    Missing rows are created, so a zero delta can be used to register a new
+    artist.
+    """
+    apply_deltas({artist_id: (albums, musics)})
+
+
+def apply_deltas(deltas):
+    """
+    Apply ``{artist_id: (albums, musics)}`` deltas in a single statement, the
+    managers' rows receiving the sum of their artists' deltas.
+    """
+    deltas = {
+        str(artist_id): delta
+        for artist_id, delta in deltas.items()
+        if artist_id is not None
+    }
+    if not deltas:
+        return
+    artist_ids = list(deltas)
+    with connection.cursor() as c:
+        c.execute(
+            """
+            WITH d AS (
+                SELECT d.artist_id, d.albums, d.musics, a.manager_id
+                FROM unnest(%s::uuid[], %s::int[], %s::int[])
+                    AS d (artist_id, albums, musics)
+                JOIN artists_artist a ON a.uuid = d.artist_id
+            )
+            INSERT INTO catalog_stats (scope, scope_id, album_count, music_count)
+            SELECT %s, artist_id, albums, musics
+            FROM d
+            UNION ALL
+            SELECT %s, manager_id, sum(albums), sum(musics)
+            FROM d
+            WHERE manager_id IS NOT NULL
+            GROUP BY manager_id
+            ON CONFLICT (scope, scope_id) DO UPDATE
+            SET album_count = catalog_stats.album_count + EXCLUDED.album_count,
+                music_count = catalog_stats.music_count + EXCLUDED.music_count
+            """,
+            [
+                artist_ids,
+                [deltas[artist_id][0] for artist_id in artist_ids],
+                [deltas[artist_id][1] for artist_id in artist_ids],
+                ARTIST,
+                MANAGER,
+            ],
+        )
+
+
+def move_artist(artist_id, old_manager_id, new_manager_id):
+    """Move an artist's counters from one manager to another."""
+    if str(old_manager_id) == str(new_manager_id):
+        return
+    with connection.cursor() as c:
+        c.execute(
+            """
+            INSERT INTO catalog_stats (scope, scope_id, album_count, music_count)
+            SELECT %s, m.manager_id, m.sign * s.album_count, m.sign * s.music_count
+            FROM catalog_stats s,
+                (VALUES (%s::uuid, -1), (%s::uuid, 1)) AS m (manager_id, sign)
+            WHERE s.scope = %s AND s.scope_id = %s AND m.manager_id IS NOT NULL
+            ON CONFLICT (scope, scope_id) DO UPDATE
+            SET album_count = catalog_stats.album_count + EXCLUDED.album_count,
+                music_count = catalog_stats.music_count + EXCLUDED.music_count
+            """,
+            [MANAGER, old_manager_id, new_manager_id, ARTIST, artist_id],
+        )
+
+
+def remove_artist(artist_id):
+    """Drop an artist's row and subtract its counters from its manager."""
+    with connection.cursor() as c:
+        c.execute(
+            """
+            WITH removed AS (
+                DELETE FROM catalog_stats
+                WHERE scope = %s AND scope_id = %s
+                RETURNING scope_id, album_count, music_count
+            )
+            UPDATE catalog_stats s
+            SET album_count = s.album_count - removed.album_count,
+                music_count = s.music_count - removed.music_count
+            FROM removed
+            JOIN artists_artist a ON a.uuid = removed.scope_id
+            WHERE s.scope = %s AND s.scope_id = a.manager_id
+            """,
+            [ARTIST, artist_id, MANAGER],
+        )
+
+
+def remove_manager(manager_id):
+    with connection.cursor() as c:
+        c.execute(
+            "DELETE FROM catalog_stats WHERE scope = %s AND scope_id = %s",
+            [MANAGER, manager_id],
+        )
+
+
+def rebuild():
+    """Recompute every row of ``catalog_stats`` from the catalog tables."""
+    with connection.cursor() as c:
+        c.execute("DELETE FROM catalog_stats")
+        c.execute(
+            """
+            INSERT INTO catalog_stats (scope, scope_id, album_count, music_count)
+            SELECT %s, a.uuid, COALESCE(al.total, 0), COALESCE(mu.total, 0)
+            FROM artists_artist a
+            LEFT JOIN (
+                SELECT owner_id, count(*) AS total
+                FROM albums_album
+                GROUP BY owner_id
+            ) al ON al.owner_id = a.uuid
+            LEFT JOIN (
+                SELECT artist_id, count(*) AS total
+                FROM musics_music
+                GROUP BY artist_id
+            ) mu ON mu.artist_id = a.uuid
+            """,
+            [ARTIST],
+        )
+        c.execute(
+            """
+            INSERT INTO catalog_stats (scope, scope_id, album_count, music_count)
+            SELECT %s, a.manager_id, sum(s.album_count), sum(s.music_count)
+            FROM catalog_stats s
+            JOIN artists_artist a ON a.uuid = s.scope_id
+            WHERE s.scope = %s AND a.manager_id IS NOT NULL
+            GROUP BY a.manager_id
+            """,
+            [MANAGER, ARTIST],
+        )
+        c.execute("SELECT count(*) FROM catalog_stats")
+        return c.fetchone()[0]
@@ -0,0 +1,174 @@
+"""
+Precompiled read-only serializers.
+
+``Serializer.to_representation`` walks the field objects of a serializer for
+every instance it renders: ``get_attribute``, the None check and the field's
+``to_representation`` are three method calls per field per row, repeated
+down every nested serializer. ``compile_serializer`` reads the field
+declarations of a serializer class once and generates a plain function that
+builds the same dict in one expression. The common field types are inlined
+with a guard on the exact value type and fall back to the field's own
+``to_representation`` for anything else, so the output matches DRF's.
+
+Only reading is compiled: write-only fields are left out and validation
+still goes through the regular serializer.
+"""
+
+import datetime
+import uuid
+
+from django.conf import settings
+from django.core.exceptions import ImproperlyConfigured
+from rest_framework import fields, relations, serializers
+
+
+def inline_char(field, name, value):
+    return f"({value} if type({value}) is str else {name}({value}))"
+
+
+def inline_integer(field, name, value):
+    return f"({value} if type({value}) is int else {name}({value}))"
+
+
+def inline_uuid(field, name, value):
+    if field.uuid_format != "hex_verbose":
+        return None
+    return f"(str({value}) if type({value}) is _UUID else {name}({value}))"
+
+
+def inline_boolean(field, name, value):
+    return f"({value} if {value} is True or {value} is False else {name}({value}))"
+
+
+def inline_date(field, name, value):
+    if str(getattr(field, "format", fields.api_settings.DATE_FORMAT)).lower() != (
+        fields.ISO_8601
+    ):
+        return None
+    return f"({value}.isoformat() if type({value}) is _date else {name}({value}))"
+
+
+def inline_datetime(field, name, value):
+    # Only UTC values rendered in a UTC default timezone are inlined; the
+    # project never activates another timezone per request.
+    output_format = getattr(field, "format", fields.api_settings.DATETIME_FORMAT)
+    if (
+        str(output_format).lower() != fields.ISO_8601
+        or getattr(field, "timezone", None) is not None
+        or not settings.USE_TZ
+        or settings.TIME_ZONE != "UTC"
+    ):
+        return None
+    return (
+        f"(_utc_isoformat({value}) if type({value}) is _datetime"
+        f" and {value}.tzinfo is _UTC else {name}({value}))"
+    )
+
+
+def utc_isoformat(value):
+    return value.isoformat()[:-6] + "Z"
+
+
+def inline_choice(field, name, value):
+    return (
+        f"({name}_choices.get({value}, {value})"
+        f" if type({value}) is str and {value} else {name}({value}))"
+    )
+
+
+# Keyed by the implementation of ``to_representation`` so subclasses that
+# override it (and fields configured differently) are not inlined.
+INLINERS = {
+    fields.CharField.to_representation: inline_char,
+    fields.IntegerField.to_representation: inline_integer,
+    fields.UUIDField.to_representation: inline_uuid,
+    fields.BooleanField.to_representation: inline_boolean,
+    fields.DateField.to_representation: inline_date,
+    fields.DateTimeField.to_representation: inline_datetime,
+    fields.ChoiceField.to_representation: inline_choice,
+}
+
+
+class CompiledSerializer:
+    """The generated read path of a serializer class."""
+
+    def __init__(self, serializer_class):
+        self.serializer_class = serializer_class
+        self.source, self.to_representation = build(serializer_class())
+
+    def __call__(self, instance):
+        return self.to_representation(instance)
+
+    def many(self, instances):
+        return list(map(self.to_representation, instances))
+
+    def __repr__(self):
+        return f"<CompiledSerializer {self.serializer_class.__name__}>"
+
+
+def compile_serializer(serializer_class):
+    return CompiledSerializer(serializer_class)
+
+
+def attribute(serializer, field, target):
+    """The expression reading ``field``'s value from ``target``."""
+    if isinstance(field, relations.PrimaryKeyRelatedField):
+        supported = field.pk_field is None and field.use_pk_only_optimization()
+        # DRF renders the related pk read through serializable_value, which
+        # is the ``<relation>_id`` attribute itself.
+    elif isinstance(field, relations.RelatedField):
+        supported = False
+    else:
+        supported = type(field).get_attribute is fields.Field.get_attribute or (
+            isinstance(field, serializers.BaseSerializer)
+        )
+    if not supported:
+        raise ImproperlyConfigured(
+            f"{type(serializer).__name__}.{field.field_name}: "
+            f"{type(field).__name__} is not supported by compile_serializer"
+        )
+    return ".".join([target] + field.source_attrs)
+
+
+def build(serializer):
+    namespace = {
+        "_UUID": uuid.UUID,
+        "_date": datetime.date,
+        "_datetime": datetime.datetime,
+        "_UTC": datetime.timezone.utc,
+        "_utc_isoformat": utc_isoformat,
+    }
+    items = []
+    reads = []
+    for index, field in enumerate(serializer._readable_fields):
+        value = f"v{index}"
+        reads.append(f"    {value} = {attribute(serializer, field, 'instance')}")
+        if isinstance(field, relations.PrimaryKeyRelatedField):
+            items.append(f"        {field.field_name!r}: {value},")
+            continue
+        if isinstance(field, serializers.Serializer):
+            name = f"_nested{index}"
+            namespace[name] = CompiledSerializer(type(field)).to_representation
+            represent = f"{name}({value})"
+        else:
+            name = f"_field{index}"
+            namespace[name] = field.to_representation
+            if isinstance(field, fields.ChoiceField):
+                namespace[f"{name}_choices"] = field.choice_strings_to_values
+            inliner = INLINERS.get(type(field).to_representation)
+            represent = inliner(field, name, value) if inliner else None
+            if represent is None:
+                represent = f"{name}({value})"
+        items.append(
+            f"        {field.field_name!r}: None if {value} is None else {represent},"
+        )
+
+    source = "\n".join(
+        ["def to_representation(instance):"]
+        + reads
+        + ["    return {"]
+        + items
+        + ["    }"]
+    )
+    exec(source, namespace)
+    return source, namespace["to_representation"]
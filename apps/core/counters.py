@@ -0,0 +1,203 @@
+"""
+Maintenance of the denormalized catalog counters.
+
+``albums_album.no_of_tracks``, ``artists_artist.no_of_album_released`` and
+the ``catalog_stats`` rollup are only ever changed through this module. Each
+write path reports what it added, removed or moved and the counters receive
+a +1/-1 delta in the same transaction, so a write costs the same whatever
+the size of the album or artist it touches. ``find_drift`` and ``repair``
+(the ``verify_counters`` command) compare the counters with the tables they
+summarize and fix them if anything ever bypassed this module.
+"""
+
+from collections import Counter
+
+from django.db import connection
+
+from apps.core import catalog_stats
+
+
+def add_musics(deltas):
+    """
+    Apply ``{(album_id, artist_id): count}`` music deltas to the album track
+    counts and ``catalog_stats``, one statement each.
+    """
+    tracks = Counter()
+    musics = Counter()
+    for (album_id, artist_id), count in deltas.items():
+        if album_id is not None:
+            tracks[str(album_id)] += count
+        if artist_id is not None:
+            musics[str(artist_id)] += count
+    tracks = {album_id: count for album_id, count in tracks.items() if count}
+    if tracks:
+        with connection.cursor() as c:
+            c.execute(
+                """
+                UPDATE albums_album a
+                SET no_of_tracks = COALESCE(a.no_of_tracks, 0) + d.delta
+                FROM unnest(%s::uuid[], %s::int[]) AS d (album_id, delta)
+                WHERE a.uuid = d.album_id
+                """,
+                [list(tracks), list(tracks.values())],
+            )
+    catalog_stats.apply_deltas(
+        {artist_id: (0, count) for artist_id, count in musics.items() if count}
+    )
+
+
+def music_added(album_id, artist_id):
+    add_musics({(album_id, artist_id): 1})
+
+
+def music_removed(album_id, artist_id):
+    add_musics({(album_id, artist_id): -1})
+
+
+def music_moved(old_album_id, old_artist_id, new_album_id, new_artist_id):
+    """Move one music between albums and/or artists (old -1, new +1)."""
+    if (str(old_album_id), str(old_artist_id)) == (
+        str(new_album_id),
+        str(new_artist_id),
+    ):
+        return
+    deltas = Counter()
+    deltas[(old_album_id, old_artist_id)] -= 1
+    deltas[(new_album_id, new_artist_id)] += 1
+    add_musics(deltas)
+
+
+def add_albums(deltas):
+    """Apply ``{artist_id: count}`` album deltas to the artists and ``catalog_stats``."""
+    deltas = {
+        str(artist_id): count
+        for artist_id, count in deltas.items()
+        if artist_id is not None and count
+    }
+    if not deltas:
+        return
+    with connection.cursor() as c:
+        c.execute(
+            """
+            UPDATE artists_artist a
+            SET no_of_album_released = COALESCE(a.no_of_album_released, 0) + d.delta
+            FROM unnest(%s::uuid[], %s::int[]) AS d (artist_id, delta)
+            WHERE a.uuid = d.artist_id
+            """,
+            [list(deltas), list(deltas.values())],
+        )
+    catalog_stats.apply_deltas(
+        {artist_id: (count, 0) for artist_id, count in deltas.items()}
+    )
+
+
+def album_added(owner_id):
+    add_albums({owner_id: 1})
+
+
+def album_removed(owner_id):
+    add_albums({owner_id: -1})
+
+
+def album_moved(old_owner_id, new_owner_id):
+    """Move one album between artists (old owner -1, new owner +1)."""
+    if str(old_owner_id) == str(new_owner_id):
+        return
+    deltas = Counter()
+    deltas[old_owner_id] -= 1
+    deltas[new_owner_id] += 1
+    add_albums(deltas)
+
+
+TRACK_DRIFT_QUERY = """
+    SELECT a.uuid, a.no_of_tracks, count(m.uuid)
+    FROM albums_album a
+    LEFT JOIN musics_music m ON m.album_id = a.uuid
+    GROUP BY a.uuid
+    HAVING a.no_of_tracks IS DISTINCT FROM count(m.uuid)
+"""
+
+ALBUM_DRIFT_QUERY = """
+    SELECT ar.uuid, ar.no_of_album_released, count(al.uuid)
+    FROM artists_artist ar
+    LEFT JOIN albums_album al ON al.owner_id = ar.uuid
+    GROUP BY ar.uuid
+    HAVING ar.no_of_album_released IS DISTINCT FROM count(al.uuid)
+"""
+
+STATS_DRIFT_QUERY = """
+    WITH artist_counts AS (
+        SELECT a.uuid, a.manager_id,
+            (SELECT count(*) FROM albums_album al WHERE al.owner_id = a.uuid)
+                AS albums,
+            (SELECT count(*) FROM musics_music m WHERE m.artist_id = a.uuid)
+                AS musics
+        FROM artists_artist a
+    ),
+    expected AS (
+        SELECT %s AS scope, uuid AS scope_id, albums, musics
+        FROM artist_counts
+        UNION ALL
+        SELECT %s, manager_id, sum(albums)::bigint, sum(musics)::bigint
+        FROM artist_counts
+        WHERE manager_id IS NOT NULL
+        GROUP BY manager_id
+    )
+    SELECT COALESCE(e.scope, s.scope), COALESCE(e.scope_id, s.scope_id),
+        s.album_count, s.music_count, e.albums, e.musics
+    FROM expected e
+    FULL JOIN catalog_stats s ON s.scope = e.scope AND s.scope_id = e.scope_id
+    WHERE COALESCE(s.album_count, 0) <> COALESCE(e.albums, 0)
+        OR COALESCE(s.music_count, 0) <> COALESCE(e.musics, 0)
+"""
+
+
+def find_drift():
+    """
+    Return the counters that do not match the tables they summarize, as
+    ``{"tracks": [...], "albums": [...], "catalog_stats": [...]}`` of
+    ``(id, stored, actual)`` rows (``(scope, id, stored, actual)`` for
+    ``catalog_stats``, where stored and actual are ``(albums, musics)``).
+    """
+    with connection.cursor() as c:
+        c.execute(TRACK_DRIFT_QUERY)
+        tracks = c.fetchall()
+        c.execute(ALBUM_DRIFT_QUERY)
+        albums = c.fetchall()
+        c.execute(STATS_DRIFT_QUERY, [catalog_stats.ARTIST, catalog_stats.MANAGER])
+        stats = [
+            (row[0], row[1], (row[2], row[3]), (row[4], row[5]))
+            for row in c.fetchall()
+        ]
+    return {"tracks": tracks, "albums": albums, "catalog_stats": stats}
+
+
+def repair():
+    """Recompute the counters that drifted; returns what ``find_drift`` found."""
+    drift = find_drift()
+    with connection.cursor() as c:
+        if drift["tracks"]:
+            c.execute(
+                """
+                UPDATE albums_album a
+                SET no_of_tracks = (
+                    SELECT count(*) FROM musics_music m WHERE m.album_id = a.uuid
+                )
+                WHERE a.uuid = ANY(%s::uuid[])
+                """,
+                [[str(row[0]) for row in drift["tracks"]]],
+            )
+        if drift["albums"]:
+            c.execute(
+                """
+                UPDATE artists_artist ar
+                SET no_of_album_released = (
+                    SELECT count(*) FROM albums_album al WHERE al.owner_id = ar.uuid
+                )
+                WHERE ar.uuid = ANY(%s::uuid[])
+                """,
+                [[str(row[0]) for row in drift["albums"]]],
+            )
+    if drift["catalog_stats"]:
+        catalog_stats.rebuild()
+    return drift
@@ -0,0 +1,329 @@
+"""
+Statement fingerprints and latency percentiles.
+
+Every statement seen by ``QueryTimingMiddleware`` is normalized into a
+fingerprint: literals, placeholders and value lists are replaced by ``?``
+so the same hand-written query groups together whatever its parameters.
+``QueryCollector`` keeps, per fingerprint, a call count, the total time and
+log-scaled latency histograms for the current and the previous window
+(``QUERY_STATS_WINDOW`` seconds), from which p50/p95/p99 are read. The
+number of fingerprints is capped, so memory stays fixed per worker: once
+the cap is reached new statements are counted under ``(other)``.
+
+Each worker writes its histograms to ``QUERY_STATS_DIR/<pid>.json`` when a
+window closes; ``merge`` adds the files of all workers together for the
+``query_stats`` command, while the endpoint reports the live worker.
+"""
+
+import hashlib
+import json
+import logging
+import math
+import os
+import re
+import sys
+import threading
+import time
+from array import array
+from functools import lru_cache
+
+from django.conf import settings
+
+logger = logging.getLogger(__name__)
+
+OTHER = "(other)"
+# Histogram buckets grow by 20% from 10us, so a percentile is read with at
+# most 20% error; the last bucket (about 80s) takes everything slower.
+BUCKET_FLOOR = 1e-5
+BUCKET_GROWTH = 1.2
+BUCKETS = 88
+# Source locations kept per fingerprint, looked up every this many calls
+MAX_LOCATIONS = 3
+LOCATION_INTERVAL = 64
+
+APPS_DIR = os.path.join(str(settings.BASE_DIR), "apps") + os.sep
+CORE_DIR = os.path.join(APPS_DIR, "core") + os.sep
+SKIPPED_FILES = {
+    os.path.join(APPS_DIR, "core", "fingerprints.py"),
+    os.path.join(APPS_DIR, "core", "middleware.py"),
+}
+
+COMMENTS = re.compile(r"--[^\n]*|/\*.*?\*/", re.S)
+STRINGS = re.compile(r"'(?:[^']|'')*'")
+PLACEHOLDERS = re.compile(r"%(?:\([^)]*\))?s")
+NUMBERS = re.compile(r"(?<![\w.])-?\d+(?:\.\d+)?(?:e[+-]?\d+)?\b", re.I)
+LISTS = re.compile(r"\(\s*\?(?:\s*,\s*\?)+\s*\)")
+ROWS = re.compile(r"\(\?\+\)(?:\s*,\s*\(\?\+\))+")
+ARRAYS = re.compile(r"ARRAY\s*\[[^\]]*\]", re.I)
+WHITESPACE = re.compile(r"\s+")
+
+
+@lru_cache(maxsize=1024)
+def fingerprint(sql):
+    """Normalize ``sql`` so statements differing only in values compare equal."""
+    sql = COMMENTS.sub(" ", sql)
+    sql = STRINGS.sub("?", sql)
+    sql = PLACEHOLDERS.sub("?", sql)
+    sql = NUMBERS.sub("?", sql)
+    sql = ARRAYS.sub("ARRAY[?+]", sql)
+    sql = LISTS.sub("(?+)", sql)
+    sql = ROWS.sub("(?+), ...", sql)
+    return WHITESPACE.sub(" ", sql).strip()
+
+
+def fingerprint_id(text):
+    return hashlib.md5(text.encode()).hexdigest()[:12]
+
+
+def bucket(duration):
+    if duration <= BUCKET_FLOOR:
+        return 0
+    index = int(math.log(duration / BUCKET_FLOOR, BUCKET_GROWTH)) + 1
+    return index if index < BUCKETS else BUCKETS - 1
+
+
+def bucket_upper_bound(index):
+    return BUCKET_FLOOR * BUCKET_GROWTH**index
+
+
+def empty_histogram():
+    return array("Q", bytes(8 * BUCKETS))
+
+
+def percentile(counts, fraction):
+    """Upper bound in seconds of the bucket holding the ``fraction`` quantile."""
+    total = sum(counts)
+    if not total:
+        return None
+    rank = math.ceil(total * fraction)
+    seen = 0
+    for index, count in enumerate(counts):
+        seen += count
+        if seen >= rank:
+            return bucket_upper_bound(index)
+    return bucket_upper_bound(BUCKETS - 1)
+
+
+def frame_location(frame):
+    path = os.path.relpath(frame.f_code.co_filename, settings.BASE_DIR)
+    return f"{path}:{frame.f_lineno} {frame.f_code.co_name}"
+
+
+def source_location():
+    """
+    Where the running query comes from: the innermost project frame, prefixed
+    with the caller outside ``apps/core`` when it went through a shared helper
+    (``apps/musics/selectors.py:160 get_musics -> apps/core/pagination.py:37
+    count``).
+    """
+    inner = None
+    frame = sys._getframe(1)
+    while frame is not None:
+        filename = frame.f_code.co_filename
+        if filename.startswith(APPS_DIR) and filename not in SKIPPED_FILES:
+            if not filename.startswith(CORE_DIR):
+                location = frame_location(frame)
+                return f"{location} -> {inner}" if inner else location
+            if inner is None:
+                inner = frame_location(frame)
+        frame = frame.f_back
+    return inner
+
+
+class Entry:
+    __slots__ = (
+        "fingerprint",
+        "calls",
+        "total",
+        "counts",
+        "previous",
+        "locations",
+    )
+
+    def __init__(self, text):
+        self.fingerprint = text
+        self.calls = 0
+        self.total = 0.0
+        self.counts = empty_histogram()
+        self.previous = empty_histogram()
+        self.locations = []
+
+    def histogram(self):
+        return [a + b for a, b in zip(self.counts, self.previous)]
+
+
+class QueryCollector:
+    def __init__(self, max_fingerprints=500, window=300, directory=None):
+        self.max_fingerprints = max_fingerprints
+        self.window = window
+        self.directory = directory
+        self.window_start = time.monotonic()
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def record(self, sql, duration):
+        text = fingerprint(sql)
+        snapshot = None
+        with self._lock:
+            if time.monotonic() - self.window_start >= self.window:
+                snapshot = self._rotate()
+            entry = self._entries.get(text)
+            if entry is None:
+                if len(self._entries) >= self.max_fingerprints:
+                    text = OTHER
+                entry = self._entries.get(text)
+                if entry is None:
+                    entry = self._entries[text] = Entry(text)
+            entry.calls += 1
+            entry.total += duration
+            entry.counts[bucket(duration)] += 1
+            if (
+                len(entry.locations) < MAX_LOCATIONS
+                and entry.calls % LOCATION_INTERVAL == 1
+            ):
+                location = source_location()
+                if location and location not in entry.locations:
+                    entry.locations.append(location)
+        if snapshot is not None:
+            self.write(snapshot)
+
+    def _rotate(self):
+        """Start a new window, returning the snapshot of the ones closed."""
+        snapshot = self._snapshot()
+        now = time.monotonic()
+        stale = now - self.window_start >= 2 * self.window
+        for entry in self._entries.values():
+            # After a whole idle window the previous one is empty too
+            entry.previous = empty_histogram() if stale else entry.counts
+            entry.counts = empty_histogram()
+        self.window_start = now
+        return snapshot
+
+    def _snapshot(self):
+        return {
+            "pid": os.getpid(),
+            "window": self.window,
+            "written_at": time.time(),
+            "fingerprints": [
+                {
+                    "fingerprint": entry.fingerprint,
+                    "calls": entry.calls,
+                    "total": entry.total,
+                    "histogram": entry.histogram(),
+                    "locations": list(entry.locations),
+                }
+                for entry in self._entries.values()
+            ],
+        }
+
+    def snapshot(self):
+        with self._lock:
+            return self._snapshot()
+
+    def write(self, snapshot):
+        if not self.directory:
+            return
+        path = os.path.join(self.directory, f"{snapshot['pid']}.json")
+        try:
+            os.makedirs(self.directory, exist_ok=True)
+            with open(f"{path}.tmp", "w") as f:
+                json.dump(snapshot, f)
+            os.replace(f"{path}.tmp", path)
+        except OSError:
+            logger.exception("Could not write query stats to %s", path)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+            self.window_start = time.monotonic()
+
+
+def read_snapshots(directory, max_age):
+    """The snapshots in ``directory`` written in the last ``max_age`` seconds."""
+    snapshots = []
+    if not os.path.isdir(directory):
+        return snapshots
+    for name in sorted(os.listdir(directory)):
+        if not name.endswith(".json"):
+            continue
+        path = os.path.join(directory, name)
+        try:
+            if time.time() - os.path.getmtime(path) > max_age:
+                continue
+            with open(path) as f:
+                snapshots.append(json.load(f))
+        except (OSError, ValueError):
+            logger.warning("Skipping unreadable query stats file %s", path)
+    return snapshots
+
+
+def merge(snapshots):
+    """Add the fingerprints of several snapshots together."""
+    merged = {}
+    for snapshot in snapshots:
+        for item in snapshot["fingerprints"]:
+            into = merged.get(item["fingerprint"])
+            if into is None:
+                merged[item["fingerprint"]] = {
+                    **item,
+                    "histogram": list(item["histogram"]),
+                    "locations": list(item["locations"]),
+                }
+                continue
+            into["calls"] += item["calls"]
+            into["total"] += item["total"]
+            into["histogram"] = [
+                a + b for a, b in zip(into["histogram"], item["histogram"])
+            ]
+            for location in item["locations"]:
+                if len(into["locations"]) >= MAX_LOCATIONS:
+                    break
+                if location not in into["locations"]:
+                    into["locations"].append(location)
+    return list(merged.values())
+
+
+def milliseconds(seconds):
+    return None if seconds is None else round(seconds * 1000, 3)
+
+
+SORT_KEYS = {
+    "total": lambda row: row["total_ms"],
+    "calls": lambda row: row["calls"],
+    "p95": lambda row: row["p95_ms"] or 0,
+    "p99": lambda row: row["p99_ms"] or 0,
+}
+
+
+def top(fingerprints, limit=20, sort="total"):
+    """
+    Report rows for the ``limit`` heaviest fingerprints.
+
+    ``calls`` and ``total_ms`` count since the worker started, the
+    percentiles cover the current and previous window.
+    """
+    rows = []
+    for item in fingerprints:
+        histogram = item["histogram"]
+        rows.append(
+            {
+                "id": fingerprint_id(item["fingerprint"]),
+                "fingerprint": item["fingerprint"],
+                "calls": item["calls"],
+                "total_ms": milliseconds(item["total"]),
+                "window_calls": sum(histogram),
+                "p50_ms": milliseconds(percentile(histogram, 0.50)),
+                "p95_ms": milliseconds(percentile(histogram, 0.95)),
+                "p99_ms": milliseconds(percentile(histogram, 0.99)),
+                "locations": item["locations"],
+            }
+        )
+    rows.sort(key=SORT_KEYS[sort], reverse=True)
+    return rows[:limit]
+
+
+collector = QueryCollector(
+    max_fingerprints=getattr(settings, "QUERY_STATS_MAX_FINGERPRINTS", 500),
+    window=getattr(settings, "QUERY_STATS_WINDOW", 300),
+    directory=getattr(settings, "QUERY_STATS_DIR", None),
+)
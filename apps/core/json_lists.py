@@ -0,0 +1,186 @@
+"""
+Database-side rendering of the list endpoints.
+
+The regular read path turns every row into a tuple, a dict, a model instance
+and then a serializer dict before DRF renders it. With ``SQL_JSON_LISTS``
+enabled, the artist, album, music and manager lists instead have PostgreSQL
+build the page with ``json_build_object``/``json_agg``, nested manager, owner
+and user objects included, and the resulting text is sent as the response
+body unchanged.
+
+The objects below mirror the read serializers field for field and in the
+same order; the ``verify_json_lists`` command compares both paths.
+"""
+
+import json
+
+from django.conf import settings
+from django.core.files.storage import default_storage
+from django.db import connection
+from django.http import HttpResponse
+
+from apps.core.pagination import RawQueryList
+
+
+def enabled():
+    return getattr(settings, "SQL_JSON_LISTS", False)
+
+
+def sql_literal(value):
+    # The fragments end up in queries that are always executed with params
+    return "'" + value.replace("'", "''").replace("%", "%%") + "'"
+
+
+def timestamp(column):
+    """A timestamptz column formatted like DRF's DateTimeField (UTC)."""
+    return f"""(
+        to_char({column} AT TIME ZONE 'UTC', 'YYYY-MM-DD"T"HH24:MI:SS')
+        || CASE
+            WHEN date_part('microseconds', {column})::int %% 1000000 = 0 THEN ''
+            ELSE to_char({column} AT TIME ZONE 'UTC', '.US')
+        END
+        || 'Z'
+    )"""
+
+
+def media_url(column):
+    """A file column rendered like DRF's FileField without a request."""
+    return f"""(
+        CASE
+            WHEN COALESCE({column}, '') = '' THEN NULL
+            ELSE {sql_literal(default_storage.base_url)}
+                || uri_quote_path(ltrim({column}, '/'))
+        END
+    )"""
+
+
+def lookup(table, alias, build, id_column):
+    """The object of the ``table`` row ``id_column`` points to, or NULL."""
+    return f"""(
+        SELECT {build(alias)}
+        FROM {table} {alias}
+        WHERE {alias}.uuid = {id_column}
+    )"""
+
+
+def user_object(u):
+    return f"""json_build_object(
+        'uuid', {u}.uuid,
+        'email', {u}.email,
+        'role', {u}.role,
+        'is_active', {u}.is_active
+    )"""
+
+
+def profile_object(p):
+    return f"""json_build_object(
+        'uuid', {p}.uuid,
+        'first_name', {p}.first_name,
+        'last_name', {p}.last_name,
+        'phone', {p}.phone,
+        'gender', {p}.gender,
+        'address', {p}.address,
+        'dob', {p}.dob,
+        'user', {lookup("core_user", "j_user", user_object, f"{p}.user_id")},
+        'created_at', {timestamp(f"{p}.created_at")}
+    )"""
+
+
+def artist_object(a):
+    manager = lookup(
+        "profiles_userprofile", "j_manager", profile_object, f"{a}.manager_id"
+    )
+    return f"""json_build_object(
+        'uuid', {a}.uuid,
+        'name', {a}.name,
+        'no_of_album_released', {a}.no_of_album_released,
+        'first_released_year', {a}.first_released_year,
+        'dob', {a}.dob,
+        'gender', {a}.gender,
+        'address', {a}.address,
+        'manager', {manager},
+        'user', {lookup("core_user", "j_user", user_object, f"{a}.user_id")}
+    )"""
+
+
+def album_object(al):
+    owner = lookup("artists_artist", "j_artist", artist_object, f"{al}.owner_id")
+    return f"""json_build_object(
+        'uuid', {al}.uuid,
+        'name', {al}.name,
+        'owner', {owner},
+        'no_of_tracks', {al}.no_of_tracks,
+        'image', {media_url(f"{al}.image")},
+        'created_at', {timestamp(f"{al}.created_at")}
+    )"""
+
+
+def music_object(m):
+    album = lookup("albums_album", "j_album", album_object, f"{m}.album_id")
+    artist = lookup("artists_artist", "j_artist", artist_object, f"{m}.artist_id")
+    return f"""json_build_object(
+        'uuid', {m}.uuid,
+        'title', {m}.title,
+        'genre', {m}.genre,
+        'album', {album},
+        'artist', {artist},
+        'artist_id', {m}.artist_id,
+        'album_id', {m}.album_id
+    )"""
+
+
+class JSONQueryList(RawQueryList):
+    """
+    ``RawQueryList`` whose pages are rendered by PostgreSQL.
+
+    ``query`` is the scoped SELECT without ORDER BY and must expose the
+    ``created_at`` and ``uuid`` columns; pages are ordered by them. Slicing
+    returns a one-element list holding the page's JSON array text, which is
+    all DRF's paginator needs to compute the links.
+    """
+
+    def __init__(self, build, query, count_query, params=None):
+        super().__init__(None, query, count_query, params)
+        self.build = build
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            raise TypeError("JSONQueryList only supports slicing")
+        offset = index.start or 0
+        limit = None if index.stop is None else max(index.stop - offset, 0)
+        with connection.cursor() as c:
+            c.execute(
+                f"""
+                SELECT COALESCE(
+                    json_agg({self.build("page")} ORDER BY page.created_at, page.uuid),
+                    '[]'
+                )::text
+                FROM (
+                    SELECT k.*
+                    FROM ({self.query}) k
+                    ORDER BY k.created_at, k.uuid
+                    LIMIT %s OFFSET %s
+                ) page
+                """,
+                self.params + [limit, offset],
+            )
+            return [c.fetchone()[0]]
+
+
+def json_response(envelope, results):
+    """Send ``envelope`` with the pre-rendered ``results`` array spliced in."""
+    head = json.dumps(envelope, separators=(",", ":"))
+    body = f'{head[:-1]},"results":{results}}}'
+    return HttpResponse(body, content_type="application/json")
+
+
+def page_response(paginator, pages):
+    """Response for a ``PageNumberPagination`` page of a ``JSONQueryList``."""
+    return json_response(
+        {
+            "count": paginator.page.paginator.count,
+            "next": paginator.get_next_link(),
+            "previous": paginator.get_previous_link(),
+        },
+        pages[0],
+    )
@@ -0,0 +1,92 @@
+from django.db import connection
+
+from apps.core.models import Album, Artist, User, UserProfile
+from apps.core.rows import fetch_records
+
+USER_COLUMNS = "uuid, email, role, is_active"
+
+
+def fetch_in_bulk(model, table, ids, columns="*"):
+    """Fetch the ``model`` records of ``table`` with a uuid in ``ids``, in one query."""
+    ids = list({str(id) for id in ids if id is not None})
+    if not ids:
+        return {}
+    with connection.cursor() as c:
+        c.execute(
+            f"""
+            SELECT {columns}
+            FROM {table}
+            WHERE uuid = ANY(%s::uuid[])
+            """,
+            [ids],
+        )
+        records = fetch_records(c, model)
+    return {record.uuid: record for record in records}
+
+
+def attach(instances, relation, related_by_id):
+    """Set ``instance.<relation>`` from ``related_by_id`` using its fk id."""
+    for instance in instances:
+        related = related_by_id.get(getattr(instance, f"{relation}_id"))
+        if related is not None:
+            setattr(instance, relation, related)
+
+
+def load_profile_relations(profiles):
+    """Attach ``user`` to a page of user profiles with a single query."""
+    users = fetch_in_bulk(
+        User, "core_user", [p.user_id for p in profiles], USER_COLUMNS
+    )
+    attach(profiles, "user", users)
+    return profiles
+
+
+def load_artist_relations(artists):
+    """
+    Attach ``user``, ``manager`` and ``manager.user`` to a page of artists.
+
+    Costs one query for the manager profiles and one for every user involved,
+    however many artists the page holds.
+    """
+    managers = fetch_in_bulk(
+        UserProfile, "profiles_userprofile", [a.manager_id for a in artists]
+    )
+    user_ids = [a.user_id for a in artists]
+    user_ids += [m.user_id for m in managers.values()]
+    users = fetch_in_bulk(User, "core_user", user_ids, USER_COLUMNS)
+
+    attach(managers.values(), "user", users)
+    attach(artists, "manager", managers)
+    attach(artists, "user", users)
+    return artists
+
+
+def load_album_relations(albums, artists=None):
+    """Attach ``owner`` (with its manager and users) to a page of albums."""
+    if artists is None:
+        artists = fetch_in_bulk(
+            Artist, "artists_artist", [a.owner_id for a in albums]
+        )
+        load_artist_relations(list(artists.values()))
+    attach(albums, "owner", artists)
+    return albums
+
+
+def load_music_relations(musics):
+    """
+    Attach the whole ``album -> owner -> manager -> user`` and
+    ``artist -> manager -> user`` chains to a page of musics.
+
+    One query per level (albums, artists, managers, users), so the cost
+    does not grow with the page size.
+    """
+    albums = fetch_in_bulk(Album, "albums_album", [m.album_id for m in musics])
+    artist_ids = [m.artist_id for m in musics]
+    artist_ids += [a.owner_id for a in albums.values()]
+    artists = fetch_in_bulk(Artist, "artists_artist", artist_ids)
+    load_artist_relations(list(artists.values()))
+
+    load_album_relations(list(albums.values()), artists)
+    attach(musics, "album", albums)
+    attach(musics, "artist", artists)
+    return musics
@@ -0,0 +1,140 @@
+import difflib
+import json
+import logging
+import tempfile
+
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+from django.test import override_settings
+
+from apps.core import query_budget
+
+DEFAULT_BUDGET = settings.BASE_DIR / "query_budget.json"
+
+
+def dump(budget):
+    return json.dumps(budget, indent=2, sort_keys=True) + "\n"
+
+
+class Command(BaseCommand):
+    help = (
+        "Call every API route as each role against a fixed catalog in a "
+        "throwaway test database and check the statements and rows fetched "
+        "per endpoint against the query budget file"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--budget", default=str(DEFAULT_BUDGET))
+        parser.add_argument(
+            "--update",
+            action="store_true",
+            help="Write the measured values to the budget file",
+        )
+        parser.add_argument(
+            "--keepdb",
+            action="store_true",
+            help="Keep the test database between runs",
+        )
+
+    def handle(self, *args, **options):
+        routes = set(query_budget.api_routes())
+        covered = {(case.method, case.route) for case in query_budget.CASES}
+        if routes - covered:
+            missing = "\n".join(
+                f"  {method} /{query_budget.API_PREFIX}{route}"
+                for method, route in sorted(routes - covered)
+            )
+            raise CommandError(f"Routes without a budget case:\n{missing}")
+
+        measured = self.measure(options["keepdb"])
+        if options["update"]:
+            with open(options["budget"], "w") as f:
+                f.write(dump(measured))
+            message = f"Wrote {len(measured)} budgets to {options['budget']}"
+            self.stdout.write(self.style.SUCCESS(message))
+            return
+
+        try:
+            with open(options["budget"]) as f:
+                budget = json.load(f)
+        except FileNotFoundError:
+            raise CommandError(
+                f"{options['budget']} does not exist; run with --update to create it"
+            )
+        self.compare(budget, measured, options["budget"])
+
+    def measure(self, keepdb):
+        old_name = connection.settings_dict["NAME"]
+        connection.creation.create_test_db(
+            verbosity=0, autoclobber=True, keepdb=keepdb
+        )
+        # Refused requests would otherwise log a traceback each
+        logging.disable(logging.CRITICAL)
+        try:
+            with tempfile.TemporaryDirectory() as media, override_settings(
+                MEDIA_ROOT=media, **query_budget.SETTINGS
+            ):
+                with transaction.atomic():
+                    ids = query_budget.seed()
+                    measured = query_budget.measure(ids)
+                    transaction.set_rollback(True)
+        except query_budget.UnexpectedStatus as e:
+            raise CommandError(f"Requests with an unexpected status:\n{e}")
+        finally:
+            logging.disable(logging.NOTSET)
+            connection.creation.destroy_test_db(old_name, verbosity=0, keepdb=keepdb)
+        return measured
+
+    def compare(self, budget, measured, path):
+        failures = []
+        for key, actual in measured.items():
+            expected = budget.get(key)
+            if expected is None:
+                failures.append(f"{key}: not in the budget")
+                continue
+            if actual["status"] != expected["status"]:
+                failures.append(
+                    f"{key}: status {actual['status']}, budget {expected['status']}"
+                )
+            for metric in ("queries", "rows"):
+                if actual[metric] > expected[metric]:
+                    failures.append(
+                        f"{key}: {actual[metric]} {metric}, budget {expected[metric]}"
+                    )
+        stale = sorted(set(budget) - set(measured))
+        under = [
+            key
+            for key, actual in measured.items()
+            if key in budget
+            and actual != budget[key]
+            and all(actual[m] <= budget[key][m] for m in ("queries", "rows"))
+            and actual["status"] == budget[key]["status"]
+        ]
+
+        if failures or stale:
+            self.stdout.writelines(
+                difflib.unified_diff(
+                    dump(budget).splitlines(keepends=True),
+                    dump(measured).splitlines(keepends=True),
+                    fromfile=f"{path} (budget)",
+                    tofile="measured",
+                )
+            )
+            self.stdout.write("")
+        for key in stale:
+            self.stdout.write(f"{key}: in the budget but no longer measured")
+        for failure in failures:
+            self.stdout.write(self.style.ERROR(failure))
+        if under:
+            self.stdout.write(
+                f"{len(under)} endpoints are under budget; run with --update "
+                "to tighten it"
+            )
+        if failures or stale:
+            raise CommandError(
+                f"{len(failures) + len(stale)} query budget differences"
+            )
+        self.stdout.write(
+            self.style.SUCCESS(f"{len(measured)} endpoints within the query budget")
+        )
@@ -0,0 +1,22 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.musics import jobs
+
+
+class Command(BaseCommand):
+    help = (
+        "Mark the music export jobs whose worker went away as failed and "
+        "delete the exports past their retention, files included"
+    )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            failed = jobs.fail_orphaned_jobs()
+        expired = jobs.expire_exports()
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Marked {failed} interrupted exports failed and deleted "
+                f"{expired} expired ones"
+            )
+        )
@@ -0,0 +1,56 @@
+from django.conf import settings
+from django.core.management.base import BaseCommand, CommandError
+
+from apps.core import fingerprints
+
+
+class Command(BaseCommand):
+    help = (
+        "Show the heaviest SQL fingerprints with their p50/p95/p99 and source "
+        "locations, merged from the stats every worker writes to QUERY_STATS_DIR"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--top", type=int, default=20)
+        parser.add_argument(
+            "--sort", choices=list(fingerprints.SORT_KEYS), default="total"
+        )
+        parser.add_argument(
+            "--max-age",
+            type=int,
+            help="Ignore workers that have not written stats for this many "
+            "seconds (default: two windows)",
+        )
+
+    def handle(self, *args, **options):
+        directory = getattr(settings, "QUERY_STATS_DIR", None)
+        if not directory:
+            raise CommandError("QUERY_STATS_DIR is not set")
+        window = getattr(settings, "QUERY_STATS_WINDOW", 300)
+        max_age = options["max_age"] or 2 * window
+
+        snapshots = fingerprints.read_snapshots(directory, max_age)
+        if not snapshots:
+            raise CommandError(
+                f"No query stats in {directory} from the last {max_age}s; "
+                "workers write them when a window closes"
+            )
+        rows = fingerprints.top(
+            fingerprints.merge(snapshots), options["top"], options["sort"]
+        )
+
+        self.stdout.write(f"{len(snapshots)} workers, sorted by {options['sort']}")
+        for row in rows:
+            percentiles = "no calls in the last two windows"
+            if row["window_calls"]:
+                percentiles = (
+                    f"p50={row['p50_ms']}ms p95={row['p95_ms']}ms "
+                    f"p99={row['p99_ms']}ms"
+                )
+            self.stdout.write(
+                f"\n{row['id']}  calls={row['calls']} total={row['total_ms']}ms "
+                f"{percentiles}"
+            )
+            self.stdout.write(f"  {row['fingerprint'][:300]}")
+            for location in row["locations"]:
+                self.stdout.write(f"  at {location}")
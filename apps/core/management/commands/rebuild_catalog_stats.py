@@ -0,0 +1,13 @@
+from django.core.management.base import BaseCommand
+from django.db import transaction
+
+from apps.core import catalog_stats
+
+
+class Command(BaseCommand):
+    help = "Rebuild the catalog_stats rollup from the album and music tables"
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            rows = catalog_stats.rebuild()
+        self.stdout.write(self.style.SUCCESS(f"Rebuilt {rows} catalog_stats rows"))
@@ -0,0 +1,93 @@
+import datetime
+import time
+
+from django.core.management.base import BaseCommand, CommandError
+from django.db import connection, transaction
+
+from apps.core import synthetic
+
+
+def utc_date(value):
+    return datetime.datetime.fromisoformat(value).replace(tzinfo=synthetic.UTC)
+
+
+class Command(BaseCommand):
+    help = (
+        "Load a deterministic synthetic catalog (managers, artists, albums with "
+        "skewed sizes and musics) with COPY for load testing"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument("--managers", type=int, default=2_000)
+        parser.add_argument("--artists", type=int, default=100_000)
+        parser.add_argument("--albums", type=int, default=200_000)
+        parser.add_argument("--musics", type=int, default=1_000_000)
+        parser.add_argument("--seed", type=int, default=0)
+        parser.add_argument(
+            "--password",
+            default="seed-password",
+            help="Password of every generated user",
+        )
+        parser.add_argument("--domain", default="seed.test")
+        parser.add_argument("--since", type=utc_date, default="2020-01-01")
+        parser.add_argument("--until", type=utc_date, default="2025-01-01")
+        parser.add_argument(
+            "--flush",
+            action="store_true",
+            help="Empty the catalog tables first (TRUNCATE ... CASCADE, which "
+            "also empties every table referencing them)",
+        )
+
+    def handle(self, *args, **options):
+        if options["since"] >= options["until"]:
+            raise CommandError("--since must be before --until")
+        if options["albums"] and not options["artists"]:
+            raise CommandError("Albums need at least one artist")
+        if options["musics"] and not options["albums"]:
+            raise CommandError("Musics need at least one album")
+
+        start = time.perf_counter()
+
+        def log(message):
+            self.stdout.write(f"{time.perf_counter() - start:6.1f}s {message}")
+
+        with transaction.atomic():
+            if options["flush"]:
+                synthetic.flush()
+            elif self.seeded(options["domain"]):
+                raise CommandError(
+                    f"Users @{options['domain']} already exist; run with --flush "
+                    "or choose another --domain"
+                )
+            with synthetic.without_secondary_keys(log):
+                written = synthetic.generate(
+                    options["managers"],
+                    options["artists"],
+                    options["albums"],
+                    options["musics"],
+                    seed=options["seed"],
+                    password=options["password"],
+                    domain=options["domain"],
+                    since=options["since"],
+                    until=options["until"],
+                    log=log,
+                )
+        log("committed")
+        synthetic.analyze()
+        log("analyzed")
+
+        total = sum(written.values())
+        self.stdout.write(
+            self.style.SUCCESS(
+                f"Loaded {total} rows in {time.perf_counter() - start:.1f}s; "
+                f"sign in as admin@{options['domain']}, manager0@{options['domain']} "
+                f"or artist0@{options['domain']} with {options['password']!r}"
+            )
+        )
+
+    def seeded(self, domain):
+        with connection.cursor() as c:
+            c.execute(
+                "SELECT 1 FROM core_user WHERE email = %s", [f"admin@{domain}"]
+            )
+            return c.fetchone() is not None
@@ -0,0 +1,50 @@
+from django.core.management.base import BaseCommand, CommandError
+from django.db import transaction
+
+from apps.core import counters
+
+LABELS = {
+    "tracks": "album no_of_tracks",
+    "albums": "artist no_of_album_released",
+    "catalog_stats": "catalog_stats",
+}
+
+
+class Command(BaseCommand):
+    help = (
+        "Compare the album, artist and catalog_stats counters with the catalog "
+        "tables and optionally repair the ones that drifted"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--repair",
+            action="store_true",
+            help="Recompute the counters that do not match",
+        )
+
+    def handle(self, *args, **options):
+        with transaction.atomic():
+            if options["repair"]:
+                drift = counters.repair()
+            else:
+                drift = counters.find_drift()
+
+        total = 0
+        for kind, rows in drift.items():
+            total += len(rows)
+            for row in rows:
+                *key, stored, actual = row
+                self.stdout.write(
+                    f"{LABELS[kind]} {' '.join(map(str, key))}: "
+                    f"stored {stored}, actual {actual}"
+                )
+
+        if total == 0:
+            self.stdout.write(self.style.SUCCESS("All counters match"))
+        elif options["repair"]:
+            self.stdout.write(self.style.SUCCESS(f"Repaired {total} counters"))
+        else:
+            raise CommandError(
+                f"{total} counters do not match; run with --repair to fix them"
+            )
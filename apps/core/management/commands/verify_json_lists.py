@@ -0,0 +1,88 @@
+import json
+
+from django.core.management.base import BaseCommand, CommandError
+from django.test import override_settings
+from rest_framework.test import APIClient
+
+from apps.core.models import User
+from apps.users.principal import Principal
+
+LISTS = [
+    "/api/v1/artists/",
+    "/api/v1/albums/",
+    "/api/v1/musics/",
+    "/api/v1/musics/?cursor=",
+    "/api/v1/profiles/",
+]
+
+
+def differences(expected, actual, path="$"):
+    """Yield the paths at which ``actual`` differs from ``expected``."""
+    if isinstance(expected, dict) and isinstance(actual, dict):
+        if list(expected) != list(actual):
+            yield f"{path}: keys {list(expected)} != {list(actual)}"
+            return
+        for key in expected:
+            yield from differences(expected[key], actual[key], f"{path}.{key}")
+    elif isinstance(expected, list) and isinstance(actual, list):
+        if len(expected) != len(actual):
+            yield f"{path}: {len(expected)} items != {len(actual)} items"
+            return
+        for index, (left, right) in enumerate(zip(expected, actual)):
+            yield from differences(left, right, f"{path}[{index}]")
+    elif expected != actual or type(expected) is not type(actual):
+        yield f"{path}: {expected!r} != {actual!r}"
+
+
+class Command(BaseCommand):
+    help = (
+        "Render the list endpoints through the serializers and through "
+        "SQL_JSON_LISTS and check that both produce the same JSON"
+    )
+
+    def add_arguments(self, parser):
+        parser.add_argument(
+            "--pages", type=int, default=3, help="Pages to compare per list"
+        )
+        parser.add_argument("--page-size", type=int, default=10)
+
+    def fetch(self, client, url, sql_json):
+        with override_settings(SQL_JSON_LISTS=sql_json, ALLOWED_HOSTS=["*"]):
+            response = client.get(url)
+        if response.status_code != 200:
+            raise CommandError(f"GET {url} returned {response.status_code}")
+        return json.loads(response.content)
+
+    def compare(self, client, url, pages):
+        failures = 0
+        for _ in range(pages):
+            expected = self.fetch(client, url, False)
+            actual = self.fetch(client, url, True)
+            for difference in differences(expected, actual):
+                failures += 1
+                self.stdout.write(f"{url} {difference}")
+            url = expected.get("next")
+            if not url:
+                break
+        return failures
+
+    def handle(self, *args, **options):
+        failures = 0
+        for role in User.Role.values:
+            user = User.objects.filter(role=role, is_active=True).first()
+            if user is None:
+                continue
+            client = APIClient()
+            client.force_authenticate(
+                user=user, token=Principal(user.uuid, user.role, user.email)
+            )
+            for url in LISTS:
+                separator = "&" if "?" in url else "?"
+                url = f"{url}{separator}page_size={options['page_size']}"
+                found = self.compare(client, url, options["pages"])
+                self.stdout.write(f"{role} {url}: {found or 'no'} differences")
+                failures += found
+
+        if failures:
+            raise CommandError(f"{failures} differences between the two paths")
+        self.stdout.write(self.style.SUCCESS("SQL_JSON_LISTS output matches"))
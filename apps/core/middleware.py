@@ -0,0 +1,103 @@
+"""
+Per-request SQL instrumentation.
+
+``QueryTimingMiddleware`` installs an ``execute_wrapper`` on every database
+connection for the duration of the request, counting the statements, the
+time spent in them and the statements run more than once with the same SQL
+(the usual sign of a query in a loop). The totals go out as a
+``Server-Timing`` header, which browsers' developer tools and API clients
+can read, and as one logfmt line per request on the ``apps.core.middleware``
+logger.
+
+The wrapper does a clock read and a dict update per statement, so it is
+cheap enough to leave on; ``QUERY_TIMING = False`` removes it. Statements
+are also fed to ``apps.core.fingerprints`` unless ``QUERY_FINGERPRINTS`` is
+off. Queries run while a streaming response is being consumed are not
+counted.
+"""
+
+import logging
+import time
+from contextlib import ExitStack
+
+from django.conf import settings
+from django.core.exceptions import MiddlewareNotUsed
+from django.db import connections
+
+from apps.core import fingerprints
+
+logger = logging.getLogger(__name__)
+
+# Characters of the most repeated statement included in the log line
+LOGGED_SQL_LENGTH = 200
+
+
+class QueryStats:
+    __slots__ = ("count", "duration", "statements", "collector")
+
+    def __init__(self, collector=None):
+        self.count = 0
+        self.duration = 0.0
+        self.statements = {}
+        self.collector = collector
+
+    def __call__(self, execute, sql, params, many, context):
+        start = time.perf_counter()
+        try:
+            return execute(sql, params, many, context)
+        finally:
+            elapsed = time.perf_counter() - start
+            self.duration += elapsed
+            self.count += 1
+            statements = self.statements
+            statements[sql] = statements.get(sql, 0) + 1
+            if self.collector is not None:
+                self.collector.record(sql, elapsed)
+
+    @property
+    def repeated(self):
+        """Executions of a statement beyond its first."""
+        return self.count - len(self.statements)
+
+    def most_repeated(self):
+        return max(self.statements.items(), key=lambda item: item[1])
+
+
+class QueryTimingMiddleware:
+    def __init__(self, get_response):
+        if not getattr(settings, "QUERY_TIMING", True):
+            raise MiddlewareNotUsed
+        self.get_response = get_response
+        self.collector = None
+        if getattr(settings, "QUERY_FINGERPRINTS", True):
+            self.collector = fingerprints.collector
+
+    def __call__(self, request):
+        stats = QueryStats(self.collector)
+        start = time.perf_counter()
+        with ExitStack() as stack:
+            for connection in connections.all():
+                stack.enter_context(connection.execute_wrapper(stats))
+            response = self.get_response(request)
+        total = time.perf_counter() - start
+
+        timing = (
+            f'db;dur={stats.duration * 1000:.1f};desc="{stats.count} queries",'
+            f" total;dur={total * 1000:.1f}"
+        )
+        if response.has_header("Server-Timing"):
+            # Set by debug_toolbar when it is showing
+            timing = f"{response['Server-Timing']}, {timing}"
+        response["Server-Timing"] = timing
+        line = (
+            f"method={request.method} path={request.path}"
+            f" status={response.status_code} queries={stats.count}"
+            f" db_ms={stats.duration * 1000:.1f} total_ms={total * 1000:.1f}"
+            f" repeated={stats.repeated}"
+        )
+        if stats.repeated:
+            sql, times = stats.most_repeated()
+            sql = " ".join(sql.split())[:LOGGED_SQL_LENGTH].replace('"', '\\"')
+            line += f' most_repeated={times} sql="{sql}"'
+        logger.info(line)
+        return response
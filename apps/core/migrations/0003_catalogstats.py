@@ -0,0 +1,29 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:17
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0002_alter_user_is_active'),
+    ]
+
+    operations = [
+        migrations.CreateModel(
+            name='CatalogStats',
+            fields=[
+                ('id', models.BigAutoField(auto_created=True, primary_key=True, serialize=False, verbose_name='ID')),
+                ('scope', models.CharField(choices=[('ARTIST', 'Artist'), ('MANAGER', 'Manager')], max_length=10)),
+                ('scope_id', models.UUIDField()),
+                ('album_count', models.IntegerField(default=0)),
+                ('music_count', models.IntegerField(default=0)),
+            ],
+            options={
+                'verbose_name': 'Catalog Stats',
+                'verbose_name_plural': 'Catalog Stats',
+                'db_table': 'catalog_stats',
+                'constraints': [models.UniqueConstraint(fields=('scope', 'scope_id'), name='catalog_stats_scope_uniq')],
+            },
+        ),
+    ]
@@ -0,0 +1,44 @@
+from django.db import migrations
+
+# A frozen copy of catalog_stats.rebuild() against the schema of this
+# migration, so later changes to that module or to the models cannot break it.
+REBUILD_CATALOG_STATS = [
+    "DELETE FROM catalog_stats",
+    """
+    INSERT INTO catalog_stats (scope, scope_id, album_count, music_count)
+    SELECT 'ARTIST', a.uuid, COALESCE(al.total, 0), COALESCE(mu.total, 0)
+    FROM artists_artist a
+    LEFT JOIN (
+        SELECT owner_id, count(*) AS total
+        FROM albums_album
+        GROUP BY owner_id
+    ) al ON al.owner_id = a.uuid
+    LEFT JOIN (
+        SELECT artist_id, count(*) AS total
+        FROM musics_music
+        GROUP BY artist_id
+    ) mu ON mu.artist_id = a.uuid
+    """,
+    """
+    INSERT INTO catalog_stats (scope, scope_id, album_count, music_count)
+    SELECT 'MANAGER', a.manager_id, sum(s.album_count), sum(s.music_count)
+    FROM catalog_stats s
+    JOIN artists_artist a ON a.uuid = s.scope_id
+    WHERE s.scope = 'ARTIST' AND a.manager_id IS NOT NULL
+    GROUP BY a.manager_id
+    """,
+]
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0003_catalogstats"),
+        ("albums", "0004_album_album_created_at_idx"),
+        ("artists", "0010_artist_artist_created_at_uuid_idx"),
+        ("musics", "0002_music_music_created_at_uuid_idx_and_more"),
+    ]
+
+    operations = [
+        migrations.RunSQL(REBUILD_CATALOG_STATS, migrations.RunSQL.noop),
+    ]
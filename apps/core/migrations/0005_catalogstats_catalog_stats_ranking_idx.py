@@ -0,0 +1,17 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:19
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0004_rebuild_catalog_stats'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='catalogstats',
+            index=models.Index(fields=['scope', '-album_count'], name='catalog_stats_ranking_idx'),
+        ),
+    ]
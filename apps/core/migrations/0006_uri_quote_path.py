@@ -0,0 +1,31 @@
+from django.db import migrations
+
+# Percent-encodes a storage path the way django.utils.encoding.filepath_to_uri
+# does, so media URLs built in SQL match FieldFile.url.
+CREATE_URI_QUOTE_PATH = r"""
+CREATE OR REPLACE FUNCTION uri_quote_path(path text) RETURNS text
+LANGUAGE sql IMMUTABLE STRICT PARALLEL SAFE AS $$
+    SELECT COALESCE(string_agg(
+        CASE
+            WHEN b >= 128 THEN '%' || upper(to_hex(b))
+            WHEN chr(b) ~ '^[A-Za-z0-9_.~/!*()''-]$' THEN chr(b)
+            ELSE '%' || upper(lpad(to_hex(b), 2, '0'))
+        END, '' ORDER BY i), '')
+    FROM (SELECT convert_to(replace(path, '\', '/'), 'UTF8') AS bytes) s,
+        generate_series(0, length(s.bytes) - 1) AS i,
+        get_byte(s.bytes, i) AS b
+$$
+"""
+
+DROP_URI_QUOTE_PATH = "DROP FUNCTION IF EXISTS uri_quote_path(text)"
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ("core", "0005_catalogstats_catalog_stats_ranking_idx"),
+    ]
+
+    operations = [
+        migrations.RunSQL(CREATE_URI_QUOTE_PATH, DROP_URI_QUOTE_PATH),
+    ]
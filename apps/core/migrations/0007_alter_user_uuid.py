@@ -0,0 +1,20 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:52
+
+import django.contrib.postgres.functions
+import uuid
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('core', '0006_uri_quote_path'),
+    ]
+
+    operations = [
+        migrations.AlterField(
+            model_name='user',
+            name='uuid',
+            field=models.UUIDField(db_default=django.contrib.postgres.functions.RandomUUID(), default=uuid.uuid4, editable=False, primary_key=True, serialize=False),
+        ),
+    ]
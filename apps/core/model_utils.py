@@ -1,11 +1,15 @@
 import uuid
 
 from django.conf import settings
+from django.contrib.postgres.functions import RandomUUID
 from django.db import models
 
 
 class BaseModel(models.Model):
-    uuid = models.UUIDField(primary_key=True, editable=False, default=uuid.uuid4)
+    # The raw INSERTs in the services leave the key to the database
+    uuid = models.UUIDField(
+        primary_key=True, editable=False, default=uuid.uuid4, db_default=RandomUUID()
+    )
     created_at = models.DateTimeField(auto_now_add=True)
     updated_at = models.DateTimeField(auto_now=True)
 
@@ -2,8 +2,9 @@ import datetime
 
 from django.contrib.auth.models import AbstractBaseUser, PermissionsMixin
 from django.core.exceptions import ValidationError
-from django.db import models
+from django.db import models, transaction
 
+from . import counters
 from .managers import CustomUserManager
 from .model_utils import BaseModel, BaseProfileModel
 
@@ -64,6 +65,9 @@ class Artist(BaseProfileModel):
     class Meta(BaseProfileModel.Meta):
         ordering = ["name"]
         app_label = "artists"
+        indexes = [
+            models.Index(fields=["created_at", "uuid"], name="artist_created_at_uuid_idx"),
+        ]
 
     def clean(self):
 
@@ -89,15 +93,13 @@ class Album(BaseModel):
     class Meta(BaseModel.Meta):
         ordering = ["name"]
         app_label = "albums"
+        indexes = [
+            models.Index(fields=["created_at"], name="album_created_at_idx"),
+        ]
 
     def __str__(self) -> str:
         return self.name
 
-    def update_track_count(self):
-        """Updates the number of tracks in the album."""
-        self.no_of_tracks = self.music_set.count()
-        self.save()
-
 
 class Music(BaseModel):
     class Genre(models.TextChoices):
@@ -124,23 +126,135 @@ class Music(BaseModel):
     def __str__(self) -> str:
         return self.title
 
-    def save(self, *args, **kwargs):
-        old_album = None
-        if self.pk:  # If the object is being updated (not created)
-            old_album = Music.objects.get(pk=self.pk).album
-        super().save(*args, **kwargs)
-        if self.album:
-            self.album.update_track_count()
+    @classmethod
+    def from_db(cls, db, field_names, values):
+        instance = super().from_db(db, field_names, values)
+        if {"album_id", "artist_id"} & instance.get_deferred_fields():
+            # Unknown until loaded_ids() reads them
+            instance._loaded_ids = None
+        else:
+            instance._loaded_ids = (instance.album_id, instance.artist_id)
+        return instance
 
-        if old_album and old_album != self.album:
-            old_album.update_track_count()
+    def loaded_ids(self):
+        """The album and artist ids as last read from or written to the database."""
+        if not hasattr(self, "_loaded_ids"):
+            return self.album_id, self.artist_id
+        if self._loaded_ids is None:
+            row = Music.objects.filter(pk=self.pk).values_list("album_id", "artist_id")
+            self._loaded_ids = row.first() or (None, None)
+        return self._loaded_ids
+
+    def written_ids(self, update_fields=None):
+        """The album/artist id columns an UPDATE with these update_fields writes."""
+        if update_fields is None:
+            # Django leaves deferred fields out of the UPDATE
+            deferred = self.get_deferred_fields()
+            return {f for f in ("album_id", "artist_id") if f not in deferred}
+        fields = set(update_fields)
+        return {f for f in ("album_id", "artist_id") if {f, f[:-3]} & fields}
+
+    def save(self, *args, **kwargs):
+        if self._state.adding:
+            with transaction.atomic():
+                super().save(*args, **kwargs)
+                counters.music_added(self.album_id, self.artist_id)
+            self._loaded_ids = (self.album_id, self.artist_id)
+            return
+        written = self.written_ids(kwargs.get("update_fields"))
+        if not written:
+            super().save(*args, **kwargs)
+            return
+        with transaction.atomic():
+            old_album_id, old_artist_id = self.loaded_ids()
+            super().save(*args, **kwargs)
+            new_ids = (
+                self.album_id if "album_id" in written else old_album_id,
+                self.artist_id if "artist_id" in written else old_artist_id,
+            )
+            counters.music_moved(old_album_id, old_artist_id, *new_ids)
+        self._loaded_ids = new_ids
 
     def delete(self, *args, **kwargs):
-        album = self.album
-        super().delete(*args, **kwargs)
-        if album:
-            album.update_track_count()
-        return album
+        album_id, artist_id = self.loaded_ids()
+        with transaction.atomic():
+            deleted = super().delete(*args, **kwargs)
+            counters.music_removed(album_id, artist_id)
+        return deleted
 
     class Meta(BaseModel.Meta):
         app_label = "musics"
+        indexes = [
+            models.Index(fields=["created_at", "uuid"], name="music_created_at_uuid_idx"),
+            models.Index(
+                fields=["artist", "created_at", "uuid"],
+                name="music_artist_created_idx",
+            ),
+        ]
+
+
+class ExportJob(BaseModel):
+    """A background export of the musics visible to the user who requested it."""
+
+    class Format(models.TextChoices):
+        CSV = "CSV", "CSV"
+        NDJSON = "NDJSON", "NDJSON"
+
+    class Status(models.TextChoices):
+        PENDING = "PENDING", "Pending"
+        RUNNING = "RUNNING", "Running"
+        SUCCEEDED = "SUCCEEDED", "Succeeded"
+        FAILED = "FAILED", "Failed"
+
+    requested_by = models.ForeignKey(
+        User, on_delete=models.CASCADE, related_name="export_jobs"
+    )
+    role = models.CharField(max_length=20, choices=User.Role.choices)
+    scope_id = models.UUIDField(null=True, blank=True)
+    format = models.CharField(max_length=10, choices=Format.choices, default=Format.CSV)
+    status = models.CharField(
+        max_length=10, choices=Status.choices, default=Status.PENDING
+    )
+    total_rows = models.IntegerField(null=True, blank=True)
+    exported_rows = models.IntegerField(default=0)
+    file = models.FileField(upload_to="exports/", null=True, blank=True)
+    error = models.TextField(null=True, blank=True)
+    started_at = models.DateTimeField(null=True, blank=True)
+    finished_at = models.DateTimeField(null=True, blank=True)
+
+    class Meta(BaseModel.Meta):
+        app_label = "musics"
+
+    def __str__(self) -> str:
+        return f"{self.format} export {self.uuid} ({self.status})"
+
+
+class CatalogStats(models.Model):
+    """Album and music counters rolled up per artist and per manager."""
+
+    class Scope(models.TextChoices):
+        ARTIST = "ARTIST", "Artist"
+        MANAGER = "MANAGER", "Manager"
+
+    scope = models.CharField(max_length=10, choices=Scope.choices)
+    scope_id = models.UUIDField()
+    album_count = models.IntegerField(default=0)
+    music_count = models.IntegerField(default=0)
+
+    class Meta:
+        db_table = "catalog_stats"
+        verbose_name = "Catalog Stats"
+        verbose_name_plural = "Catalog Stats"
+        constraints = [
+            models.UniqueConstraint(
+                fields=["scope", "scope_id"], name="catalog_stats_scope_uniq"
+            ),
+        ]
+        indexes = [
+            models.Index(
+                fields=["scope", "-album_count"], name="catalog_stats_ranking_idx"
+            ),
+        ]
+
+    def __str__(self) -> str:
+        return f"{self.scope} {self.scope_id}"
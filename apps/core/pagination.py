@@ -0,0 +1,199 @@
+import base64
+import json
+from datetime import datetime
+from uuid import UUID
+
+from django.db import connection
+from rest_framework.exceptions import NotFound
+from rest_framework.utils.urls import replace_query_param
+
+from apps.core.rows import fetch_records, model_record_class
+
+DEFAULT_PAGE_SIZE = 10
+MAX_PAGE_SIZE = 100
+
+
+class RawQueryList:
+    """
+    Lazy, sliceable result list for a raw SELECT, whose rows are returned
+    as ``model`` records (see ``apps.core.rows``).
+
+    Django's Paginator (and therefore DRF's PageNumberPagination) only calls
+    ``count()`` and slices the object list, so handing it this instead of a
+    fetched list reads just the requested page with LIMIT/OFFSET and the
+    total with a separate scoped COUNT.
+
+    ``query`` must end with a deterministic ORDER BY, ``count_query`` must
+    count the same rows, and both take the same ``params``.
+    """
+
+    ordered = True
+
+    def __init__(self, model, query, count_query, params=None):
+        self.model = model
+        self.query = query
+        self.count_query = count_query
+        self.params = list(params or [])
+
+    def count(self):
+        with connection.cursor() as c:
+            c.execute(self.count_query, self.params)
+            return c.fetchone()[0]
+
+    def __len__(self):
+        return self.count()
+
+    def __getitem__(self, index):
+        if not isinstance(index, slice):
+            return self[index : index + 1][0]
+        offset = index.start or 0
+        limit = None if index.stop is None else max(index.stop - offset, 0)
+        with connection.cursor() as c:
+            c.execute(
+                f"{self.query} LIMIT %s OFFSET %s",
+                self.params + [limit, offset],
+            )
+            return fetch_records(c, self.model)
+
+
+class KeysetPagination:
+    """
+    Opt-in ``?cursor=`` pagination that seeks on ``(created_at, uuid)``.
+
+    Each page is read with a row-value comparison against the last key of
+    the previous page, so with a ``(created_at, uuid)`` index every page
+    costs the same regardless of depth. The response carries opaque
+    ``next``/``previous`` cursor links instead of a total count.
+    """
+
+    cursor_query_param = "cursor"
+    invalid_cursor_message = "Invalid cursor"
+
+    def __init__(self, page_size=DEFAULT_PAGE_SIZE):
+        self.page_size = self.clean_page_size(page_size)
+        self.request = None
+        self.has_next = False
+        self.has_previous = False
+        self.first_key = None
+        self.last_key = None
+
+    @staticmethod
+    def clean_page_size(value):
+        """``?page_size=`` as an int in ``1..MAX_PAGE_SIZE``, else the default."""
+        try:
+            page_size = int(value)
+        except (TypeError, ValueError):
+            return DEFAULT_PAGE_SIZE
+        return min(max(page_size, 1), MAX_PAGE_SIZE)
+
+    @classmethod
+    def is_requested(cls, request):
+        return cls.cursor_query_param in request.query_params
+
+    def encode_cursor(self, key, reverse=False):
+        created_at, uuid = key
+        cursor = json.dumps([created_at.isoformat(), str(uuid), reverse])
+        return base64.urlsafe_b64encode(cursor.encode()).decode()
+
+    def decode_cursor(self, request):
+        encoded = request.query_params.get(self.cursor_query_param, "")
+        if not encoded:
+            return None, False
+        try:
+            cursor = base64.urlsafe_b64decode(encoded.encode()).decode()
+            created_at, uuid, reverse = json.loads(cursor)
+            key = (datetime.fromisoformat(created_at), UUID(uuid))
+        except (TypeError, ValueError):
+            raise NotFound(self.invalid_cursor_message)
+        return key, bool(reverse)
+
+    def fetch_page(self, query, request, params=None, columns="k.*"):
+        """
+        Read the ``columns`` of the page of ``query`` selected by the
+        request's cursor and work out whether there are pages around it.
+
+        ``query`` is the scoped SELECT without ORDER BY; it must expose the
+        ``created_at`` and ``uuid`` columns of the paginated table.
+        """
+        self.request = request
+        key, reverse = self.decode_cursor(request)
+        params = list(params or [])
+        comparison, direction = (">", "ASC") if not reverse else ("<", "DESC")
+        seek = ""
+        if key is not None:
+            seek = f"WHERE (k.created_at, k.uuid) {comparison} (%s, %s)"
+            params += list(key)
+
+        with connection.cursor() as c:
+            c.execute(
+                f"""
+                SELECT {columns}
+                FROM ({query}) k
+                {seek}
+                ORDER BY k.created_at {direction}, k.uuid {direction}
+                LIMIT %s
+                """,
+                params + [self.page_size + 1],
+            )
+            rows = c.fetchall()
+            columns = [col[0] for col in c.description]
+
+        has_more = len(rows) > self.page_size
+        rows = rows[: self.page_size]
+        if reverse:
+            rows.reverse()
+            self.has_previous, self.has_next = has_more, True
+        else:
+            self.has_next, self.has_previous = has_more, key is not None
+        if key is not None:
+            self.first_key = self.last_key = key
+        return rows, columns
+
+    def set_keys(self, keys):
+        if keys:
+            self.first_key, self.last_key = keys[0], keys[-1]
+
+    def paginate_query(self, model, query, request, params=None):
+        """Return the page of ``query`` as ``model`` records."""
+        rows, columns = self.fetch_page(query, request, params)
+        cls = model_record_class(model, tuple(columns))
+        instances = [cls(*row) for row in rows]
+        self.set_keys([(instance.created_at, instance.uuid) for instance in instances])
+        return instances
+
+    def paginate_json(self, build, query, request, params=None):
+        """
+        Return the page of ``query`` as JSON array text, each row rendered
+        by PostgreSQL with the ``build(alias)`` expression.
+        """
+        rows, _ = self.fetch_page(
+            query,
+            request,
+            params,
+            columns=f"k.created_at, k.uuid, ({build('k')})::text",
+        )
+        self.set_keys([(created_at, uuid) for created_at, uuid, _ in rows])
+        return "[" + ",".join(row[2] for row in rows) + "]"
+
+    def get_link(self, key, reverse=False):
+        url = self.request.build_absolute_uri()
+        return replace_query_param(
+            url, self.cursor_query_param, self.encode_cursor(key, reverse)
+        )
+
+    def get_next_link(self):
+        if not self.has_next or self.last_key is None:
+            return None
+        return self.get_link(self.last_key)
+
+    def get_previous_link(self):
+        if not self.has_previous or self.first_key is None:
+            return None
+        return self.get_link(self.first_key, reverse=True)
+
+    def get_paginated_data(self, data):
+        return {
+            "next": self.get_next_link(),
+            "previous": self.get_previous_link(),
+            "results": data,
+        }
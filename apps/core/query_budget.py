@@ -0,0 +1,459 @@
+"""
+Query budgets for the API endpoints.
+
+``seed`` creates a small fixed catalog (two managers with three artists
+each, two albums per artist and five tracks per album, plus a finished
+export) with deterministic uuids. ``CASES`` describes a request for every
+method of every route under ``api/v1/``; ``measure`` runs each of them once
+per role, inside a rolled-back transaction and with the in-process caches
+cleared, and records the status, the number of statements and the number
+of rows they returned. The ``check_query_budget`` command compares the
+result with ``query_budget.json``.
+
+Every request must succeed unless its case lists the role as refused, so
+a broken endpoint fails the run instead of having its error budgeted.
+"""
+
+import gzip
+
+import io
+import uuid
+from collections import namedtuple
+
+from django.contrib.auth.hashers import make_password
+from django.core import signing
+from django.core.cache import cache
+from django.core.files.base import ContentFile
+from django.db import connection, transaction
+from django.urls import URLResolver, get_resolver
+from rest_framework.test import APIClient
+
+from apps.core import counters, scopes
+from apps.core.models import Album, Artist, ExportJob, Music, User, UserProfile
+from apps.users.authentication import user_cache
+from apps.users.utils import JWTManager
+
+API_PREFIX = "api/v1/"
+NAMESPACE = uuid.UUID("5b1d7a52-0d8e-4c55-9a64-2d3d1c0e6f4a")
+PASSWORD = "budget-password"
+# Settings the budget is measured under
+SETTINGS = {
+    "ALLOWED_HOSTS": ["testserver"],
+    "SQL_JSON_LISTS": False,
+    "EMAIL_BACKEND": "django.core.mail.backends.locmem.EmailBackend",
+    "PASSWORD_HASHERS": ["django.contrib.auth.hashers.MD5PasswordHasher"],
+}
+
+MANAGERS = 2
+ARTISTS_PER_MANAGER = 3
+ALBUMS_PER_ARTIST = 2
+MUSICS_PER_ALBUM = 5
+
+# The user each role's requests are made as
+ROLE_USERS = {
+    "SUPER_ADMIN": "admin@budget.test",
+    "ARTIST_MANAGER": "manager0@budget.test",
+    "ARTIST": "artist0-0@budget.test",
+}
+
+
+def fixed_uuid(name):
+    return uuid.uuid5(NAMESPACE, name)
+
+
+def seed():
+    """Create the budget catalog and return the ids the cases refer to."""
+    password = make_password(PASSWORD)
+    users, managers, artists, albums, musics = [], [], [], [], []
+
+    def user(email, role):
+        users.append(
+            User(uuid=fixed_uuid(email), email=email, role=role, password=password)
+        )
+        return users[-1]
+
+    user(ROLE_USERS["SUPER_ADMIN"], User.Role.SUPER_ADMIN)
+    for m in range(MANAGERS):
+        manager = UserProfile(
+            uuid=fixed_uuid(f"manager{m}"),
+            first_name=f"Manager{m}",
+            last_name="Budget",
+            gender="M",
+            user=user(f"manager{m}@budget.test", User.Role.ARTIST_MANAGER),
+        )
+        managers.append(manager)
+        for a in range(ARTISTS_PER_MANAGER):
+            artist = Artist(
+                uuid=fixed_uuid(f"artist{m}-{a}"),
+                name=f"Artist {m}-{a}",
+                gender="F",
+                first_released_year=2010,
+                user=user(f"artist{m}-{a}@budget.test", User.Role.ARTIST),
+                manager=manager,
+            )
+            artists.append(artist)
+            for b in range(ALBUMS_PER_ARTIST):
+                album = Album(
+                    uuid=fixed_uuid(f"album{m}-{a}-{b}"),
+                    name=f"Album {m}-{a}-{b}",
+                    owner=artist,
+                )
+                albums.append(album)
+                for t in range(MUSICS_PER_ALBUM):
+                    musics.append(
+                        Music(
+                            uuid=fixed_uuid(f"music{m}-{a}-{b}-{t}"),
+                            title=f"Track {m}-{a}-{b}-{t}",
+                            genre=Music.Genre.ROCK,
+                            album=album,
+                            artist=artist,
+                        )
+                    )
+
+    User.objects.bulk_create(users)
+    UserProfile.objects.bulk_create(managers)
+    Artist.objects.bulk_create(artists)
+    Album.objects.bulk_create(albums)
+    Music.objects.bulk_create(musics)
+    export = ExportJob.objects.create(
+        uuid=fixed_uuid("export"),
+        requested_by=users[0],
+        role=User.Role.SUPER_ADMIN,
+        status=ExportJob.Status.SUCCEEDED,
+    )
+    export.file.save("budget.csv.gz", ContentFile(gzip.compress(b"title\n")))
+    counters.repair()
+
+    return {
+        "manager": managers[0].uuid,
+        "artist": artists[0].uuid,
+        "album": albums[0].uuid,
+        "music": musics[0].uuid,
+        "export": export.uuid,
+    }
+
+
+class UnexpectedStatus(Exception):
+    pass
+
+
+# ``refused`` maps the roles the route turns away to the status they get
+Case = namedtuple(
+    "Case",
+    "method route query build format refused",
+    defaults=("", None, "json", None),
+)
+
+ROLES_BUT_ADMIN = ("ARTIST_MANAGER", "ARTIST")
+
+
+def refused(status, roles=ROLES_BUT_ADMIN):
+    return {role: status for role in roles}
+
+
+def nothing(ids, role):
+    return {}, None
+
+
+def by(kind):
+    def build(ids, role):
+        return {"uuid": ids[kind]}, None
+
+    return build
+
+
+def with_data(data, kind=None):
+    def build(ids, role):
+        kwargs = {"uuid": ids[kind]} if kind else {}
+        return kwargs, data(ids, role) if callable(data) else data
+
+    return build
+
+
+def artist_data(ids, role):
+    return {
+        "name": "Budget artist",
+        "first_released_year": 2020,
+        "gender": "F",
+        "dob": "1990-01-01",
+        "address": "Kathmandu",
+    }
+
+
+def manager_data(ids, role):
+    return {
+        "first_name": "Budget",
+        "last_name": "Manager",
+        "gender": "M",
+        "dob": "1985-01-01",
+        "address": "Pokhara",
+        "phone": "9800000000",
+    }
+
+
+def new_user(role):
+    return {"email": f"new-{role.lower()}@budget.test", "password": PASSWORD}
+
+
+def music_data(ids, role):
+    return {
+        "title": "Budget track",
+        "genre": Music.Genre.POP,
+        "artist": str(ids["artist"]),
+        "album": str(ids["album"]),
+    }
+
+
+def bulk_data(ids, role):
+    return {
+        "rows": [
+            {
+                "title": f"Bulk {index}",
+                "genre": Music.Genre.POP,
+                "artist_id": str(ids["artist"]),
+                "album_id": str(ids["album"]),
+            }
+            for index in range(5)
+        ]
+    }
+
+
+def bulk_csv_data(ids, role):
+    lines = ["title,genre,artist_id,album_id"] + [
+        f"CSV {index},POP,{ids['artist']},{ids['album']}" for index in range(5)
+    ]
+    upload = io.BytesIO("\n".join(lines).encode())
+    upload.name = "musics.csv"
+    return {"file": upload}
+
+
+def reset_data(ids, role):
+    token = signing.dumps(ROLE_USERS[role])
+    cache.set(f"reset_token_{token}", True, timeout=900)
+    return {"token": token, "password": PASSWORD}
+
+
+def refresh_data(ids, role):
+    user = User.objects.get(email=ROLE_USERS[role])
+    tokens = JWTManager(
+        {"uuid": user.uuid, "email": user.email, "role": user.role}
+    ).generate_jwt_token()
+    return {"refresh_token": tokens[1]}
+
+
+CASES = [
+    Case(
+        "POST",
+        "register/",
+        build=with_data(lambda ids, role: {**new_user(role), "role": "ARTIST"}),
+    ),
+    Case(
+        "POST",
+        "login/",
+        build=with_data(
+            lambda ids, role: {"email": ROLE_USERS[role], "password": PASSWORD}
+        ),
+    ),
+    Case("POST", "auth/refresh/", build=with_data(refresh_data)),
+    Case("GET", "auth/cache-stats/", build=nothing, refused=refused(403)),
+    # The super admin has no profile
+    Case("GET", "me/", build=nothing, refused=refused(404, ["SUPER_ADMIN"])),
+    Case(
+        "POST",
+        "forget-password/",
+        build=with_data(lambda ids, role: {"email": ROLE_USERS[role]}),
+    ),
+    Case("POST", "reset-password/", build=with_data(reset_data)),
+    Case("GET", "artists/", build=nothing),
+    Case(
+        "POST",
+        "artists/",
+        build=with_data(
+            lambda ids, role: {
+                **artist_data(ids, role),
+                "user": new_user(role),
+                "manager": {"uuid": str(ids["manager"])},
+            }
+        ),
+    ),
+    Case("GET", "artists/count/", build=nothing),
+    Case("GET", "artists/data/", build=nothing),
+    Case("GET", "artists/<str:uuid>/", build=by("artist")),
+    Case(
+        "PUT",
+        "artists/<str:uuid>/",
+        build=with_data(
+            lambda ids, role: {
+                **artist_data(ids, role),
+                "manager": {"uuid": str(ids["manager"])},
+            },
+            "artist",
+        ),
+    ),
+    Case("DELETE", "artists/<str:uuid>/", build=by("artist")),
+    Case("GET", "musics/", build=nothing),
+    Case("GET", "musics/", "?cursor=", build=nothing),
+    Case("POST", "musics/", build=with_data(music_data)),
+    Case("GET", "musics/csv/", build=nothing),
+    Case("POST", "musics/bulk/", build=with_data(bulk_data)),
+    Case(
+        "POST",
+        "musics/bulk/csv/",
+        build=with_data(bulk_csv_data),
+        format="multipart",
+    ),
+    Case("POST", "musics/exports/", build=with_data({"format": "csv"})),
+    # The export is the super admin's
+    Case("GET", "musics/exports/<str:uuid>/", build=by("export"), refused=refused(404)),
+    Case(
+        "GET",
+        "musics/exports/<str:uuid>/download/",
+        build=by("export"),
+        refused=refused(404),
+    ),
+    Case("GET", "musics/<str:uuid>/", build=by("music")),
+    Case("PUT", "musics/<str:uuid>/", build=with_data(music_data, "music")),
+    Case("DELETE", "musics/<str:uuid>/", build=by("music")),
+    Case("GET", "musics/genres/all/", build=nothing),
+    Case("GET", "musics/genres/count/", build=nothing),
+    Case("GET", "profiles/", build=nothing),
+    Case(
+        "POST",
+        "profiles/",
+        build=with_data(
+            lambda ids, role: {**manager_data(ids, role), "user": new_user(role)}
+        ),
+        refused=refused(401),
+    ),
+    Case("GET", "profiles/artists/", build=nothing),
+    Case("GET", "profiles/<str:uuid>/artists/", build=by("manager")),
+    Case("GET", "profiles/<str:uuid>/", build=by("manager")),
+    Case(
+        "PUT",
+        "profiles/<str:uuid>/",
+        build=with_data(manager_data, "manager"),
+    ),
+    Case("DELETE", "profiles/<str:uuid>/", build=by("manager")),
+    Case("GET", "albums/", build=nothing),
+    Case(
+        "POST",
+        "albums/",
+        build=with_data(
+            lambda ids, role: {"name": "Budget album", "owner": str(ids["artist"])}
+        ),
+        format="multipart",
+    ),
+    Case("GET", "albums/<str:uuid>/", build=by("album")),
+    Case(
+        "PUT",
+        "albums/<str:uuid>/",
+        build=with_data(
+            lambda ids, role: {"name": "Renamed album", "owner": str(ids["artist"])},
+            "album",
+        ),
+        format="multipart",
+    ),
+    Case("DELETE", "albums/<str:uuid>/", build=by("album")),
+    Case("GET", "query-stats/", build=nothing, refused=refused(403)),
+]
+
+METHODS = ("get", "post", "put", "patch", "delete")
+
+
+def api_routes(patterns=None, prefix=""):
+    """``(method, route)`` for every method of every view under ``api/v1/``."""
+    for pattern in get_resolver().url_patterns if patterns is None else patterns:
+        route = prefix + str(pattern.pattern)
+        if isinstance(pattern, URLResolver):
+            yield from api_routes(pattern.url_patterns, route)
+            continue
+        view_class = getattr(pattern.callback, "view_class", None)
+        if view_class is None or not route.startswith(API_PREFIX):
+            continue
+        for method in METHODS:
+            if hasattr(view_class, method):
+                yield method.upper(), route[len(API_PREFIX) :]
+
+
+def case_key(case, role):
+    return f"{case.method} /{API_PREFIX}{case.route}{case.query} {role}"
+
+
+class QueryCounter:
+    """``execute_wrapper`` counting statements and the rows they returned."""
+
+    def __init__(self):
+        self.queries = 0
+        self.rows = 0
+
+    def __call__(self, execute, sql, params, many, context):
+        result = execute(sql, params, many, context)
+        self.queries += 1
+        cursor = context["cursor"]
+        # Server-side cursors (the CSV export) report no row count
+        if cursor.description is not None and cursor.rowcount > 0:
+            self.rows += cursor.rowcount
+        return result
+
+
+def request_path(case, kwargs):
+    route = case.route
+    for name, value in kwargs.items():
+        route = route.replace(f"<str:{name}>", str(value))
+    return f"/{API_PREFIX}{route}{case.query}"
+
+
+def run_case(client, case, ids, role):
+    kwargs, data = case.build(ids, role)
+    path = request_path(case, kwargs)
+    user_cache.clear()
+    scopes.scope_cache.clear()
+    counter = QueryCounter()
+    with connection.execute_wrapper(counter):
+        response = getattr(client, case.method.lower())(
+            path, data, format=case.format
+        )
+        if response.streaming:
+            # Streamed bodies run their queries while being consumed
+            b"".join(response.streaming_content)
+    return {
+        "status": response.status_code,
+        "queries": counter.queries,
+        "rows": counter.rows,
+    }
+
+
+def unexpected_status(case, role, status):
+    expected = (case.refused or {}).get(role)
+    if expected is None:
+        return not 200 <= status < 300
+    return status != expected
+
+
+def measure(ids):
+    """
+    Run every case as every role and return ``{key: measurement}``.
+
+    Raises ``UnexpectedStatus`` listing the requests that did not get the
+    status their case expects.
+    """
+    results = {}
+    unexpected = []
+    for role, email in ROLE_USERS.items():
+        user = User.objects.get(email=email)
+        access, _ = JWTManager(
+            {"uuid": user.uuid, "email": user.email, "role": user.role}
+        ).generate_jwt_token()
+        client = APIClient(raise_request_exception=False)
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        for case in CASES:
+            with transaction.atomic():
+                result = run_case(client, case, ids, role)
+                transaction.set_rollback(True)
+            key = case_key(case, role)
+            if unexpected_status(case, role, result["status"]):
+                unexpected.append(f"{key}: status {result['status']}")
+            results[key] = result
+    if unexpected:
+        raise UnexpectedStatus("\n".join(unexpected))
+    return results
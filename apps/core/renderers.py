@@ -0,0 +1,60 @@
+"""
+orjson-backed JSON rendering.
+
+``ORJSONRenderer`` produces the same bytes as DRF's ``JSONRenderer`` with the
+project's settings (compact, unicode, ``\\u2028``/``\\u2029`` escaped):
+datetimes, decimals and the other types orjson would format its own way are
+handed to DRF's encoder through ``default``. Output orjson cannot match
+(decimals in exponent notation, integers beyond 64 bits, non-string keys,
+indented output for the browsable API) is rendered by ``JSONRenderer``.
+Plain floats, which no serializer here produces, are written by orjson:
+exponents come out as ``1e16`` rather than ``1e+16`` and NaN as null where
+``JSONRenderer`` raises.
+"""
+
+import decimal
+
+import orjson
+from rest_framework.renderers import JSONRenderer
+from rest_framework.utils import encoders
+
+OPTIONS = orjson.OPT_PASSTHROUGH_DATETIME | orjson.OPT_PASSTHROUGH_DATACLASS
+
+encoder = encoders.JSONEncoder()
+
+
+def default(obj):
+    if isinstance(obj, decimal.Decimal):
+        value = float(obj)
+        # orjson writes 1e16 and 1e-7 where json.dumps writes 1e+16 and
+        # 1e-07, and null for NaN where JSONRenderer raises.
+        if "e" in repr(value) or not obj.is_finite():
+            raise TypeError(f"{obj} is rendered by JSONRenderer")
+        return value
+    return encoder.default(obj)
+
+
+class ORJSONRenderer(JSONRenderer):
+    def render(self, data, accepted_media_type=None, renderer_context=None):
+        if data is None:
+            return b""
+        if (
+            not self.compact
+            or self.ensure_ascii
+            or self.get_indent(accepted_media_type, renderer_context or {})
+            is not None
+        ):
+            return super().render(data, accepted_media_type, renderer_context)
+
+        try:
+            ret = orjson.dumps(data, default=default, option=OPTIONS)
+        except orjson.JSONEncodeError:
+            return super().render(data, accepted_media_type, renderer_context)
+
+        # U+2028 and U+2029 are escaped like JSONRenderer does; both start
+        # with these two bytes.
+        if b"\xe2\x80" in ret:
+            ret = ret.replace(b"\xe2\x80\xa8", b"\\u2028").replace(
+                b"\xe2\x80\xa9", b"\\u2029"
+            )
+        return ret
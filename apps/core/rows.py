@@ -0,0 +1,121 @@
+"""
+Lightweight records for raw SQL rows.
+
+``convert_tuples_to_dicts`` followed by ``Model(**row)`` builds a dict and
+then runs the model's ``__init__`` (signals, field defaults, descriptors)
+for every row, only for the serializers to read a few attributes back.
+``fetch_records`` instead maps each row onto an instance of a ``__slots__``
+class generated once per model and column list, whose ``__init__`` is a
+plain sequence of attribute assignments.
+
+Records carry one extra slot per foreign key (``manager`` for
+``manager_id``...), defaulting to None, so the loaders in
+``apps.core.loaders`` can attach related records and the read serializers
+can render them as they would model instances.
+"""
+
+import keyword
+from functools import lru_cache
+from itertools import starmap
+
+from django.db import models
+
+
+class StoredFile(str):
+    """A file column value exposing ``.name`` and ``.url`` like a FieldFile."""
+
+    __slots__ = ("storage",)
+
+    def __new__(cls, name, storage):
+        value = super().__new__(cls, name)
+        value.storage = storage
+        return value
+
+    @property
+    def name(self):
+        return str(self)
+
+    @property
+    def url(self):
+        return self.storage.url(str(self))
+
+
+class Record:
+    __slots__ = ()
+    _fields = ()
+
+    def serializable_value(self, name):
+        # Used by DRF's PrimaryKeyRelatedField for ``<relation>_id`` fields
+        return getattr(self, name)
+
+    def __iter__(self):
+        return (getattr(self, name) for name in self._fields)
+
+    def __repr__(self):
+        values = ", ".join(f"{name}={getattr(self, name)!r}" for name in self._fields)
+        return f"{type(self).__name__}({values})"
+
+
+@lru_cache(maxsize=256)
+def record_class(name, fields, extras=(), converters=()):
+    """
+    Build a ``__slots__`` record class.
+
+    ``fields`` are filled positionally by ``__init__``, ``extras`` start as
+    None and ``converters`` is a tuple of ``(field, callable)`` pairs applied
+    to non-empty values of those fields.
+    """
+    for field in fields + extras:
+        if not field.isidentifier() or keyword.iskeyword(field) or field == "self":
+            raise ValueError(f"Cannot use {field!r} as a record field name")
+    if len(set(fields + extras)) != len(fields + extras):
+        raise ValueError(f"Duplicate record field names in {fields + extras}")
+
+    convert = dict(converters)
+    namespace = {f"_convert_{field}": func for field, func in convert.items()}
+    lines = [f"def __init__(self, {', '.join(fields)}):"]
+    for field in fields:
+        value = field
+        if field in convert:
+            value = f"_convert_{field}({field}) if {field} else {field}"
+        lines.append(f"    self.{field} = {value}")
+    for field in extras:
+        lines.append(f"    self.{field} = None")
+    if len(lines) == 1:
+        lines.append("    pass")
+    exec("\n".join(lines), namespace)
+
+    return type(
+        name,
+        (Record,),
+        {
+            "__slots__": fields + extras,
+            "__init__": namespace["__init__"],
+            "_fields": fields,
+        },
+    )
+
+
+@lru_cache(maxsize=256)
+def model_record_class(model, columns):
+    """The record class for rows of ``model``'s table with ``columns`` (a tuple)."""
+    extras = []
+    converters = []
+    for field in model._meta.concrete_fields:
+        if field.is_relation and field.attname in columns:
+            extras.append(field.name)
+        elif isinstance(field, models.FileField) and field.attname in columns:
+            storage = field.storage
+            converters.append(
+                (field.attname, lambda name, storage=storage: StoredFile(name, storage))
+            )
+    return record_class(
+        f"{model.__name__}Row", columns, tuple(extras), tuple(converters)
+    )
+
+
+def fetch_records(cursor, model):
+    """Fetch the rest of ``cursor``'s rows as ``model`` records."""
+    columns = tuple(col[0] for col in cursor.description)
+    cls = model_record_class(model, columns)
+    return list(starmap(cls, cursor.fetchall()))
@@ -0,0 +1,83 @@
+"""
+Resolution of a user id to the artist or manager profile it acts as.
+
+Nearly every role-scoped read and write needs the caller's artist or manager
+uuid before its real query. The mapping only changes when a profile is
+created or deleted, so it is kept in a per-process LRU cache that those
+write paths invalidate explicitly, and it is embedded in newly issued tokens
+(see ``token_claims``) so most requests skip the lookup altogether.
+
+Nothing revokes the claims of a token already issued. They stay valid for
+the access token's lifetime (``JWT_EXPIRATION_DELTA``, 15 minutes by
+default), while a refresh resolves them again. A user is only ever mapped
+to its own profile, so a stale claim can at worst point at a deleted one,
+and deleting the user itself rejects the token outright.
+"""
+
+from django.conf import settings
+from django.db import connection, transaction
+
+from apps.core.cache import LRUCache
+
+ARTIST = "artist_id"
+MANAGER = "manager_id"
+
+SCOPE_TABLES = {
+    ARTIST: "artists_artist",
+    MANAGER: "profiles_userprofile",
+}
+
+scope_cache = LRUCache(
+    maxsize=getattr(settings, "SCOPE_CACHE_SIZE", 4096),
+    ttl=getattr(settings, "SCOPE_CACHE_TTL", 3600),
+)
+
+
+def resolve(user_id, scope):
+    """Return the uuid of the ``scope`` profile of a user, or None."""
+    if user_id is None:
+        return None
+    key = (str(user_id), scope)
+    profile_id = scope_cache.get(key)
+    if profile_id is not None:
+        return profile_id
+    with connection.cursor() as c:
+        c.execute(
+            f"SELECT uuid FROM {SCOPE_TABLES[scope]} WHERE user_id = %s",
+            [user_id],
+        )
+        row = c.fetchone()
+    if row is None:
+        # Misses are not cached: the profile may be created at any time.
+        return None
+    scope_cache.set(key, row[0])
+    return row[0]
+
+
+def get_artist_id(user_id):
+    return resolve(user_id, ARTIST)
+
+
+def get_manager_id(user_id):
+    return resolve(user_id, MANAGER)
+
+
+def invalidate(user_id):
+    """
+    Forget the cached scopes of a user whose profile was created or deleted,
+    once the current transaction commits so the old mapping cannot be cached
+    again in between.
+    """
+    user_id = str(user_id)
+    transaction.on_commit(
+        lambda: scope_cache.delete_where(lambda key: key[0] == user_id)
+    )
+
+
+def token_claims(user_id, role):
+    """Scope claims to embed in a token issued to a user with ``role``."""
+    scope = ARTIST if role == "ARTIST" else MANAGER
+    profile_id = resolve(user_id, scope)
+    if profile_id is None:
+        return {}
+    return {scope: str(profile_id)}
@@ -0,0 +1,311 @@
+"""
+Synthetic catalog for load testing.
+
+``generate`` writes managers, artists, albums and musics with ``COPY``,
+everything derived from one generator seeded with the seed and the domain,
+so the same seed, domain and sizes always produce the same rows, uuids
+included, and another domain can be loaded next to them. Artists are spread
+evenly over the managers, while albums per artist and tracks per album
+follow a Pareto distribution: most artists have a handful of albums and a
+few have hundreds, as in a real catalog. ``created_at`` is spread over the
+``since``/``until`` range, an album never being older than its artist nor
+a track than its album.
+
+The sizes are drawn before the rows are written, so ``no_of_album_released``
+and ``no_of_tracks`` are written with their final values and only
+``catalog_stats`` is rebuilt at the end.
+"""
+
+import datetime
+import io
+import random
+from contextlib import contextmanager
+from itertools import islice
+
+from django.contrib.auth.hashers import make_password
+from django.db import connection
+
+from apps.core import catalog_stats
+
+UTC = datetime.timezone.utc
+# Version and variant bits of a random (version 4) uuid
+UUID_MASK = ~((0xF000 << 64) | (0xC000 << 48))
+UUID_BITS = (0x4000 << 64) | (0x8000 << 48)
+# Rows sent per COPY statement
+COPY_BATCH = 50_000
+# Pareto shape of the album and track counts; lower is more skewed
+SKEW = 1.5
+GENRES = [
+    ("POP", 35),
+    ("ROCK", 25),
+    ("COUNTRY", 15),
+    ("JAZZ", 15),
+    ("CLASSICAL", 10),
+]
+ADJECTIVES = (
+    "Silent Golden Broken Electric Velvet Midnight Crimson Hollow Wild Paper "
+    "Neon Distant Frozen Burning Lonely Silver Restless Quiet Northern Secret"
+).split()
+NOUNS = (
+    "River Harbor Echo Garden Skyline Mirror Thunder Lantern Ocean Highway "
+    "Meadow Signal Desert Shadow Window Comet Forest Canyon Station Ember"
+).split()
+FIRST_NAMES = (
+    "Aarav Anita Bikash Deepa Hari Kiran Laxmi Manish Nisha Pooja Rajesh "
+    "Sabina Sagar Sita Suman Sunita Ujjwal Yamuna"
+).split()
+LAST_NAMES = (
+    "Adhikari Bhandari Gurung KC Lama Rai Sharma Shrestha Tamang Thapa"
+).split()
+
+# Every table lists its columns in the order the generators write them
+USER_COLUMNS = (
+    "uuid, email, password, role, is_active, is_staff, is_superuser, "
+    "created_at, updated_at"
+)
+PROFILE_COLUMNS = (
+    "uuid, user_id, first_name, last_name, gender, created_at, updated_at"
+)
+ARTIST_COLUMNS = (
+    "uuid, user_id, manager_id, name, gender, first_released_year, "
+    "no_of_album_released, created_at, updated_at"
+)
+ALBUM_COLUMNS = "uuid, owner_id, name, no_of_tracks, created_at, updated_at"
+MUSIC_COLUMNS = "uuid, album_id, artist_id, title, genre, created_at, updated_at"
+
+TABLES = (
+    "core_user",
+    "profiles_userprofile",
+    "artists_artist",
+    "albums_album",
+    "musics_music",
+    "catalog_stats",
+)
+
+
+def random_uuid(rng):
+    """A version 4 uuid drawn from ``rng``, as the 32 hex digits COPY accepts."""
+    return f"{rng.getrandbits(128) & UUID_MASK | UUID_BITS:032x}"
+
+
+def skewed_sizes(rng, count, total):
+    """Split ``total`` into ``count`` Pareto-distributed parts."""
+    if not count:
+        return []
+    weights = [rng.paretovariate(SKEW) for _ in range(count)]
+    scale = total / sum(weights)
+    sizes = [int(weight * scale) for weight in weights]
+    for index in rng.sample(range(count), total - sum(sizes)):
+        sizes[index] += 1
+    return sizes
+
+
+def timestamp(seconds):
+    return datetime.datetime.fromtimestamp(seconds, UTC).isoformat()
+
+
+def copy(table, columns, lines):
+    """Send ``lines`` (tab separated, newline terminated) to ``table``."""
+    rows = 0
+    with connection.cursor() as c:
+        while True:
+            batch = list(islice(lines, COPY_BATCH))
+            if not batch:
+                return rows
+            c.copy_expert(
+                f"COPY {table} ({columns}) FROM STDIN", io.StringIO("".join(batch))
+            )
+            rows += len(batch)
+
+
+def generate(
+    managers,
+    artists,
+    albums,
+    musics,
+    seed=0,
+    password="seed-password",
+    domain="seed.test",
+    since=datetime.datetime(2020, 1, 1, tzinfo=UTC),
+    until=datetime.datetime(2025, 1, 1, tzinfo=UTC),
+    log=None,
+):
+    """
+    Load the catalog and return the rows written per table.
+
+    Users sign in as ``admin@<domain>``, ``manager<n>@<domain>`` and
+    ``artist<n>@<domain>``, all with ``password``.
+    """
+    # The uuids must differ between domains loaded into the same database
+    rng = random.Random(f"{seed}@{domain}")
+    start, end = since.timestamp(), until.timestamp()
+    span = end - start
+    hashed = make_password(password)
+    genres = [genre for genre, weight in GENRES for _ in range(weight)]
+    written = {}
+
+    def load(table, columns, lines):
+        written[table] = written.get(table, 0) + copy(table, columns, lines)
+        if log:
+            log(f"{table}: {written[table]} rows")
+
+    def user_line(uuid, email, role, created):
+        return (
+            f"{uuid}\t{email}\t{hashed}\t{role}\tt\tf\tf\t{created}\t{created}\n"
+        )
+
+    manager_ids = [random_uuid(rng) for _ in range(managers)]
+    manager_user_ids = [random_uuid(rng) for _ in range(managers)]
+    manager_created = [timestamp(start + rng.random() * span) for _ in manager_ids]
+
+    def manager_users():
+        yield user_line(
+            random_uuid(rng), f"admin@{domain}", "SUPER_ADMIN", timestamp(start)
+        )
+        for index, created in enumerate(manager_created):
+            yield user_line(
+                manager_user_ids[index],
+                f"manager{index}@{domain}",
+                "ARTIST_MANAGER",
+                created,
+            )
+
+    def manager_profiles():
+        for index, created in enumerate(manager_created):
+            yield (
+                f"{manager_ids[index]}\t{manager_user_ids[index]}\t"
+                f"{rng.choice(FIRST_NAMES)}\t{rng.choice(LAST_NAMES)}\t"
+                f"{rng.choice('MFO')}\t{created}\t{created}\n"
+            )
+
+    load("core_user", USER_COLUMNS, manager_users())
+    load("profiles_userprofile", PROFILE_COLUMNS, manager_profiles())
+
+    # (uuid, created_at seconds) per artist, with their album counts
+    artist_rows = [
+        (random_uuid(rng), start + rng.random() * span) for _ in range(artists)
+    ]
+    album_counts = skewed_sizes(rng, artists, albums)
+    artist_user_ids = [random_uuid(rng) for _ in range(artists)]
+
+    def artist_users():
+        for index, (_, created) in enumerate(artist_rows):
+            yield user_line(
+                artist_user_ids[index],
+                f"artist{index}@{domain}",
+                "ARTIST",
+                timestamp(created),
+            )
+
+    def artist_profiles():
+        for index, (artist_id, created) in enumerate(artist_rows):
+            manager_id = manager_ids[index % managers] if managers else "\\N"
+            created = timestamp(created)
+            yield (
+                f"{artist_id}\t{artist_user_ids[index]}\t{manager_id}\t"
+                f"{rng.choice(ADJECTIVES)} {rng.choice(NOUNS)}\t"
+                f"{rng.choice('MFO')}\t{rng.randint(1960, until.year)}\t"
+                f"{album_counts[index]}\t{created}\t{created}\n"
+            )
+
+    load("core_user", USER_COLUMNS, artist_users())
+    load("artists_artist", ARTIST_COLUMNS, artist_profiles())
+
+    # (uuid, owner uuid, created_at seconds) per album, with their track counts
+    album_rows = []
+    for (artist_id, artist_created), count in zip(artist_rows, album_counts):
+        for _ in range(count):
+            created = artist_created + rng.random() * (end - artist_created)
+            album_rows.append((random_uuid(rng), artist_id, created))
+    track_counts = skewed_sizes(rng, len(album_rows), musics)
+
+    def album_lines():
+        for (album_id, owner_id, created), tracks in zip(album_rows, track_counts):
+            created = timestamp(created)
+            yield (
+                f"{album_id}\t{owner_id}\t{rng.choice(ADJECTIVES)} "
+                f"{rng.choice(NOUNS)}\t{tracks}\t{created}\t{created}\n"
+            )
+
+    load("albums_album", ALBUM_COLUMNS, album_lines())
+
+    def music_lines():
+        choice, uniform = rng.choice, rng.random
+        for (album_id, artist_id, album_created), tracks in zip(
+            album_rows, track_counts
+        ):
+            for number in range(1, tracks + 1):
+                created = timestamp(album_created + uniform() * (end - album_created))
+                yield (
+                    f"{random_uuid(rng)}\t{album_id}\t{artist_id}\t"
+                    f"{choice(NOUNS)} {choice(NOUNS)} {number}\t{choice(genres)}\t"
+                    f"{created}\t{created}\n"
+                )
+
+    load("musics_music", MUSIC_COLUMNS, music_lines())
+
+    written["catalog_stats"] = catalog_stats.rebuild()
+    if log:
+        log(f"catalog_stats: {written['catalog_stats']} rows")
+    return written
+
+
+@contextmanager
+def without_secondary_keys(log=None):
+    """
+    Drop the foreign keys and non-unique indexes of the catalog tables for
+    the duration of the block and recreate them at the end, inside the
+    caller's transaction.
+
+    Rows COPYed into a table with deferred foreign keys each queue a check
+    run at commit, and every index is updated row by row; validating a
+    foreign key and building an index once over the loaded table is several
+    times faster.
+    """
+    tables = [table for table in TABLES if table != "catalog_stats"]
+    with connection.cursor() as c:
+        c.execute(
+            """
+            SELECT conrelid::regclass::text, conname, pg_get_constraintdef(oid)
+            FROM pg_constraint
+            WHERE contype = 'f' AND conrelid = ANY(%s::regclass[])
+            """,
+            [tables],
+        )
+        foreign_keys = c.fetchall()
+        c.execute(
+            """
+            SELECT indexrelid::regclass::text, pg_get_indexdef(indexrelid)
+            FROM pg_index
+            WHERE indrelid = ANY(%s::regclass[]) AND NOT indisunique
+            """,
+            [tables],
+        )
+        indexes = c.fetchall()
+        for table, name, _ in foreign_keys:
+            c.execute(f'ALTER TABLE {table} DROP CONSTRAINT "{name}"')
+        for name, _ in indexes:
+            c.execute(f"DROP INDEX {name}")
+
+    yield
+
+    with connection.cursor() as c:
+        c.execute("SET LOCAL maintenance_work_mem = '256MB'")
+        for _, definition in indexes:
+            c.execute(definition)
+        for table, name, definition in foreign_keys:
+            c.execute(f'ALTER TABLE {table} ADD CONSTRAINT "{name}" {definition}')
+    if log:
+        log(f"{len(indexes)} indexes and {len(foreign_keys)} foreign keys recreated")
+
+
+def flush():
+    """Empty the catalog tables, and every table referencing them."""
+    with connection.cursor() as c:
+        c.execute(f"TRUNCATE {', '.join(TABLES)} CASCADE")
+
+
+def analyze():
+    with connection.cursor() as c:
+        for table in TABLES:
+            c.execute(f"ANALYZE {table}")
@@ -0,0 +1,46 @@
+"""
+Shared base for the API tests.
+
+``CatalogTestCase`` loads the fixed catalog of ``apps.core.query_budget``
+once per class, under the settings the query budget is measured with and a
+temporary ``MEDIA_ROOT``, and hands out API clients authenticated with a
+JWT of the super admin, ``manager0`` or ``artist0-0``.
+"""
+
+import tempfile
+
+from django.test import TestCase, override_settings
+from rest_framework.test import APIClient
+
+from apps.core import query_budget, scopes
+from apps.core.models import User
+from apps.users.authentication import user_cache
+from apps.users.utils import JWTManager
+
+
+class CatalogTestCase(TestCase):
+    @classmethod
+    def setUpClass(cls):
+        media = cls.enterClassContext(tempfile.TemporaryDirectory())
+        cls.enterClassContext(
+            override_settings(MEDIA_ROOT=media, **query_budget.SETTINGS)
+        )
+        super().setUpClass()
+
+    @classmethod
+    def setUpTestData(cls):
+        cls.ids = query_budget.seed()
+
+    def setUp(self):
+        # Both caches outlive the rolled-back transaction of each test
+        user_cache.clear()
+        scopes.scope_cache.clear()
+
+    def client_for(self, role):
+        user = User.objects.get(email=query_budget.ROLE_USERS[role])
+        access, _ = JWTManager(
+            {"uuid": user.uuid, "email": user.email, "role": user.role}
+        ).generate_jwt_token()
+        client = APIClient()
+        client.credentials(HTTP_AUTHORIZATION=f"Bearer {access}")
+        return client
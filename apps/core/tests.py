@@ -0,0 +1,154 @@
+import io
+import json
+
+from django.test import override_settings
+from rest_framework.renderers import JSONRenderer
+
+from apps.albums.serializers import AlbumSerializer
+from apps.artists.serializers import ArtistSerializer
+from apps.core import query_budget, scopes
+from apps.core.management.commands.check_query_budget import (
+    DEFAULT_BUDGET,
+    Command,
+)
+from apps.core.models import Album, Artist, Music, User, UserProfile
+from apps.core.testing import CatalogTestCase
+from apps.musics.serializers import MusicSerializer
+from apps.profiles.serializers import UserProfileSerializer
+
+ARTIST_RELATIONS = ("manager__user", "user")
+
+# (list url, DRF serializer, the rows the super admin sees, in list order)
+LISTS = [
+    (
+        "/api/v1/artists/",
+        ArtistSerializer,
+        lambda: Artist.objects.select_related(*ARTIST_RELATIONS),
+    ),
+    (
+        "/api/v1/albums/",
+        AlbumSerializer,
+        lambda: Album.objects.select_related(
+            *(f"owner__{relation}" for relation in ARTIST_RELATIONS)
+        ),
+    ),
+    (
+        "/api/v1/musics/",
+        MusicSerializer,
+        lambda: Music.objects.select_related(
+            *(f"album__owner__{relation}" for relation in ARTIST_RELATIONS),
+            *(f"artist__{relation}" for relation in ARTIST_RELATIONS),
+        ),
+    ),
+    (
+        "/api/v1/musics/?cursor=",
+        MusicSerializer,
+        lambda: Music.objects.select_related(
+            *(f"album__owner__{relation}" for relation in ARTIST_RELATIONS),
+            *(f"artist__{relation}" for relation in ARTIST_RELATIONS),
+        ),
+    ),
+    (
+        "/api/v1/profiles/",
+        UserProfileSerializer,
+        lambda: UserProfile.objects.filter(
+            user__role=User.Role.ARTIST_MANAGER
+        ).select_related("user"),
+    ),
+]
+
+
+def ordered(content):
+    """Parse JSON keeping the key order, so fields compare in order too."""
+    return json.loads(content, object_pairs_hook=list)
+
+
+def results(response):
+    return dict(ordered(response.content))["results"]
+
+
+class QueryBudgetTests(CatalogTestCase):
+    def test_endpoints_are_within_the_budget(self):
+        with open(DEFAULT_BUDGET) as f:
+            budget = json.load(f)
+        # The refused requests log a warning each
+        with self.assertLogs("django.request", "WARNING"):
+            measured = query_budget.measure(self.ids)
+        Command(stdout=io.StringIO()).compare(budget, measured, DEFAULT_BUDGET)
+
+    def test_unexpected_statuses_fail_the_run(self):
+        case = query_budget.Case(
+            "GET", "musics/", build=query_budget.nothing, refused={"ARTIST": 403}
+        )
+        self.assertFalse(query_budget.unexpected_status(case, "SUPER_ADMIN", 200))
+        self.assertTrue(query_budget.unexpected_status(case, "SUPER_ADMIN", 500))
+        self.assertTrue(query_budget.unexpected_status(case, "SUPER_ADMIN", 404))
+        self.assertFalse(query_budget.unexpected_status(case, "ARTIST", 403))
+        self.assertTrue(query_budget.unexpected_status(case, "ARTIST", 200))
+
+
+class QueryStatsTests(CatalogTestCase):
+    def test_top_must_be_positive(self):
+        client = self.client_for("SUPER_ADMIN")
+        for top in ("0", "-5"):
+            response = client.get("/api/v1/query-stats/", {"top": top})
+            self.assertEqual(response.status_code, 400)
+        response = client.get("/api/v1/query-stats/", {"top": "1"})
+        self.assertEqual(response.status_code, 200)
+        self.assertLessEqual(len(response.json()["fingerprints"]), 1)
+
+
+class ScopeCacheTests(CatalogTestCase):
+    def test_invalidation_waits_for_the_commit(self):
+        user_id = User.objects.get(email=query_budget.ROLE_USERS["ARTIST"]).pk
+        key = (str(user_id), scopes.ARTIST)
+        self.assertEqual(scopes.get_artist_id(user_id), self.ids["artist"])
+        with self.captureOnCommitCallbacks(execute=True):
+            scopes.invalidate(user_id)
+            self.assertEqual(scopes.scope_cache.get(key), self.ids["artist"])
+        self.assertIsNone(scopes.scope_cache.get(key))
+
+
+class JSONListGoldenTests(CatalogTestCase):
+    """``SQL_JSON_LISTS`` pages must match the serializers field for field."""
+
+    @classmethod
+    def setUpTestData(cls):
+        super().setUpTestData()
+        # A file name that needs percent-encoding in the media URL
+        Album.objects.filter(pk=cls.ids["album"]).update(image="albums/cover é #1.png")
+        UserProfile.objects.filter(pk=cls.ids["manager"]).update(phone=None)
+
+    def url(self, url):
+        separator = "&" if "?" in url else "?"
+        return f"{url}{separator}page_size=100"
+
+    def test_matches_the_drf_serializers(self):
+        client = self.client_for("SUPER_ADMIN")
+        for url, serializer_class, rows in LISTS:
+            with self.subTest(url=url):
+                with override_settings(SQL_JSON_LISTS=True):
+                    response = client.get(self.url(url))
+                self.assertEqual(response.status_code, 200)
+                expected = serializer_class(
+                    rows().order_by("created_at", "uuid"), many=True
+                ).data
+                self.assertTrue(expected)
+                self.assertEqual(
+                    results(response), ordered(JSONRenderer().render(expected))
+                )
+
+    def test_matches_the_regular_path_for_every_role(self):
+        for role in User.Role.values:
+            client = self.client_for(role)
+            for url, _, _ in LISTS:
+                with self.subTest(role=role, url=url):
+                    with override_settings(SQL_JSON_LISTS=False):
+                        expected = client.get(self.url(url))
+                    with override_settings(SQL_JSON_LISTS=True):
+                        actual = client.get(self.url(url))
+                    self.assertEqual(actual.status_code, expected.status_code)
+                    if expected.status_code == 200:
+                        self.assertEqual(
+                            ordered(actual.content), ordered(expected.content)
+                        )
@@ -0,0 +1,7 @@
+from django.urls import path
+
+from .views import QueryStatsView
+
+urlpatterns = [
+    path("query-stats/", QueryStatsView.as_view(), name="query-stats"),
+]
@@ -0,0 +1,54 @@
+import os
+
+from rest_framework import status
+from rest_framework.response import Response
+from rest_framework.views import APIView
+
+from apps.core import fingerprints
+from apps.users.principal import get_principal
+
+MAX_TOP = 200
+
+
+class QueryStatsView(APIView):
+    """
+    The heaviest SQL fingerprints seen by this worker, with their p50/p95/p99
+    """
+
+    def get(self, request):
+        principal = get_principal(request)
+        if principal is None or principal.role != "SUPER_ADMIN":
+            return Response(
+                {"message": "You are not authorized to view query stats"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        sort = request.query_params.get("sort", "total")
+        if sort not in fingerprints.SORT_KEYS:
+            return Response(
+                {"message": f"sort must be one of {', '.join(fingerprints.SORT_KEYS)}"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            limit = min(int(request.query_params.get("top", 20)), MAX_TOP)
+        except ValueError:
+            return Response(
+                {"message": "top must be a number"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        if limit < 1:
+            return Response(
+                {"message": "top must be at least 1"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+
+        snapshot = fingerprints.collector.snapshot()
+        return Response(
+            {
+                "pid": os.getpid(),
+                "window": snapshot["window"],
+                "fingerprints": fingerprints.top(
+                    snapshot["fingerprints"], limit, sort
+                ),
+            },
+            status=status.HTTP_200_OK,
+        )
@@ -1,5 +1,8 @@
 from django.contrib import admin
+from django.db import transaction
+from django.db.models import Count
 
+from apps.core import counters
 from apps.core.models import Music
 
 
@@ -8,3 +11,16 @@ class MusicAdmin(admin.ModelAdmin):
     list_display = ["uuid", "title"]
     search_fields = ["title"]
     readonly_fields = ["uuid", "created_at", "updated_at"]
+
+    def delete_queryset(self, request, queryset):
+        # Queryset deletes bypass Music.delete, so take the tracks off their
+        # albums and artists with one grouped delta.
+        with transaction.atomic():
+            removed = queryset.order_by().values("album_id", "artist_id").annotate(
+                total=Count("pk")
+            )
+            deltas = {
+                (row["album_id"], row["artist_id"]): -row["total"] for row in removed
+            }
+            super().delete_queryset(request, queryset)
+            counters.add_musics(deltas)
@@ -0,0 +1,374 @@
+"""
+Set-based import of musics.
+
+The rows of an import are validated together (one query for the referenced
+albums, one for the artists), the valid ones are written with a single
+multi-row INSERT, and the album track counts and ``catalog_stats`` then
+receive one grouped delta per distinct album and artist (``apps.core.counters``)
+instead of one update per row.
+
+CSV uploads take the same route without ever holding the rows in Python:
+the file is streamed into a temporary staging table with ``COPY FROM
+STDIN`` and validated and merged with a handful of set-based statements.
+
+Both only accept musics of the artists the importer could export: an
+artist their own artist, a manager their artists (``export_scope``).
+"""
+
+import csv
+from collections import Counter
+from uuid import UUID, uuid4
+
+from django.db import DataError, connection, transaction
+
+from apps.core import counters
+from apps.core.models import Music
+
+GENRES = set(Music.Genre.values)
+TITLE_MAX_LENGTH = Music._meta.get_field("title").max_length
+
+ACCEPTED = "accepted"
+REJECTED = "rejected"
+
+CSV_COLUMNS = ("title", "genre", "artist_id", "album_id")
+CSV_MAX_COLUMNS = 64
+CSV_MAX_REPORTED_ERRORS = 100
+UUID_PATTERN = "^[0-9a-f]{8}-?([0-9a-f]{4}-?){3}[0-9a-f]{12}$"
+
+
+def parse_uuid(value):
+    try:
+        return UUID(str(value))
+    except (TypeError, ValueError, AttributeError):
+        return None
+
+
+def fetch_album_owners(album_ids):
+    """Map each existing album of ``album_ids`` to its owner."""
+    if not album_ids:
+        return {}
+    with connection.cursor() as c:
+        c.execute(
+            "SELECT uuid, owner_id FROM albums_album WHERE uuid = ANY(%s::uuid[])",
+            [[str(album_id) for album_id in album_ids]],
+        )
+        return dict(c.fetchall())
+
+
+def fetch_artist_managers(artist_ids):
+    """Map each existing artist of ``artist_ids`` to its manager."""
+    if not artist_ids:
+        return {}
+    with connection.cursor() as c:
+        c.execute(
+            "SELECT uuid, manager_id FROM artists_artist WHERE uuid = ANY(%s::uuid[])",
+            [[str(artist_id) for artist_id in artist_ids]],
+        )
+        return dict(c.fetchall())
+
+
+def in_scope(role, scope_id, artist_id, manager_id):
+    """Whether an export scope (``export_scope``) covers an artist."""
+    if role == "ARTIST":
+        return artist_id == scope_id
+    if role == "ARTIST_MANAGER":
+        return manager_id == scope_id
+    return True
+
+
+def outside_scope_sql(role, scope_id):
+    """SQL condition, and its params, on the artists ``ar`` outside a scope."""
+    if role == "ARTIST":
+        return "ar.uuid <> %s", [scope_id]
+    if role == "ARTIST_MANAGER":
+        return "ar.manager_id IS DISTINCT FROM %s", [scope_id]
+    return "FALSE", []
+
+
+def clean_row(row):
+    """Return ``(title, genre, artist_id, album_id, error)`` for a raw row."""
+    if not isinstance(row, dict):
+        return None, None, None, None, "Row must be an object"
+    title = row.get("title") or ""
+    genre = row.get("genre") or ""
+    artist_id = parse_uuid(row.get("artist_id"))
+    album_id = parse_uuid(row.get("album_id"))
+    if not isinstance(title, str):
+        return None, None, artist_id, album_id, "Title must be a string"
+    if not isinstance(genre, str):
+        return None, None, artist_id, album_id, "Genre must be a string"
+    title = title.strip()
+    if not title:
+        return title, genre, artist_id, album_id, "Title is required"
+    if len(title) > TITLE_MAX_LENGTH:
+        return title, genre, artist_id, album_id, "Title is too long"
+    if genre not in GENRES:
+        return title, genre, artist_id, album_id, "Invalid genre"
+    if artist_id is None:
+        return title, genre, artist_id, album_id, "Invalid artist_id"
+    if album_id is None:
+        return title, genre, artist_id, album_id, "Invalid album_id"
+    return title, genre, artist_id, album_id, None
+
+
+def validate_rows(rows, role, scope_id):
+    """
+    Split ``rows`` into the musics to insert and the per-row report, the
+    artists being limited to the export scope ``(role, scope_id)``.
+
+    Returns ``(accepted, report)`` where ``accepted`` holds
+    ``(index, uuid, title, album_id, genre, artist_id)`` tuples and ``report``
+    has one entry per input row, in input order.
+    """
+    cleaned = [clean_row(row) for row in rows]
+    album_owners = fetch_album_owners(
+        {album_id for _, _, _, album_id, error in cleaned if error is None}
+    )
+    artist_managers = fetch_artist_managers(
+        {artist_id for _, _, artist_id, _, error in cleaned if error is None}
+    )
+
+    accepted = []
+    report = []
+    for index, (title, genre, artist_id, album_id, error) in enumerate(cleaned):
+        if error is None and artist_id not in artist_managers:
+            error = "Artist not found"
+        if error is None and not in_scope(
+            role, scope_id, artist_id, artist_managers[artist_id]
+        ):
+            error = "Artist is outside your scope"
+        if error is None and album_id not in album_owners:
+            error = "Album not found"
+        if error is None and album_owners[album_id] != artist_id:
+            error = "Album does not belong to the artist"
+        if error is not None:
+            report.append({"row": index, "status": REJECTED, "reason": error})
+            continue
+        music_id = uuid4()
+        accepted.append((index, music_id, title, album_id, genre, artist_id))
+        report.append({"row": index, "status": ACCEPTED, "uuid": music_id})
+    return accepted, report
+
+
+def insert_musics(accepted):
+    """Insert the accepted musics with a single multi-row INSERT."""
+    if not accepted:
+        return
+    _, uuids, titles, album_ids, genres, artist_ids = zip(*accepted)
+    with connection.cursor() as c:
+        c.execute(
+            """
+            INSERT INTO musics_music
+            (uuid, title, album_id, genre, artist_id, created_at, updated_at)
+            SELECT r.uuid, r.title, r.album_id, r.genre, r.artist_id, NOW(), NOW()
+            FROM unnest(%s::uuid[], %s::text[], %s::uuid[], %s::text[], %s::uuid[])
+                AS r (uuid, title, album_id, genre, artist_id)
+            """,
+            [
+                [str(uuid) for uuid in uuids],
+                list(titles),
+                [str(album_id) for album_id in album_ids],
+                list(genres),
+                [str(artist_id) for artist_id in artist_ids],
+            ],
+        )
+
+
+def apply_import(accepted):
+    """Insert ``accepted`` and bring the counters and rollup up to date."""
+    insert_musics(accepted)
+    counters.add_musics(Counter((row[3], row[5]) for row in accepted))
+
+
+def import_musics(rows, role, scope_id):
+    """
+    Import ``rows`` (dicts with title, genre, artist_id and album_id) for the
+    export scope ``(role, scope_id)`` and return a report of which rows were
+    accepted and why others were rejected.
+    """
+    with transaction.atomic():
+        accepted, report = validate_rows(rows, role, scope_id)
+        apply_import(accepted)
+    return {
+        "accepted": len(accepted),
+        "rejected": len(report) - len(accepted),
+        "rows": report,
+    }
+
+
+class CSVImportError(Exception):
+    pass
+
+
+def read_csv_header(stream):
+    """
+    Consume the header line of ``stream`` and return the position of each
+    of ``CSV_COLUMNS`` in it. Other columns (such as the album and artist
+    names of an export) are ignored.
+    """
+    line = stream.readline()
+    if isinstance(line, bytes):
+        line = line.decode("utf-8-sig")
+    header = next(csv.reader([line.lstrip("\ufeff")]), [])
+    header = [name.strip().lower() for name in header]
+    if len(header) > CSV_MAX_COLUMNS:
+        raise CSVImportError("Too many CSV columns")
+    missing = [name for name in CSV_COLUMNS if name not in header]
+    if missing:
+        raise CSVImportError(f"Missing CSV columns: {', '.join(missing)}")
+    return len(header), {name: header.index(name) for name in CSV_COLUMNS}
+
+
+def stage_csv(c, stream):
+    """Stream the CSV body into the ``music_import`` staging table."""
+    width, positions = read_csv_header(stream)
+    raw_columns = [f"c{index}" for index in range(width)]
+    c.execute(
+        f"""
+        CREATE TEMPORARY TABLE music_import (
+            row_no bigserial,
+            {", ".join(f"{column} text" for column in raw_columns)},
+            reason text,
+            artist_uuid uuid,
+            album_uuid uuid
+        ) ON COMMIT DROP
+        """
+    )
+    try:
+        with connection.wrap_database_errors:
+            c.copy_expert(
+                f"""
+                COPY music_import ({", ".join(raw_columns)})
+                FROM STDIN WITH (FORMAT csv, ENCODING 'UTF8')
+                """,
+                stream,
+            )
+    except DataError as e:
+        raise CSVImportError(str(e).splitlines()[0])
+    return {name: f"c{index}" for name, index in positions.items()}
+
+
+def validate_staged_csv(c, columns, role, scope_id):
+    """Record a rejection reason on every invalid staged row."""
+    title, genre = columns["title"], columns["genre"]
+    artist_id, album_id = columns["artist_id"], columns["album_id"]
+    c.execute(
+        f"""
+        UPDATE music_import
+        SET reason = CASE
+                WHEN coalesce(btrim({title}), '') = '' THEN 'Title is required'
+                WHEN length(btrim({title})) > %s THEN 'Title is too long'
+                WHEN {genre} IS NULL OR NOT {genre} = ANY(%s) THEN 'Invalid genre'
+                WHEN coalesce(btrim({artist_id}), '') !~* %s
+                    THEN 'Invalid artist_id'
+                WHEN coalesce(btrim({album_id}), '') !~* %s
+                    THEN 'Invalid album_id'
+            END,
+            artist_uuid = CASE
+                WHEN btrim({artist_id}) ~* %s THEN btrim({artist_id})::uuid
+            END,
+            album_uuid = CASE
+                WHEN btrim({album_id}) ~* %s THEN btrim({album_id})::uuid
+            END
+        """,
+        [TITLE_MAX_LENGTH, sorted(GENRES)] + [UUID_PATTERN] * 4,
+    )
+    outside, params = outside_scope_sql(role, scope_id)
+    c.execute(
+        f"""
+        UPDATE music_import s
+        SET reason = CASE
+                WHEN ar.uuid IS NULL THEN 'Artist not found'
+                WHEN {outside} THEN 'Artist is outside your scope'
+                WHEN al.uuid IS NULL THEN 'Album not found'
+                ELSE 'Album does not belong to the artist'
+            END
+        FROM music_import v
+        LEFT JOIN artists_artist ar ON ar.uuid = v.artist_uuid
+        LEFT JOIN albums_album al ON al.uuid = v.album_uuid
+        WHERE s.row_no = v.row_no
+            AND v.reason IS NULL
+            AND (
+                ar.uuid IS NULL
+                OR {outside}
+                OR al.uuid IS NULL
+                OR al.owner_id <> ar.uuid
+            )
+        """,
+        params * 2,
+    )
+
+
+def merge_staged_csv(c, columns):
+    """Insert the valid staged rows and update the counters they affect."""
+    c.execute(
+        f"""
+        INSERT INTO musics_music
+        (uuid, title, album_id, genre, artist_id, created_at, updated_at)
+        SELECT gen_random_uuid(), btrim({columns["title"]}), album_uuid,
+            {columns["genre"]}, artist_uuid, NOW(), NOW()
+        FROM music_import
+        WHERE reason IS NULL
+        ORDER BY row_no
+        """
+    )
+    c.execute(
+        """
+        SELECT album_uuid, artist_uuid, count(*)
+        FROM music_import
+        WHERE reason IS NULL
+        GROUP BY album_uuid, artist_uuid
+        """
+    )
+    counters.add_musics(
+        {(album_id, artist_id): count for album_id, artist_id, count in c.fetchall()}
+    )
+
+
+def csv_import_report(c):
+    c.execute(
+        """
+        SELECT reason, count(*)
+        FROM music_import
+        GROUP BY reason
+        """
+    )
+    counts = dict(c.fetchall())
+    accepted = counts.pop(None, 0)
+    c.execute(
+        """
+        SELECT row_no + 1, reason
+        FROM music_import
+        WHERE reason IS NOT NULL
+        ORDER BY row_no
+        LIMIT %s
+        """,
+        [CSV_MAX_REPORTED_ERRORS],
+    )
+    errors = [{"line": line, "reason": reason} for line, reason in c.fetchall()]
+    return {
+        "accepted": accepted,
+        "rejected": sum(counts.values()),
+        "rejected_by_reason": counts,
+        "errors": errors,
+    }
+
+
+def import_musics_csv(stream, role, scope_id):
+    """
+    Import the CSV in ``stream`` (a header row naming at least title, genre,
+    artist_id and album_id, then one music per line) for the export scope
+    ``(role, scope_id)``.
+
+    Returns the accepted and rejected counts, the rejections grouped by
+    reason and the first ``CSV_MAX_REPORTED_ERRORS`` rejected lines.
+    """
+    with transaction.atomic(), connection.cursor() as c:
+        columns = stage_csv(c, stream)
+        validate_staged_csv(c, columns, role, scope_id)
+        merge_staged_csv(c, columns)
+        report = csv_import_report(c)
+        # ON COMMIT DROP only fires when the outermost transaction commits,
+        # so a second import in the same transaction could not stage again
+        c.execute("DROP TABLE music_import")
+        return report
@@ -0,0 +1,182 @@
+"""
+Background music exports.
+
+An ``ExportJob`` row records what to export (the requester's role and
+scope) and how far the export got. Jobs run on a small in-process thread
+pool, stream the rows from a server-side cursor (see ``apps.musics.exports``)
+and write a gzip-compressed CSV or NDJSON file under
+``MEDIA_ROOT/exports/``, which the download endpoint then serves.
+
+The pool lives in the worker process, so a restart loses the jobs it held.
+``cleanup_exports`` marks the jobs that stopped reporting progress as
+failed and deletes the exports older than ``EXPORT_RETENTION_DAYS``.
+"""
+
+import csv
+import gzip
+import io
+import json
+import logging
+import os
+from concurrent.futures import ThreadPoolExecutor
+from datetime import timedelta
+
+from django.conf import settings
+from django.db import connection, transaction
+from django.utils import timezone
+
+from apps.core.models import ExportJob
+from apps.musics.exports import EXPORT_COLUMNS, export_query, iter_export_rows
+
+logger = logging.getLogger(__name__)
+
+EXPORT_DIR = "exports"
+EXPORT_EXTENSIONS = {
+    ExportJob.Format.CSV: "csv.gz",
+    ExportJob.Format.NDJSON: "ndjson.gz",
+}
+# Progress is written back to the job every this many rows
+PROGRESS_INTERVAL = 5000
+# A queued or running job silent for longer lost its worker
+EXPORT_STALE_AFTER = timedelta(
+    minutes=getattr(settings, "EXPORT_STALE_AFTER_MINUTES", 60)
+)
+EXPORT_RETENTION = timedelta(days=getattr(settings, "EXPORT_RETENTION_DAYS", 7))
+
+executor = ThreadPoolExecutor(
+    max_workers=getattr(settings, "EXPORT_WORKERS", 2),
+    thread_name_prefix="music-export",
+)
+
+
+def submit_export(job_id):
+    """Queue ``job_id`` on the worker pool once the current transaction commits."""
+    transaction.on_commit(lambda: executor.submit(run_export, job_id))
+
+
+def count_export_rows(role, scope_id):
+    query, params = export_query(role, scope_id)
+    with connection.cursor() as c:
+        c.execute(f"SELECT count(*) FROM ({query}) e", params)
+        return c.fetchone()[0]
+
+
+def write_csv(out, rows):
+    writer = csv.writer(out)
+    writer.writerow(EXPORT_COLUMNS)
+    for row in rows:
+        writer.writerow(row)
+        yield
+
+
+def write_ndjson(out, rows):
+    for row in rows:
+        out.write(json.dumps(dict(zip(EXPORT_COLUMNS, row)), default=str))
+        out.write("\n")
+        yield
+
+
+WRITERS = {
+    ExportJob.Format.CSV: write_csv,
+    ExportJob.Format.NDJSON: write_ndjson,
+}
+
+
+def write_export(job, path):
+    """Write the job's rows to ``path``, reporting progress as it goes."""
+    exported = 0
+    rows = iter_export_rows(job.role, job.scope_id)
+    with gzip.open(path, "wb") as raw, io.TextIOWrapper(
+        raw, encoding="utf-8", newline=""
+    ) as out:
+        for _ in WRITERS[job.format](out, rows):
+            exported += 1
+            if exported % PROGRESS_INTERVAL == 0:
+                ExportJob.objects.filter(pk=job.pk).update(
+                    exported_rows=exported, updated_at=timezone.now()
+                )
+    return exported
+
+
+def export_name(job):
+    return f"{EXPORT_DIR}/{job.uuid}.{EXPORT_EXTENSIONS[job.format]}"
+
+
+def run_export(job_id):
+    """Run one export job; called on a worker thread."""
+    part = None
+    try:
+        job = ExportJob.objects.get(pk=job_id)
+        if job.status != ExportJob.Status.PENDING:
+            # Given up on by cleanup_exports while it waited in the queue
+            return
+        job.status = ExportJob.Status.RUNNING
+        job.started_at = timezone.now()
+        job.total_rows = count_export_rows(job.role, job.scope_id)
+        job.save(update_fields=["status", "started_at", "total_rows", "updated_at"])
+
+        name = export_name(job)
+        path = os.path.join(settings.MEDIA_ROOT, name)
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        part = f"{path}.part"
+        exported = write_export(job, part)
+        os.replace(part, path)
+
+        job.file.name = name
+        job.exported_rows = exported
+        job.status = ExportJob.Status.SUCCEEDED
+        job.finished_at = timezone.now()
+        job.save(
+            update_fields=[
+                "file",
+                "exported_rows",
+                "status",
+                "finished_at",
+                "updated_at",
+            ]
+        )
+    except Exception as e:
+        logger.exception("Music export %s failed", job_id)
+        ExportJob.objects.filter(pk=job_id).update(
+            status=ExportJob.Status.FAILED,
+            error=str(e),
+            finished_at=timezone.now(),
+        )
+        if part is not None and os.path.exists(part):
+            os.remove(part)
+    finally:
+        # Worker threads own their connection; do not leave it open between jobs
+        connection.close()
+
+
+def fail_orphaned_jobs():
+    """
+    Mark the queued or running jobs without progress for ``EXPORT_STALE_AFTER``
+    failed, since no worker will finish them, and return how many there were.
+    """
+    now = timezone.now()
+    jobs = ExportJob.objects.filter(
+        status__in=[ExportJob.Status.PENDING, ExportJob.Status.RUNNING],
+        updated_at__lt=now - EXPORT_STALE_AFTER,
+    )
+    for job in jobs:
+        part = os.path.join(settings.MEDIA_ROOT, f"{export_name(job)}.part")
+        if os.path.exists(part):
+            os.remove(part)
+    return jobs.update(
+        status=ExportJob.Status.FAILED,
+        error="The export was interrupted",
+        finished_at=now,
+        updated_at=now,
+    )
+
+
+def expire_exports():
+    """Delete the jobs finished over ``EXPORT_RETENTION`` ago and their files."""
+    jobs = ExportJob.objects.filter(
+        finished_at__lt=timezone.now() - EXPORT_RETENTION
+    )
+    for job in jobs:
+        if job.file:
+            job.file.delete(save=False)
+    return jobs.delete()[0]
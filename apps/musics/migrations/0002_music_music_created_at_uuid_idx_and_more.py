@@ -0,0 +1,23 @@
+# Generated by Django 5.1.7 on 2026-10-18 15:15
+
+from django.db import migrations, models
+
+
+class Migration(migrations.Migration):
+
+    dependencies = [
+        ('albums', '0003_alter_album_image'),
+        ('artists', '0010_artist_artist_created_at_uuid_idx'),
+        ('musics', '0001_initial'),
+    ]
+
+    operations = [
+        migrations.AddIndex(
+            model_name='music',
+            index=models.Index(fields=['created_at', 'uuid'], name='music_created_at_uuid_idx'),
+        ),
+        migrations.AddIndex(
+            model_name='music',
+            index=models.Index(fields=['artist', 'created_at', 'uuid'], name='music_artist_created_idx'),
+        ),
+    ]
@@ -1,14 +1,21 @@
+from django.core.exceptions import ValidationError
 from django.db import connection
 from django.db.models import Count
+from django.http import FileResponse
+from django.urls import reverse
 from rest_framework import status
 from rest_framework.exceptions import APIException
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
-from apps.core.models import Artist, Music, UserProfile
-from apps.core.utils import convert_tuples_to_dicts
-from apps.musics.serializers import MusicSerializer
-from apps.users.utils import get_payload
+from apps.core import json_lists
+from apps.core.loaders import load_music_relations
+from apps.core.models import Artist, ExportJob, Music
+from apps.core.pagination import KeysetPagination, RawQueryList
+from apps.core.rows import fetch_records
+from apps.musics.jobs import EXPORT_EXTENSIONS
+from apps.musics.serializers import ExportJobSerializer, compiled_music_serializer
+from apps.users.principal import get_principal
 
 
 class MusicSelector:
@@ -17,116 +24,115 @@ class MusicSelector:
         self.request = request
         self.page_size = request.query_params.get("page_size", 10)
 
-    def get_music_artist(self, user_id):
-        with connection.cursor() as c:
-            c.execute(
-                """
-                    SELECT m.*
-                    FROM musics_music m
-                    LEFT JOIN artists_artist ar ON m.artist_id = ar.uuid
-                    WHERE ar.user_id = %s
-                    """,
-                [user_id],
+    def paginate_musics(self, query, count_query, params=None):
+        if json_lists.enabled():
+            return self.paginate_musics_json(query, count_query, params)
+
+        if KeysetPagination.is_requested(self.request):
+            paginator = KeysetPagination(self.page_size)
+            musics = paginator.paginate_query(
+                Music, query, request=self.request, params=params
             )
-            musics = c.fetchall()
-            columns = [col[0] for col in c.description]
-            if musics is None:
-                raise APIException("Musics not found", status.HTTP_404_NOT_FOUND)
-        musics_dict = convert_tuples_to_dicts(musics, columns)
-        musics_instance = [Music(**music) for music in musics_dict]
+            load_music_relations(musics)
+            return Response(
+                paginator.get_paginated_data(compiled_music_serializer.many(musics)),
+                status=status.HTTP_200_OK,
+            )
+
+        musics = RawQueryList(
+            Music,
+            f"{query} ORDER BY m.created_at, m.uuid",
+            count_query,
+            params,
+        )
 
         # paginate
         paginator = PageNumberPagination()
         paginator.page_size = self.page_size
-        paginated_artists = paginator.paginate_queryset(
-            musics_instance, request=self.request
-        )
+        paginated_musics = paginator.paginate_queryset(musics, request=self.request)
 
-        serializer = MusicSerializer(paginated_artists, many=True)
+        load_music_relations(paginated_musics)
+        data = compiled_music_serializer.many(paginated_musics)
         return Response(
-            paginator.get_paginated_response(serializer.data).data,
+            paginator.get_paginated_response(data).data,
             status=status.HTTP_200_OK,
         )
 
-    def get_music_manager(self, user_id):
-        with connection.cursor() as c:
-            c.execute(
-                """
-                SELECT uuid
-                FROM profiles_userprofile
-                WHERE user_id = %s
-                """,
-                [user_id],
+    def paginate_musics_json(self, query, count_query, params=None):
+        if KeysetPagination.is_requested(self.request):
+            paginator = KeysetPagination(self.page_size)
+            results = paginator.paginate_json(
+                json_lists.music_object, query, request=self.request, params=params
             )
-            manager = c.fetchone()
-            if manager is None:
-                return Response(
-                    {"detail": "Manager not found"}, status=status.HTTP_404_NOT_FOUND
-                )
-            manager_dict = convert_tuples_to_dicts(manager, ["uuid"])[0]
-            manager_id = manager_dict["uuid"]
-
-            c.execute(
-                """
-                SELECT m.*
-                FROM musics_music m
-                LEFT JOIN albums_album a ON m.album_id = a.uuid
-                LEFT JOIN artists_artist ar ON m.artist_id = ar.uuid
-                WHERE ar.manager_id = %s
-                """,
-                [manager_id],
+            return json_lists.json_response(
+                {
+                    "next": paginator.get_next_link(),
+                    "previous": paginator.get_previous_link(),
+                },
+                results,
             )
-            musics = c.fetchall()
-            columns = [col[0] for col in c.description]
-        if musics is None:
-            raise APIException("Musics not found", status.HTTP_404_NOT_FOUND)
-        musics_dict = convert_tuples_to_dicts(musics, columns)
-        musics_instance = [Music(**music) for music in musics_dict]
-        # paginate
+
+        musics = json_lists.JSONQueryList(
+            json_lists.music_object, query, count_query, params
+        )
         paginator = PageNumberPagination()
         paginator.page_size = self.page_size
-        paginated_artists = paginator.paginate_queryset(
-            musics_instance, request=self.request
-        )
+        page = paginator.paginate_queryset(musics, request=self.request)
+        return json_lists.page_response(paginator, page)
 
-        serializer = MusicSerializer(paginated_artists, many=True)
-        return Response(
-            paginator.get_paginated_response(serializer.data).data,
-            status=status.HTTP_200_OK,
+    def get_music_artist(self, artist_id):
+        return self.paginate_musics(
+            """
+            SELECT m.*
+            FROM musics_music m
+            WHERE m.artist_id = %s
+            """,
+            """
+            SELECT count(*)
+            FROM musics_music m
+            WHERE m.artist_id = %s
+            """,
+            [artist_id],
         )
 
-    def get_music_admin(self):
-        with connection.cursor() as c:
-            c.execute(
-                """
-                SELECT * FROM musics_music
-                """
+    def get_music_manager(self, manager_id):
+        if manager_id is None:
+            return Response(
+                {"detail": "Manager not found"}, status=status.HTTP_404_NOT_FOUND
             )
-            musics = c.fetchall()
-            columns = [col[0] for col in c.description]
-        if musics is None:
-            raise APIException("Musics not found", status.HTTP_404_NOT_FOUND)
-        musics_dict = convert_tuples_to_dicts(musics, columns)
-        musics_instance = [Music(**music) for music in musics_dict]
-        # paginate
-        paginator = PageNumberPagination()
-        paginator.page_size = self.page_size
-        paginated_artists = paginator.paginate_queryset(
-            musics_instance, request=self.request
+        return self.paginate_musics(
+            """
+            SELECT m.*
+            FROM musics_music m
+            JOIN artists_artist ar ON m.artist_id = ar.uuid
+            WHERE ar.manager_id = %s
+            """,
+            """
+            SELECT count(*)
+            FROM musics_music m
+            JOIN artists_artist ar ON m.artist_id = ar.uuid
+            WHERE ar.manager_id = %s
+            """,
+            [manager_id],
         )
 
-        serializer = MusicSerializer(paginated_artists, many=True)
-        return Response(
-            paginator.get_paginated_response(serializer.data).data,
-            status=status.HTTP_200_OK,
+    def get_music_admin(self):
+        return self.paginate_musics(
+            """
+            SELECT m.*
+            FROM musics_music m
+            """,
+            """
+            SELECT count(*)
+            FROM musics_music m
+            """,
         )
 
     def get_musics(self):
-        payload = get_payload(self.headers)
-        if payload is None:
+        principal = get_principal(self.request)
+        if principal is None:
             return Response(status=status.HTTP_401_UNAUTHORIZED)
-        user_role = payload.get("role", "")
-        user_id = payload.get("user_id", "")
+        user_role = principal.role
 
         if (
             user_role != "ARTIST"
@@ -136,10 +142,10 @@ class MusicSelector:
             raise APIException("Unauthorized", status.HTTP_401_UNAUTHORIZED)
 
         if user_role == "ARTIST":
-            return self.get_music_artist(user_id)
+            return self.get_music_artist(principal.artist_id)
 
         if user_role == "ARTIST_MANAGER":
-            return self.get_music_manager(user_id)
+            return self.get_music_manager(principal.manager_id)
 
         if user_role == "SUPER_ADMIN":
             return self.get_music_admin()
@@ -148,27 +154,25 @@ class MusicSelector:
         with connection.cursor() as c:
             c.execute(
                 """
-                SELECT uuid, title, album_id, genre, artist_id
-                FROM musics_music
-                WHERE uuid = %s
+                SELECT m.*
+                FROM musics_music m
+                WHERE m.uuid = %s
                 """,
                 [uuid],
             )
-            music = c.fetchone()
-            columns = [col[0] for col in c.description]
-        if music is None:
-            APIException("Music not found", status.HTTP_404_NOT_FOUND)
-        music_dict = convert_tuples_to_dicts(music, columns)
-        music_instance = [Music(**music) for music in music_dict]
-        serializer = MusicSerializer(music_instance)
-        return Response(serializer.data, status=status.HTTP_200_OK)
+            musics = fetch_records(c, Music)
+        if not musics:
+            return Response(
+                {"message": "Music not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+        load_music_relations(musics)
+        return Response(compiled_music_serializer(musics[0]), status=status.HTTP_200_OK)
 
     def get_genre_music_count(self):
-        payload = get_payload(self.headers)
-        if payload is None:
+        principal = get_principal(self.request)
+        if principal is None:
             return Response(status=status.HTTP_401_UNAUTHORIZED)
-        user_role = payload.get("role", "")
-        user_id = payload.get("user_id", "")
+        user_role = principal.role
 
         if (
             user_role != "ARTIST"
@@ -179,14 +183,14 @@ class MusicSelector:
 
         musics_count = None
         if user_role == "ARTIST":
-            artist_id = Artist.objects.get(user_id=user_id).uuid
-            musics = Music.objects.filter(artist_id=artist_id)
+            musics = Music.objects.filter(artist_id=principal.artist_id)
             musics_count = (
                 musics.values("genre").annotate(count=Count("genre")).order_by("genre")
             )
         if user_role == "ARTIST_MANAGER":
-            manager = UserProfile.objects.get(user_id=user_id)
-            artists_managed_by_manager = Artist.objects.filter(manager=manager)
+            artists_managed_by_manager = Artist.objects.filter(
+                manager_id=principal.manager_id
+            )
             musics = Music.objects.filter(artist__in=artists_managed_by_manager)
             musics_count = (
                 musics.values("genre").annotate(count=Count("genre")).order_by("genre")
@@ -199,3 +203,59 @@ class MusicSelector:
             )
 
         return Response(musics_count, status=status.HTTP_200_OK)
+
+    def export_job_data(self, job):
+        data = ExportJobSerializer(job).data
+        data["progress"] = None
+        if job.total_rows:
+            data["progress"] = round(job.exported_rows / job.total_rows, 4)
+        elif job.status == ExportJob.Status.SUCCEEDED:
+            data["progress"] = 1.0
+        data["download"] = None
+        if job.status == ExportJob.Status.SUCCEEDED:
+            data["download"] = self.request.build_absolute_uri(
+                reverse("music-export-download", args=[job.uuid])
+            )
+        return data
+
+    def get_export_job(self, uuid):
+        principal = get_principal(self.request)
+        if principal is None:
+            return None
+        try:
+            job = ExportJob.objects.filter(uuid=uuid).first()
+        except ValidationError:
+            return None
+        if job is None:
+            return None
+        if (
+            principal.role != "SUPER_ADMIN"
+            and str(job.requested_by_id) != principal.user_id
+        ):
+            return None
+        return job
+
+    def get_export(self, uuid):
+        job = self.get_export_job(uuid)
+        if job is None:
+            return Response(
+                {"message": "Export not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+        return Response(self.export_job_data(job), status=status.HTTP_200_OK)
+
+    def download_export(self, uuid):
+        job = self.get_export_job(uuid)
+        if job is None:
+            return Response(
+                {"message": "Export not found"}, status=status.HTTP_404_NOT_FOUND
+            )
+        if job.status != ExportJob.Status.SUCCEEDED or not job.file:
+            return Response(
+                {"message": "Export is not ready"}, status=status.HTTP_409_CONFLICT
+            )
+        return FileResponse(
+            job.file.open("rb"),
+            as_attachment=True,
+            filename=f"musics.{EXPORT_EXTENSIONS[job.format]}",
+            content_type="application/gzip",
+        )
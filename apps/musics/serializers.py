@@ -2,7 +2,8 @@ from rest_framework import serializers
 
 from apps.albums.serializers import AlbumSerializer
 from apps.artists.serializers import ArtistSerializer
-from apps.core.models import Album, Artist, Music
+from apps.core.compiled import compile_serializer
+from apps.core.models import Album, Artist, ExportJob, Music
 
 
 class MusicSerializer(serializers.Serializer):
@@ -35,3 +36,21 @@ class MusicSerializers(serializers.Serializer):
         if isinstance(instance, dict):
             return instance
         return super().to_representation(instance)
+
+
+class ExportJobSerializer(serializers.Serializer):
+    uuid = serializers.UUIDField(read_only=True)
+    format = serializers.ChoiceField(
+        choices=ExportJob.Format.choices, default=ExportJob.Format.CSV
+    )
+    status = serializers.CharField(read_only=True)
+    total_rows = serializers.IntegerField(read_only=True)
+    exported_rows = serializers.IntegerField(read_only=True)
+    error = serializers.CharField(read_only=True)
+    created_at = serializers.DateTimeField(read_only=True)
+    started_at = serializers.DateTimeField(read_only=True)
+    finished_at = serializers.DateTimeField(read_only=True)
+
+
+# Read-only fast path generated from the declarations above
+compiled_music_serializer = compile_serializer(MusicSerializer)
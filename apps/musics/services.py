@@ -1,14 +1,19 @@
-from django.db import connection
+from django.db import connection, transaction
 from rest_framework import status
 from rest_framework.exceptions import APIException
 from rest_framework.response import Response
 
 from apps.albums.selectors import AlbumSelector
 from apps.artists.selectors import ArtistSelector
-from apps.core.models import Album, Artist
+from apps.core import counters
+from apps.core.models import ExportJob
 from apps.core.utils import convert_tuples_to_dicts
-from apps.musics.serializers import MusicSerializer
-from apps.users.utils import get_payload
+from apps.musics.exports import ExportScopeError, export_query, export_scope
+from apps.musics.imports import CSVImportError, import_musics, import_musics_csv
+from apps.musics.jobs import submit_export
+from apps.musics.selectors import MusicSelector
+from apps.musics.serializers import ExportJobSerializer, MusicSerializer
+from apps.users.principal import get_principal
 
 
 class MusicService:
@@ -18,74 +23,71 @@ class MusicService:
         self.headers = request.headers
         self.request = request
 
-    def create_musics_bulk(self):
-        created_music = []
-
-        for music in self.data.get("rows"):
-            title = music.get("title", "")
-            genre = music.get("genre", "")
-            artist_id = music.get("artist_id", "")
-            album_id = music.get("album_id", "")
-
-            if not title and not genre and not artist_id and not album_id:
-                continue
-
-            album = Album.objects.filter(uuid=album_id).first()
-            artist = Artist.objects.filter(uuid=artist_id).first()
-
-            if not album or not artist:
-                continue
-
-            if album and album.owner != artist:
-                continue
-
-            if not Album.objects.filter(uuid=album_id).exists():
-                continue
-
-            with connection.cursor() as c:
-                c.execute(
-                    """
-                    INSERT INTO musics_music
-                    (title, album_id, genre, artist_id, created_at, updated_at)
-                    VALUES (%s, %s, %s, %s, NOW(), NOW())
-                    RETURNING uuid
-                    """,
-                    [title, album_id, genre, artist_id],
-                )
-                music = c.fetchone()
-                if not music:
-                    return Response(
-                        {"detail": "Music not created"},
-                        status=status.HTTP_400_BAD_REQUEST,
-                    )
-
-            if music:
-                self.update_album_and_artist_counts(album_id, artist_id)
-                created_music.append(music)
-
-        return Response(created_music, status=status.HTTP_201_CREATED)
+    def import_scope(self):
+        """The ``(role, scope_id)`` imports are limited to, as for exports."""
+        principal = get_principal(self.request)
+        if principal is None:
+            raise ExportScopeError("Unauthorized")
+        role, scope_id = export_scope(principal)
+        export_query(role, scope_id)
+        return role, scope_id
 
-    def update_album_and_artist_counts(self, album_id, artist_id):
-        with connection.cursor() as cursor:
-            # Update album's track count after music change
-            cursor.execute(
-                """
-                UPDATE albums_album
-                SET no_of_tracks = (SELECT COUNT(*) FROM musics_music WHERE album_id = %s)
-                WHERE uuid = %s
-            """,
-                [album_id, album_id],
+    def create_musics_bulk(self):
+        try:
+            role, scope_id = self.import_scope()
+        except ExportScopeError as e:
+            return Response({"message": str(e)}, status=e.status_code)
+        rows = self.data.get("rows", None)
+        if not isinstance(rows, list):
+            return Response(
+                {"message": "A list of rows is required"},
+                status=status.HTTP_400_BAD_REQUEST,
             )
-
-            # Update artist's album count
-            cursor.execute(
-                """
-                UPDATE artists_artist
-                SET no_of_album_released = (SELECT COUNT(*) FROM albums_album WHERE owner_id = %s)
-                WHERE uuid = %s
-            """,
-                [artist_id, artist_id],
+        report = import_musics(rows, role, scope_id)
+        return Response(report, status=status.HTTP_201_CREATED)
+
+    def create_musics_csv(self):
+        try:
+            role, scope_id = self.import_scope()
+        except ExportScopeError as e:
+            return Response({"message": str(e)}, status=e.status_code)
+        upload = self.request.FILES.get("file", None)
+        if upload is None:
+            return Response(
+                {"message": "A CSV file is required"},
+                status=status.HTTP_400_BAD_REQUEST,
+            )
+        try:
+            report = import_musics_csv(upload.file, role, scope_id)
+        except CSVImportError as e:
+            return Response({"message": str(e)}, status=status.HTTP_400_BAD_REQUEST)
+        return Response(report, status=status.HTTP_201_CREATED)
+
+    def create_export(self):
+        principal = get_principal(self.request)
+        if principal is None:
+            return Response(status=status.HTTP_401_UNAUTHORIZED)
+        try:
+            role, scope_id = export_scope(principal)
+            export_query(role, scope_id)
+        except ExportScopeError as e:
+            return Response({"message": str(e)}, status=e.status_code)
+
+        export_format = str(self.data.get("format", ExportJob.Format.CSV)).upper()
+        serializer = ExportJobSerializer(data={"format": export_format})
+        serializer.is_valid(raise_exception=True)
+        with transaction.atomic():
+            job = ExportJob.objects.create(
+                requested_by_id=principal.user_id,
+                role=role,
+                scope_id=scope_id,
+                format=serializer.validated_data["format"],
             )
+            submit_export(job.uuid)
+        musicSelector = MusicSelector(self.request)
+        return Response(
+            musicSelector.export_job_data(job), status=status.HTTP_202_ACCEPTED
+        )
 
     def serialize_data(self, data):
         serializer = MusicSerializer(data=data)
@@ -94,27 +96,15 @@ class MusicService:
         serializer.is_valid(raise_exception=True)
         return serializer
 
-    def create_music_artist(self, user_id):
+    def create_music_artist(self, artist_id):
         data = self.data
         self.serialize_data(data)
-
-        with connection.cursor() as c:
-            c.execute(
-                """
-                SELECT uuid
-                FROM artists_artist
-                WHERE user_id = %s
-                """,
-                [user_id],
+        if artist_id is None:
+            return Response(
+                {"message": "Artist not found"}, status=status.HTTP_404_NOT_FOUND
             )
-            artist = c.fetchone()
-            if artist is None:
-                return Response(
-                    {"message": "Artist not found"}, status=status.HTTP_404_NOT_FOUND
-                )
-            artist_dict = convert_tuples_to_dicts(artist, ["uuid"])[0]
-            artist_id = artist_dict["uuid"]
 
+        with transaction.atomic(), connection.cursor() as c:
             c.execute(
                 """
                 INSERT INTO musics_music
@@ -130,13 +120,11 @@ class MusicService:
                 ],
             )
             music = c.fetchone()
-            album_id = music[2]
-            artist_id = music[4]
-            self.update_album_and_artist_counts(album_id, artist_id)
             if music is None:
                 return Response(
                     {"message": "Music not created"}, status=status.HTTP_400_BAD_REQUEST
                 )
+            counters.music_added(music[2], music[4])
             music_dict = convert_tuples_to_dicts(
                 music,
                 [
@@ -156,7 +144,7 @@ class MusicService:
         if artist_id is None:
             raise APIException("Artist not provided", status.HTTP_400_BAD_REQUEST)
         album_id = data.get("album", None) or None
-        with connection.cursor() as c:
+        with transaction.atomic(), connection.cursor() as c:
             c.execute(
                 """
                 INSERT INTO musics_music
@@ -173,26 +161,23 @@ class MusicService:
             )
             music = c.fetchone()
             columns = [col[0] for col in c.description]
-            album_id = music[2]
-            artist_id = music[4]
-            self.update_album_and_artist_counts(album_id, artist_id)
             if music is None:
                 raise APIException("Music not created", status.HTTP_400_BAD_REQUEST)
+            counters.music_added(music[2], music[4])
             music_dict = convert_tuples_to_dicts(music, columns)[0]
             return Response(music_dict, status=status.HTTP_200_OK)
 
     def create_music(self):
-        payload = get_payload(self.headers)
-        if payload is None:
+        principal = get_principal(self.request)
+        if principal is None:
             return Response(status=status.HTTP_401_UNAUTHORIZED)
-        role = payload.get("role", "")
-        user_id = payload.get("user_id", "")
+        role = principal.role
 
         if role != "ARTIST" and role != "ARTIST_MANAGER" and role != "SUPER_ADMIN":
             return Response(status=status.HTTP_401_UNAUTHORIZED)
 
         if role == "ARTIST":
-            return self.create_music_artist(user_id)
+            return self.create_music_artist(principal.artist_id)
 
         if role == "ARTIST_MANAGER" or role == "SUPER_ADMIN":
             return self.create_music_manager()
@@ -203,30 +188,37 @@ class MusicService:
 
         artist_id = data.get("artist", None) or None
         album_id = data.get("album", None) or None
-        with connection.cursor() as c:
+        with transaction.atomic(), connection.cursor() as c:
             c.execute(
                 """
-                UPDATE musics_music
+                WITH previous AS (
+                    SELECT uuid, album_id, artist_id
+                    FROM musics_music
+                    WHERE uuid = %s
+                    FOR UPDATE
+                )
+                UPDATE musics_music m
                 SET title = %s, album_id = %s, genre = %s, artist_id = %s, updated_at = NOW()
-                WHERE uuid = %s
-                RETURNING uuid, title, album_id, genre, artist_id
+                FROM previous
+                WHERE m.uuid = previous.uuid
+                RETURNING m.uuid, m.title, m.album_id, m.genre, m.artist_id,
+                    previous.album_id, previous.artist_id
                 """,
                 [
+                    uuid,
                     data.get("title", ""),
                     album_id,
                     data.get("genre", ""),
                     artist_id,
-                    uuid,
                 ],
             )
             music = c.fetchone()
-            album_id = music[2]
-            artist_id = music[4]
-            self.update_album_and_artist_counts(album_id, artist_id)
-        if music is None:
-            return Response(
-                {"message": "Music not updated"}, status=status.HTTP_400_BAD_REQUEST
-            )
+            if music is None:
+                return Response(
+                    {"message": "Music not updated"},
+                    status=status.HTTP_400_BAD_REQUEST,
+                )
+            counters.music_moved(music[5], music[6], music[2], music[4])
         music_dict = convert_tuples_to_dicts(
             music,
             [
@@ -240,7 +232,7 @@ class MusicService:
         return Response(music_dict, status=status.HTTP_200_OK)
 
     def delete_music(self, uuid):
-        with connection.cursor() as c:
+        with transaction.atomic(), connection.cursor() as c:
             c.execute(
                 """
                 DELETE FROM musics_music
@@ -251,7 +243,11 @@ class MusicService:
             )
 
             music = c.fetchone()
+            if music is None:
+                return Response(
+                    {"message": "Music not found"}, status=status.HTTP_404_NOT_FOUND
+                )
             album_id = music[1]
             artist_id = music[2]
-            self.update_album_and_artist_counts(album_id, artist_id)
-            return c.fetchone()[0]
+            counters.music_removed(album_id, artist_id)
+        return Response(status=status.HTTP_204_NO_CONTENT)
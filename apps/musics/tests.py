@@ -0,0 +1,191 @@
+import datetime
+import io
+import json
+import uuid
+
+from django.core.management import call_command
+from django.utils import timezone
+from rest_framework.renderers import JSONRenderer
+
+from apps.core import counters, query_budget
+from apps.core.models import Album, ExportJob, Music
+from apps.core.pagination import DEFAULT_PAGE_SIZE, MAX_PAGE_SIZE, KeysetPagination
+from apps.core.testing import CatalogTestCase
+from apps.musics.imports import ACCEPTED, REJECTED, clean_row, import_musics_csv
+from apps.musics.serializers import MusicSerializer
+
+
+class KeysetPageSizeTests(CatalogTestCase):
+    def test_clean_page_size(self):
+        for value, expected in [
+            ("5", 5),
+            ("abc", DEFAULT_PAGE_SIZE),
+            (None, DEFAULT_PAGE_SIZE),
+            ("-5", 1),
+            ("0", 1),
+            ("100000", MAX_PAGE_SIZE),
+        ]:
+            with self.subTest(value=value):
+                self.assertEqual(KeysetPagination.clean_page_size(value), expected)
+
+    def test_invalid_page_size_is_not_a_server_error(self):
+        client = self.client_for("SUPER_ADMIN")
+        for value, expected in [("abc", DEFAULT_PAGE_SIZE), ("-5", 1)]:
+            with self.subTest(page_size=value):
+                response = client.get(f"/api/v1/musics/?cursor=&page_size={value}")
+                self.assertEqual(response.status_code, 200)
+                self.assertEqual(len(response.json()["results"]), expected)
+
+
+class BulkImportTests(CatalogTestCase):
+    def row(self, **values):
+        return {
+            "title": "Imported",
+            "genre": "POP",
+            "artist_id": str(self.ids["artist"]),
+            "album_id": str(self.ids["album"]),
+            **values,
+        }
+
+    def test_clean_row_rejects_non_string_title_and_genre(self):
+        for values, reason in [
+            ({"title": 5}, "Title must be a string"),
+            ({"title": ["a"]}, "Title must be a string"),
+            ({"genre": ["POP"]}, "Genre must be a string"),
+            ({"genre": {"POP": 1}}, "Genre must be a string"),
+        ]:
+            with self.subTest(values=values):
+                self.assertEqual(clean_row(self.row(**values))[-1], reason)
+
+    def test_invalid_rows_are_reported_per_row(self):
+        response = self.client_for("SUPER_ADMIN").post(
+            "/api/v1/musics/bulk/",
+            {"rows": [self.row(), self.row(title=5), self.row(genre=["POP"])]},
+            format="json",
+        )
+        self.assertEqual(response.status_code, 201)
+        self.assertEqual(
+            [row["status"] for row in response.json()["rows"]],
+            [ACCEPTED, REJECTED, REJECTED],
+        )
+
+
+    def csv(self, *rows):
+        lines = ["title,genre,artist_id,album_id"] + [
+            f"{row['title']},{row['genre']},{row['artist_id']},{row['album_id']}"
+            for row in rows
+        ]
+        upload = io.BytesIO("\n".join(lines).encode())
+        upload.name = "musics.csv"
+        return upload
+
+    def test_csv_imports_twice_in_one_transaction(self):
+        for _ in range(2):
+            report = import_musics_csv(self.csv(self.row()), "SUPER_ADMIN", None)
+            self.assertEqual(report["accepted"], 1)
+
+    def test_rows_outside_the_scope_are_rejected(self):
+        for role, other in [("ARTIST", "0-1"), ("ARTIST_MANAGER", "1-0")]:
+            other_row = self.row(
+                artist_id=str(query_budget.fixed_uuid(f"artist{other}")),
+                album_id=str(query_budget.fixed_uuid(f"album{other}-0")),
+            )
+            client = self.client_for(role)
+            with self.subTest(role=role, upload="json"):
+                response = client.post(
+                    "/api/v1/musics/bulk/",
+                    {"rows": [self.row(), other_row]},
+                    format="json",
+                )
+                self.assertEqual(response.status_code, 201)
+                self.assertEqual(
+                    [row.get("reason") for row in response.json()["rows"]],
+                    [None, "Artist is outside your scope"],
+                )
+            with self.subTest(role=role, upload="csv"):
+                response = client.post(
+                    "/api/v1/musics/bulk/csv/",
+                    {"file": self.csv(self.row(), other_row)},
+                    format="multipart",
+                )
+                self.assertEqual(response.status_code, 201)
+                self.assertEqual(response.json()["accepted"], 1)
+                self.assertEqual(
+                    response.json()["rejected_by_reason"],
+                    {"Artist is outside your scope": 1},
+                )
+
+
+class DeferredCounterTests(CatalogTestCase):
+    def assertNoDrift(self):
+        self.assertEqual(
+            counters.find_drift(), {"tracks": [], "albums": [], "catalog_stats": []}
+        )
+
+    def test_moving_a_music_loaded_without_its_ids(self):
+        music = Music.objects.only("title").get(pk=self.ids["music"])
+        other = Album.objects.filter(owner_id=self.ids["artist"]).exclude(
+            pk=self.ids["album"]
+        )[0]
+        music.album = other
+        music.save()
+        self.assertNoDrift()
+
+    def test_saving_a_music_loaded_without_its_ids(self):
+        music = Music.objects.only("title").get(pk=self.ids["music"])
+        music.title = "Renamed"
+        music.save()
+        self.assertNoDrift()
+
+    def test_saving_other_fields_leaves_the_counters_alone(self):
+        music = Music.objects.get(pk=self.ids["music"])
+        music.album = Album.objects.filter(owner_id=self.ids["artist"]).exclude(
+            pk=self.ids["album"]
+        )[0]
+        music.title = "Renamed"
+        music.save(update_fields=["title"])
+        self.assertNoDrift()
+        self.assertEqual(music.loaded_ids()[0], self.ids["album"])
+
+    def test_deleting_a_music_loaded_without_its_ids(self):
+        Music.objects.only("title").get(pk=self.ids["music"]).delete()
+        self.assertNoDrift()
+
+
+class MusicDetailTests(CatalogTestCase):
+    def test_matches_the_serializer(self):
+        music = Music.objects.get(pk=self.ids["music"])
+        response = self.client_for("SUPER_ADMIN").get(f"/api/v1/musics/{music.pk}/")
+        self.assertEqual(response.status_code, 200)
+        expected = JSONRenderer().render(MusicSerializer(music).data)
+        self.assertEqual(response.json(), json.loads(expected))
+
+    def test_missing_music_is_not_found(self):
+        client = self.client_for("SUPER_ADMIN")
+        response = client.get(f"/api/v1/musics/{uuid.uuid4()}/")
+        self.assertEqual(response.status_code, 404)
+
+
+class ExportCleanupTests(CatalogTestCase):
+    def test_orphaned_jobs_fail_and_old_exports_expire(self):
+        export = ExportJob.objects.get(pk=self.ids["export"])
+        long_ago = timezone.now() - datetime.timedelta(days=30)
+        stuck, queued = [
+            ExportJob.objects.create(requested_by=export.requested_by, status=status)
+            for status in (ExportJob.Status.RUNNING, ExportJob.Status.PENDING)
+        ]
+        fresh = ExportJob.objects.create(requested_by=export.requested_by)
+        ExportJob.objects.filter(pk__in=[stuck.pk, queued.pk]).update(
+            updated_at=long_ago
+        )
+        ExportJob.objects.filter(pk=export.pk).update(finished_at=long_ago)
+
+        call_command("cleanup_exports", stdout=io.StringIO())
+
+        for job in (stuck, queued):
+            job.refresh_from_db()
+            self.assertEqual(job.status, ExportJob.Status.FAILED)
+        fresh.refresh_from_db()
+        self.assertEqual(fresh.status, ExportJob.Status.PENDING)
+        self.assertFalse(ExportJob.objects.filter(pk=export.pk).exists())
+        self.assertFalse(export.file.storage.exists(export.file.name))
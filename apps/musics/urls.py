@@ -5,7 +5,11 @@ from .views import (
     GenreView,
     MusicCSVView,
     MusicDetailView,
+    MusicExportDetailView,
+    MusicExportDownloadView,
+    MusicExportView,
     MusicPostBulk,
+    MusicPostBulkCSV,
     MusicView,
 )
 
@@ -13,6 +17,18 @@ urlpatterns = [
     path("", MusicView.as_view(), name="musics"),
     path("csv/", MusicCSVView.as_view(), name="music-csv"),
     path("bulk/", MusicPostBulk.as_view(), name="music-bulk"),
+    path("bulk/csv/", MusicPostBulkCSV.as_view(), name="music-bulk-csv"),
+    path("exports/", MusicExportView.as_view(), name="music-exports"),
+    path(
+        "exports/<str:uuid>/",
+        MusicExportDetailView.as_view(),
+        name="music-export",
+    ),
+    path(
+        "exports/<str:uuid>/download/",
+        MusicExportDownloadView.as_view(),
+        name="music-export-download",
+    ),
     path("<str:uuid>/", MusicDetailView.as_view(), name="music"),
     path("genres/all/", GenreView.as_view(), name="genres"),
     path("genres/count/", GenreMusicView.as_view(), name="genre-music-count"),
@@ -1,16 +1,15 @@
-import csv
-
-from django.http import HttpResponse
 from rest_framework import status
+from rest_framework.parsers import MultiPartParser
 from rest_framework.permissions import IsAuthenticated
 from rest_framework.response import Response
 from rest_framework.views import APIView
 
-from apps.core.models import Artist, Music, UserProfile
+from apps.core.models import Music
+from apps.musics.exports import ExportScopeError, csv_export_response, export_scope
 from apps.musics.selectors import MusicSelector
 from apps.musics.services import MusicService
 from apps.users.authentication import JWTAuthentication
-from apps.users.utils import get_payload
+from apps.users.principal import get_principal
 
 
 class MusicPostBulk(APIView):
@@ -19,6 +18,32 @@ class MusicPostBulk(APIView):
         return musicService.create_musics_bulk()
 
 
+class MusicPostBulkCSV(APIView):
+    parser_classes = [MultiPartParser]
+
+    def post(self, request):
+        musicService = MusicService(request)
+        return musicService.create_musics_csv()
+
+
+class MusicExportView(APIView):
+    def post(self, request):
+        musicService = MusicService(request)
+        return musicService.create_export()
+
+
+class MusicExportDetailView(APIView):
+    def get(self, request, uuid):
+        musicSelector = MusicSelector(request)
+        return musicSelector.get_export(uuid)
+
+
+class MusicExportDownloadView(APIView):
+    def get(self, request, uuid):
+        musicSelector = MusicSelector(request)
+        return musicSelector.download_export(uuid)
+
+
 class GenreView(APIView):
     def get(self, request):
         genres = [genre[0] for genre in Music.Genre.choices]
@@ -27,54 +52,14 @@ class GenreView(APIView):
 
 class MusicCSVView(APIView):
     def get(self, request):
-        musicView = MusicView()
-        payload = get_payload(request.headers)
-        if payload is None:
+        principal = get_principal(request)
+        if principal is None:
             return Response(status=status.HTTP_401_UNAUTHORIZED)
-        musics_response = musicView.get(request)
-
-        if isinstance(musics_response, Response) and musics_response.status_code != 200:
-            return musics_response
-
-        musics = musics_response.data.get("results", [])
-        if payload["role"] == "ARTIST":
-            current_artist_id = payload["user_id"]
-            artist_uuid = Artist.objects.get(user_id=current_artist_id).uuid
-            musics = [
-                music for music in musics if music.get("artist_id") == artist_uuid
-            ]
-        elif payload["role"] == "ARTIST_MANAGER":
-            current_manager_id = payload["user_id"]
-            manager_uuid = UserProfile.objects.get(user_id=current_manager_id).uuid
-            managed_artists = Artist.objects.filter(manager__uuid=manager_uuid)
-            managed_artist_ids = [artist.uuid for artist in managed_artists]
-            musics = [
-                music
-                for music in musics
-                if music.get("artist_id") in managed_artist_ids
-            ]
-
-        response = HttpResponse(content_type="text/csv")
-        response["Content-Disposition"] = 'attachment; filename="musics.csv"'
-        writer = csv.writer(response)
-        writer.writerow(["album_id", "artist_id", "title", "album", "genre", "artist"])
-
-        for music in musics:
-            artist_name = music.get("artist", {}).get("name", "")
-            artist_id = music.get("artist_id", "")
-            album_name = music.get("album").get("name", "")
-            album_id = music.get("album_id", "")
-            writer.writerow(
-                [
-                    album_id,
-                    artist_id,
-                    music.get("title", ""),
-                    album_name,
-                    music.get("genre", ""),
-                    artist_name,
-                ]
-            )
-        return response
+        try:
+            role, scope_id = export_scope(principal)
+            return csv_export_response(role, scope_id)
+        except ExportScopeError as e:
+            return Response({"message": str(e)}, status=e.status_code)
 
 
 class MusicView(APIView):
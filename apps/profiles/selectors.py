@@ -6,11 +6,17 @@ from rest_framework import status
 from rest_framework.pagination import PageNumberPagination
 from rest_framework.response import Response
 
-from apps.artists.serializers import ArtistSerializer
+from apps.artists.serializers import compiled_artist_serializer
+from apps.core import json_lists
+from apps.core.loaders import load_profile_relations
 from apps.core.models import Artist, UserProfile
+from apps.core.pagination import RawQueryList
 from apps.core.utils import convert_tuples_to_dicts
-from apps.profiles.serializers import UserProfileSerializer
-from apps.users.utils import get_payload
+from apps.profiles.serializers import (
+    UserProfileSerializer,
+    compiled_profile_serializer,
+)
+from apps.users.principal import get_principal
 
 
 class ManagerSelector:
@@ -20,32 +26,39 @@ class ManagerSelector:
         self.page_size = request.query_params.get("page_size", 10)
 
     def get_managers(self):
-        with connection.cursor() as c:
-            c.execute(
-                """
-                SELECT m.*
-                FROM profiles_userprofile m
-                JOIN core_user u ON u.uuid = m.user_id
-                WHERE u.role = 'ARTIST_MANAGER';
-                """
-            )
-            managers = c.fetchall()
-            columns = [col[0] for col in c.description]
-            if managers is None:
-                return Response(status=status.HTTP_404_NOT_FOUND)
-        managers_dict = convert_tuples_to_dicts(managers, columns)
-        managers_instances = [UserProfile(**manager) for manager in managers_dict]
-
-        # paginate
+        query = """
+            SELECT m.*
+            FROM profiles_userprofile m
+            JOIN core_user u ON u.uuid = m.user_id
+            WHERE u.role = 'ARTIST_MANAGER'
+            """
+        count_query = """
+            SELECT count(*)
+            FROM profiles_userprofile m
+            JOIN core_user u ON u.uuid = m.user_id
+            WHERE u.role = 'ARTIST_MANAGER'
+            """
         paginator = PageNumberPagination()
         paginator.page_size = self.page_size
+
+        if json_lists.enabled():
+            managers = json_lists.JSONQueryList(
+                json_lists.profile_object, query, count_query
+            )
+            page = paginator.paginate_queryset(managers, request=self.request)
+            return json_lists.page_response(paginator, page)
+
+        managers = RawQueryList(
+            UserProfile, f"{query} ORDER BY m.created_at, m.uuid", count_query
+        )
         paginated_managers = paginator.paginate_queryset(
-            managers_instances, request=self.request
+            managers, request=self.request
         )
-        serializer = UserProfileSerializer(paginated_managers, many=True)
+        load_profile_relations(paginated_managers)
+        data = compiled_profile_serializer.many(paginated_managers)
 
         return Response(
-            paginator.get_paginated_response(serializer.data).data,
+            paginator.get_paginated_response(data).data,
             status=status.HTTP_200_OK,
         )
 
@@ -71,33 +84,20 @@ class ManagerSelector:
         return Response(serializer.data[0], status=status.HTTP_200_OK)
 
     def get_current_manager(self):
-        payload = get_payload(self.headers)
-        if payload is None:
-            return Response(status=status.HTTP_401_UNAUTHORIZED)
-        user_id = payload.get("user_id", "")
-        with connection.cursor() as c:
-            c.execute(
-                """
-                SELECT uuid
-                FROM profiles_userprofile
-                WHERE user_id = %s
-                """,
-                [user_id],
-            )
-            manager_id = c.fetchone()
-            if not manager_id:
-                return Response(status=status.HTTP_404_NOT_FOUND)
-            manager_id = manager_id[0]
-        if user_id is None:
+        principal = get_principal(self.request)
+        if principal is None:
             return Response(status=status.HTTP_401_UNAUTHORIZED)
+        manager_id = principal.manager_id
+        if manager_id is None:
+            return Response(status=status.HTTP_404_NOT_FOUND)
         return self.get_manager_by_id(manager_id)
 
     def get_artists_by_manager(self, uuid):
-        manager = UserProfile.objects.get(uuid=uuid)
+        manager = UserProfile.objects.select_related("user").get(uuid=uuid)
         serializer = UserProfileSerializer(manager)
-        artists = manager.artists_managed.all()
+        artists = manager.artists_managed.select_related("user", "manager__user")
         response = serializer.data
-        response["artists"] = ArtistSerializer(artists, many=True).data
+        response["artists"] = compiled_artist_serializer.many(artists)
         return Response(response, status=status.HTTP_200_OK)
 
     def get_artists_by_managers(self):
@@ -106,10 +106,14 @@ class ManagerSelector:
             .filter(user__role="ARTIST_MANAGER")
             .order_by("-artist_count")[:5]
         )
-        artists_by_managers = Artist.objects.filter(manager__in=top5managers)
+        artists_by_managers = Artist.objects.filter(
+            manager__in=top5managers
+        ).select_related("user", "manager__user")
         artist_by_manager = defaultdict(list)
         for artist in artists_by_managers:
-            artist_by_manager[artist.manager.uuid].append(ArtistSerializer(artist).data)
+            artist_by_manager[artist.manager.uuid].append(
+                compiled_artist_serializer(artist)
+            )
 
         response_data = {
             str(manager.uuid): {
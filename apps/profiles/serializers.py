@@ -2,6 +2,7 @@ from datetime import datetime
 
 from rest_framework import serializers
 
+from apps.core.compiled import compile_serializer
 from apps.core.models import UserProfile
 from apps.core.utils import convert_tuples_to_dicts
 from apps.users.serializers import UserSerializer
@@ -30,3 +31,7 @@ class UserProfileSerializer(serializers.Serializer):
             raise serializers.ValidationError("Date of birth cannot be in the future.")
 
         return attrs
+
+
+# Read-only fast path generated from the declarations above
+compiled_profile_serializer = compile_serializer(UserProfileSerializer)
@@ -4,10 +4,13 @@ from rest_framework import status
 from rest_framework.exceptions import APIException
 from rest_framework.response import Response
 
+from apps.core import catalog_stats, scopes
+from apps.core.models import User, UserProfile
 from apps.core.utils import convert_tuples_to_dicts
 from apps.profiles.selectors import ManagerSelector
 from apps.profiles.serializers import UserProfileSerializer
-from apps.users.utils import get_payload
+from apps.users.authentication import invalidate_cached_user
+from apps.users.principal import get_principal
 
 
 class ManagerService:
@@ -53,10 +56,10 @@ class ManagerService:
         if not data:
             raise APIException("No data provided", status.HTTP_400_BAD_REQUEST)
         self.serialize_data(data)
-        payload = get_payload(self.headers)
-        if payload is None:
+        principal = get_principal(self.request)
+        if principal is None:
             raise APIException("Failed to create manager", status.HTTP_401_UNAUTHORIZED)
-        if payload["role"] != "SUPER_ADMIN":
+        if principal.role != "SUPER_ADMIN":
             return Response(status=status.HTTP_401_UNAUTHORIZED)
 
         with transaction.atomic():
@@ -87,6 +90,7 @@ class ManagerService:
                     raise APIException(
                         "Failed to create manager", status.HTTP_400_BAD_REQUEST
                     )
+        scopes.invalidate(user_id)
         manager_dict = convert_tuples_to_dicts(manager, columns)[0]
         return Response(manager_dict, status=status.HTTP_201_CREATED)
 
@@ -104,9 +108,12 @@ class ManagerService:
                 UPDATE core_user
                 SET password = %s, updated_at = NOW()
                 WHERE email = %s
+                RETURNING uuid
                 """,
                 [hashed_password, email],
             )
+            for (user_id,) in c.fetchall():
+                invalidate_cached_user(user_id)
         return Response(status=status.HTTP_200_OK)
 
     def update_manager(self, uuid):
@@ -153,15 +160,16 @@ class ManagerService:
         manager = managerSelector.get_manager_by_id(uuid)
         if manager is None:
             return APIException("Manager not found", status.HTTP_404_NOT_FOUND)
-        with connection.cursor() as c:
-            c.execute(
-                "DELETE FROM profiles_userprofile WHERE uuid = %s;",
-                [uuid],
-            )
-            c.execute(
-                "DELETE FROM core_user WHERE email = %s;",
-                [manager.get("email", "")],
+        with transaction.atomic():
+            user_ids = list(
+                UserProfile.objects.filter(pk=uuid).values_list("user_id", flat=True)
             )
+            catalog_stats.remove_manager(uuid)
+            # Cascades to the profile and its export jobs and detaches its artists
+            User.objects.filter(pk__in=user_ids).delete()
+            for user_id in user_ids:
+                invalidate_cached_user(user_id)
+                scopes.invalidate(user_id)
         return manager
 
     def update_manager_(self, uuid):
@@ -176,36 +184,40 @@ class ManagerService:
         if data.get("is_active") is not None or data.get("email") is not None:
             new_email = data.pop("email", manager.get("email", ""))
             is_active = data.pop("is_active", manager.get("is_active", False))
-            with connection.cursor() as c:
-                c.execute(
-                    """
-                UPDATE core_user
-                SET is_active = %s, email = %s, updated_at = NOW()
-                WHERE email = %s
-                """,
-                    [is_active, new_email, manager.get("email", None)],
-                )
+            with transaction.atomic():
+                with connection.cursor() as c:
+                    c.execute(
+                        """
+                    UPDATE core_user
+                    SET is_active = %s, email = %s, updated_at = NOW()
+                    WHERE email = %s
+                    RETURNING uuid
+                    """,
+                        [is_active, new_email, manager.get("email", None)],
+                    )
+                    for (user_id,) in c.fetchall():
+                        invalidate_cached_user(user_id)
 
-            with connection.cursor() as c:
-                c.execute(
-                    """
-                UPDATE profiles_userprofile
-                SET first_name = %s, last_name = %s, phone = %s, gender = %s, address = %s, dob = %s, updated_at = NOW()
-                WHERE uuid = %s
-                RETURNING uuid, first_name, last_name, phone, gender, address, dob
-                """,
-                    [
-                        data.get("first_name", manager.get("first_name", "")),
-                        data.get("last_name", manager.get("last_name", "")),
-                        data.get("phone", manager.get("phone", "")),
-                        data.get("gender", manager.get("gender", "")),
-                        data.get("address", manager.get("address", "")),
-                        data.get("dob", manager.get("dob", "")),
-                        uuid,
-                    ],
-                )
-                manager = c.fetchone()
-                columns = [col[0] for col in c.description]
+                with connection.cursor() as c:
+                    c.execute(
+                        """
+                    UPDATE profiles_userprofile
+                    SET first_name = %s, last_name = %s, phone = %s, gender = %s, address = %s, dob = %s, updated_at = NOW()
+                    WHERE uuid = %s
+                    RETURNING uuid, first_name, last_name, phone, gender, address, dob
+                    """,
+                        [
+                            data.get("first_name", manager.get("first_name", "")),
+                            data.get("last_name", manager.get("last_name", "")),
+                            data.get("phone", manager.get("phone", "")),
+                            data.get("gender", manager.get("gender", "")),
+                            data.get("address", manager.get("address", "")),
+                            data.get("dob", manager.get("dob", "")),
+                            uuid,
+                        ],
+                    )
+                    manager = c.fetchone()
+                    columns = [col[0] for col in c.description]
             manager_dict = convert_tuples_to_dicts(manager, columns)[0]
             serializer = UserProfileSerializer(manager_dict)
             return Response(serializer.data, status=status.HTTP_200_OK)
@@ -0,0 +1,24 @@
+from apps.core.models import User
+from apps.core.testing import CatalogTestCase
+from apps.users.authentication import user_cache
+
+
+class DeleteManagerTests(CatalogTestCase):
+    def test_deleted_manager_is_logged_out_on_commit(self):
+        manager = self.client_for("ARTIST_MANAGER")
+        self.assertEqual(manager.get("/api/v1/artists/").status_code, 200)
+        with self.captureOnCommitCallbacks(execute=True):
+            response = self.client_for("SUPER_ADMIN").delete(
+                f"/api/v1/profiles/{self.ids['manager']}/"
+            )
+            self.assertEqual(response.status_code, 200)
+            # The manager and the admin: cleared before the commit, the old
+            # row could be cached again
+            self.assertEqual(user_cache.stats()["size"], 2)
+        self.assertEqual(user_cache.stats()["size"], 1)
+        self.assertEqual(manager.get("/api/v1/artists/").status_code, 403)
+
+    def test_deactivated_user_is_logged_out(self):
+        artist = self.client_for("ARTIST")
+        User.objects.filter(email="artist0-0@budget.test").update(is_active=False)
+        self.assertEqual(artist.get("/api/v1/musics/").status_code, 403)
@@ -1,6 +1,8 @@
 from django.contrib import admin
 
+from apps.core import scopes
 from apps.core.models import User, UserProfile
+from apps.users.authentication import invalidate_cached_user
 
 
 class UserProfileInline(admin.StackedInline):
@@ -26,3 +28,20 @@ class UserAdmin(admin.ModelAdmin):
         if obj.password:
             obj.set_password(obj.password)
         super().save_model(request, obj, form, change)
+        invalidate_cached_user(obj.uuid)
+
+    def save_related(self, request, form, formsets, change):
+        super().save_related(request, form, formsets, change)
+        scopes.invalidate(form.instance.uuid)
+
+    def delete_model(self, request, obj):
+        super().delete_model(request, obj)
+        invalidate_cached_user(obj.uuid)
+        scopes.invalidate(obj.uuid)
+
+    def delete_queryset(self, request, queryset):
+        user_ids = list(queryset.values_list("uuid", flat=True))
+        super().delete_queryset(request, queryset)
+        for user_id in user_ids:
+            invalidate_cached_user(user_id)
+            scopes.invalidate(user_id)
@@ -1,13 +1,36 @@
 import jwt
 from django.conf import settings
 from django.contrib.auth import get_user_model
+from django.db import transaction
 from jwt.exceptions import DecodeError, ExpiredSignatureError
 from rest_framework import status
 from rest_framework.authentication import BaseAuthentication
 from rest_framework.exceptions import APIException, AuthenticationFailed
 
+from apps.core.cache import LRUCache
+from apps.users.principal import Principal
+
 User = get_user_model()
 
+# Users already confirmed for a given (user_id, iat) token, so repeated
+# requests with the same token skip the users-table lookup.
+user_cache = LRUCache(
+    maxsize=getattr(settings, "JWT_USER_CACHE_SIZE", 1024),
+    ttl=getattr(settings, "JWT_USER_CACHE_TTL", 300),
+)
+
+
+def invalidate_cached_user(user_id):
+    """
+    Forget every cached token of a user (password/role change, deletion) once
+    the current transaction commits. Cleared any earlier, a request landing
+    before the commit would cache the old row again for the whole TTL.
+    """
+    user_id = str(user_id)
+    transaction.on_commit(
+        lambda: user_cache.delete_where(lambda key: key[0] == user_id)
+    )
+
 
 class JWTAuthentication(BaseAuthentication):
     def authenticate(self, request):
@@ -34,7 +57,7 @@ class JWTAuthentication(BaseAuthentication):
         if user is None:
             raise AuthenticationFailed("Invalid token")
 
-        return user, token
+        return user, Principal.from_payload(payload)
 
     def get_token_from_request(self, request):
         """Extract token from Authorization header"""
@@ -45,8 +68,17 @@ class JWTAuthentication(BaseAuthentication):
 
     def get_user_from_payload(self, payload):
         """Fetch user from decoded JWT payload"""
+        key = (str(payload["user_id"]), payload.get("iat"))
+        user = user_cache.get(key)
+        if user is not None:
+            return user
         try:
-            user = User.objects.get(uuid=payload["user_id"])
+            user = User.objects.get(uuid=payload["user_id"], is_active=True)
         except User.DoesNotExist:
             return None
+        user_cache.set(key, user)
         return user
+
+    @staticmethod
+    def cache_stats():
+        return user_cache.stats()
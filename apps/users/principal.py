@@ -0,0 +1,57 @@
+from uuid import UUID
+
+from apps.core import scopes
+
+
+class Principal:
+    """
+    The authenticated caller of a request.
+
+    Built once by ``JWTAuthentication`` from the verified token and carried as
+    ``request.auth``, so selectors and services read the role and user id from
+    it instead of decoding the Authorization header again. The artist and
+    manager profile uuids come from the token's scope claims when present and
+    are otherwise resolved through ``apps.core.scopes`` on first access.
+    """
+
+    def __init__(self, user_id, role, email=None, scope_ids=None):
+        self.user_id = str(user_id)
+        self.role = role
+        self.email = email
+        self._scope_ids = dict(scope_ids or {})
+
+    @classmethod
+    def from_payload(cls, payload):
+        scope_ids = {}
+        for scope in (scopes.ARTIST, scopes.MANAGER):
+            try:
+                scope_ids[scope] = UUID(payload[scope])
+            except (KeyError, TypeError, ValueError):
+                continue
+        return cls(
+            payload["user_id"], payload.get("role"), payload.get("email"), scope_ids
+        )
+
+    def resolve_scope(self, scope):
+        if scope not in self._scope_ids:
+            self._scope_ids[scope] = scopes.resolve(self.user_id, scope)
+        return self._scope_ids[scope]
+
+    @property
+    def artist_id(self):
+        return self.resolve_scope(scopes.ARTIST)
+
+    @property
+    def manager_id(self):
+        return self.resolve_scope(scopes.MANAGER)
+
+    def __repr__(self):
+        return f"<Principal {self.role} {self.user_id}>"
+
+
+def get_principal(request):
+    """Return the request's ``Principal``, or None if it is not authenticated."""
+    principal = getattr(request, "auth", None)
+    if isinstance(principal, Principal):
+        return principal
+    return None
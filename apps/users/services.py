@@ -8,8 +8,10 @@ from rest_framework import status
 from rest_framework.exceptions import APIException
 from rest_framework.response import Response
 
+from apps.core import scopes
 from apps.core.models import User
 from apps.core.utils import convert_tuples_to_dicts
+from apps.users.authentication import invalidate_cached_user
 from apps.users.serializers import UserLoginSerializer, UserRegistrationSerializer
 from apps.users.utils import JWTManager, authenticate, send_follow_email
 
@@ -80,7 +82,8 @@ class UserService:
     def register_user(data):
         with transaction.atomic():
             user = UserService.create_user(data)
-            return {"user": user["email"]}
+        scopes.invalidate(user["uuid"])
+        return {"user": user["email"]}
 
     def login_user(self):
         data = self.data
@@ -164,6 +167,7 @@ class UserService:
                 raise APIException(
                     "Failed to update password", status.HTTP_400_BAD_REQUEST
                 )
+            invalidate_cached_user(user[0])
 
         cache.delete(f"reset_token_{token}")
         return Response(status=status.HTTP_200_OK)
@@ -1,6 +1,7 @@
 from django.urls import path
 
 from .views import (
+    AuthCacheStatsView,
     GetUserView,
     RefreshTokenView,
     RequestForgetPasswordView,
@@ -13,6 +14,7 @@ urlpatterns = [
     path("register/", UserRegistrationView.as_view(), name="register"),
     path("login/", UserLoginView.as_view(), name="login"),
     path("auth/refresh/", RefreshTokenView.as_view(), name="refresh"),
+    path("auth/cache-stats/", AuthCacheStatsView.as_view(), name="auth-cache-stats"),
     path("me/", GetUserView.as_view(), name="me"),
     path(
         "forget-password/", RequestForgetPasswordView.as_view(), name="forget-password"
@@ -7,6 +7,7 @@ from django.contrib.auth.hashers import check_password
 from django.core.mail import EmailMessage
 from django.db import connection
 
+from apps.core import scopes
 from apps.core.utils import convert_tuples_to_dicts
 
 
@@ -19,13 +20,17 @@ class JWTManager:
         user = self.user
         if not user:
             return None
+        user_id = str(user.get("uuid", None) or user.get("user_id", None))
+        # Artist/manager profile uuid, so requests can skip resolving it
+        scope_claims = scopes.token_claims(user_id, user.get("role", None))
         # Access Token
         access_payload = {
-            "user_id": str(user.get("uuid", None) or user.get("user_id", None)),
+            "user_id": user_id,
             "email": user.get("email", None),
             "role": user.get("role", None),
             "exp": datetime.datetime.utcnow() + settings.JWT_EXPIRATION_DELTA,
             "iat": datetime.datetime.utcnow(),
+            **scope_claims,
         }
         access_token = jwt.encode(
             access_payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
@@ -33,11 +38,12 @@ class JWTManager:
 
         # Refresh Token
         refresh_payload = {
-            "user_id": str(user.get("uuid", None) or user.get("user_id", None)),
+            "user_id": user_id,
             "email": user.get("email", None),
             "role": user.get("role", None),
             "exp": datetime.datetime.utcnow() + settings.JWT_EXPIRATION_REFRESH_DELTA,
             "iat": datetime.datetime.utcnow(),
+            **scope_claims,
         }
         refresh_token = jwt.encode(
             refresh_payload, settings.JWT_SECRET_KEY, algorithm=settings.JWT_ALGORITHM
@@ -122,10 +128,6 @@ def authenticate(email, raw_password):
     return None
 
 
-def get_payload(headers):
-    return JWTManager.decode_jwt_token(headers.get("Authorization", "").split(" ")[1])
-
-
 def send_follow_email(subject, message, from_email, to_email):
     email = EmailMessage(subject, message, from_email, [to_email])
 
@@ -5,8 +5,10 @@ from rest_framework.views import APIView
 
 from apps.artists.selectors import ArtistSelector
 from apps.profiles.selectors import ManagerSelector
+from apps.users.authentication import JWTAuthentication
 from apps.users.services import UserService
-from apps.users.utils import JWTManager, get_payload
+from apps.users.principal import get_principal
+from apps.users.utils import JWTManager
 
 
 class UserRegistrationView(APIView):
@@ -60,10 +62,10 @@ class RefreshTokenView(APIView):
 
 class GetUserView(APIView):
     def get(self, request):
-        payload = get_payload(request.headers)
-        if payload is None:
+        principal = get_principal(request)
+        if principal is None:
             return Response(status=status.HTTP_401_UNAUTHORIZED)
-        if payload["role"] == "ARTIST":
+        if principal.role == "ARTIST":
             artistSelector = ArtistSelector(request)
             return artistSelector.get_currect_artist()
         else:
@@ -87,3 +89,17 @@ class ResetPasswordView(APIView):
     def post(self, request):
         userService = UserService(request, request.data)
         return userService.reset_password()
+
+
+class AuthCacheStatsView(APIView):
+    """
+    Hit/miss counters of the authenticated-user cache, for sizing it
+    """
+
+    def get(self, request):
+        if request.user.role != "SUPER_ADMIN":
+            return Response(
+                {"message": "You are not authorized to view cache stats"},
+                status=status.HTTP_403_FORBIDDEN,
+            )
+        return Response(JWTAuthentication.cache_stats(), status=status.HTTP_200_OK)
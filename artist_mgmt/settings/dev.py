@@ -36,6 +36,20 @@ JWT_EXPIRATION_DELTA = datetime.timedelta(
 JWT_EXPIRATION_REFRESH_DELTA = datetime.timedelta(
     days=int(os.getenv("JWT_EXPIRATION_REFRESH_DELTA_DAYS", 3))
 )
+JWT_USER_CACHE_SIZE = int(os.getenv("JWT_USER_CACHE_SIZE", 1024))
+JWT_USER_CACHE_TTL = int(os.getenv("JWT_USER_CACHE_TTL", 300))
+SCOPE_CACHE_SIZE = int(os.getenv("SCOPE_CACHE_SIZE", 4096))
+SCOPE_CACHE_TTL = int(os.getenv("SCOPE_CACHE_TTL", 3600))
+EXPORT_WORKERS = int(os.getenv("EXPORT_WORKERS", 2))
+# Build list pages as JSON in PostgreSQL (see apps.core.json_lists)
+SQL_JSON_LISTS = os.getenv("SQL_JSON_LISTS", "0") == "1"
+# Server-Timing header and a log line per request (see apps.core.middleware)
+QUERY_TIMING = os.getenv("QUERY_TIMING", "1") == "1"
+# Per-statement percentiles (see apps.core.fingerprints)
+QUERY_FINGERPRINTS = os.getenv("QUERY_FINGERPRINTS", "1") == "1"
+QUERY_STATS_WINDOW = int(os.getenv("QUERY_STATS_WINDOW", 300))
+QUERY_STATS_MAX_FINGERPRINTS = int(os.getenv("QUERY_STATS_MAX_FINGERPRINTS", 500))
+QUERY_STATS_DIR = os.getenv("QUERY_STATS_DIR", str(BASE_DIR / "var" / "query_stats"))
 
 # Logging
 LOGGING = {
@@ -53,6 +67,11 @@ LOGGING = {
             "level": "INFO",
             "propagate": True,
         },
+        "apps.core.middleware": {
+            "handlers": ["console"],
+            "level": "INFO",
+            "propagate": False,
+        },
         # Add your custom app logger
         "apps.musics": {
             "handlers": ["console"],
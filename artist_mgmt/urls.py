@@ -30,6 +30,7 @@ urlpatterns = [
     path(f"{API_PREFIX}/musics/", include("apps.musics.urls")),
     path(f"{API_PREFIX}/profiles/", include("apps.profiles.urls")),
     path(f"{API_PREFIX}/albums/", include("apps.albums.urls")),
+    path(f"{API_PREFIX}/", include("apps.core.urls")),
 ]
 
 if settings.DEBUG:
@@ -0,0 +1,124 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the orjson renderer and parser against DRF's JSON classes.
+
+Renders a musics list page (the paginated envelope around the compiled
+serializer's output) with ``JSONRenderer`` and ``ORJSONRenderer`` and parses
+a bulk import body (``{"rows": [...]}``) with ``JSONParser`` and
+``ORJSONParser``, checks that both sides agree and reports the time of each.
+No database is needed.
+
+    python benchmarks/bench_json.py [--items 1000] [--rows 10000] [--repeat 5]
+"""
+
+import argparse
+import io
+import os
+import sys
+import time
+import uuid
+from collections import OrderedDict
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "artist_mgmt.settings.dev")
+
+import django  # noqa: E402
+
+django.setup()
+
+from bench_serializers import (  # noqa: E402
+    make_album,
+    make_artist,
+    make_manager,
+    make_music,
+)
+from rest_framework.parsers import JSONParser  # noqa: E402
+from rest_framework.renderers import JSONRenderer  # noqa: E402
+
+from apps.core.parsers import ORJSONParser  # noqa: E402
+from apps.core.renderers import ORJSONRenderer  # noqa: E402
+from apps.musics.serializers import compiled_music_serializer  # noqa: E402
+
+
+def musics_page(items):
+    managers = [make_manager() for _ in range(10)]
+    artists = [make_artist(managers[i % 10]) for i in range(items)]
+    musics = [
+        make_music(make_album(artists[i], i), artists[i], i) for i in range(items)
+    ]
+    return OrderedDict(
+        [
+            ("count", items * 10),
+            ("next", "http://testserver/api/v1/musics/?page=2"),
+            ("previous", None),
+            ("results", compiled_music_serializer.many(musics)),
+        ]
+    )
+
+
+def import_body(rows):
+    album_id, artist_id = uuid.uuid4(), uuid.uuid4()
+    payload = {
+        "rows": [
+            {
+                "title": f"Track {index} é",
+                "genre": "POP",
+                "album_id": str(album_id),
+                "artist_id": str(artist_id),
+            }
+            for index in range(rows)
+        ]
+    }
+    return JSONRenderer().render(payload)
+
+
+def best_of(func, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def report(name, baseline, fast):
+    print(
+        f"{name:<22} DRF {baseline * 1000:8.1f} ms  orjson {fast * 1000:7.1f} ms"
+        f"  ({baseline / fast:4.1f}x)"
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--rows", type=int, default=10_000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    page = musics_page(args.items)
+    drf_renderer, orjson_renderer = JSONRenderer(), ORJSONRenderer()
+    if drf_renderer.render(page) != orjson_renderer.render(page):
+        sys.exit("musics page: ORJSONRenderer output differs from JSONRenderer")
+
+    body = import_body(args.rows)
+    drf_parser, orjson_parser = JSONParser(), ORJSONParser()
+    if drf_parser.parse(io.BytesIO(body)) != orjson_parser.parse(io.BytesIO(body)):
+        sys.exit("import body: ORJSONParser result differs from JSONParser")
+
+    print(f"best of {args.repeat}")
+    report(
+        f"render {args.items} musics",
+        best_of(lambda: drf_renderer.render(page), args.repeat),
+        best_of(lambda: orjson_renderer.render(page), args.repeat),
+    )
+    report(
+        f"parse {args.rows} rows",
+        best_of(lambda: drf_parser.parse(io.BytesIO(body)), args.repeat),
+        best_of(lambda: orjson_parser.parse(io.BytesIO(body)), args.repeat),
+    )
+    print(f"{len(JSONRenderer().render(page))} byte page, {len(body)} byte body")
+
+
+if __name__ == "__main__":
+    main()
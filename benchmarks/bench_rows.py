@@ -0,0 +1,108 @@
+#!/usr/bin/env python3
+"""
+Microbenchmark of the raw-row mapping layer.
+
+Maps synthetic ``artists_artist`` rows the old way
+(``convert_tuples_to_dicts`` then ``Artist(**row)``) and through
+``apps.core.rows`` records, and reports the time and the peak memory
+allocated by each. No database is needed.
+
+    python benchmarks/bench_rows.py [--rows 100000] [--repeat 3]
+"""
+
+import argparse
+import datetime
+import os
+import sys
+import time
+import tracemalloc
+import uuid
+from itertools import starmap
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "artist_mgmt.settings.dev")
+
+import django  # noqa: E402
+
+django.setup()
+
+from apps.core.models import Artist  # noqa: E402
+from apps.core.rows import model_record_class  # noqa: E402
+from apps.core.utils import convert_tuples_to_dicts  # noqa: E402
+
+COLUMNS = [field.attname for field in Artist._meta.concrete_fields]
+
+
+def make_rows(count):
+    now = datetime.datetime.now(datetime.timezone.utc)
+    values = {
+        "uuid": None,
+        "created_at": now,
+        "updated_at": now,
+        "name": "Artist",
+        "dob": datetime.date(1990, 1, 1),
+        "gender": "F",
+        "address": "Somewhere",
+        "first_released_year": 2010,
+        "no_of_album_released": 3,
+        "user_id": uuid.uuid4(),
+        "manager_id": uuid.uuid4(),
+    }
+    template = [values.get(column) for column in COLUMNS]
+    position = COLUMNS.index("uuid")
+    rows = []
+    for _ in range(count):
+        row = list(template)
+        row[position] = uuid.uuid4()
+        rows.append(tuple(row))
+    return rows
+
+
+def map_models(rows):
+    return [Artist(**row) for row in convert_tuples_to_dicts(rows, COLUMNS)]
+
+
+def map_records(rows):
+    return list(starmap(model_record_class(Artist, tuple(COLUMNS)), rows))
+
+
+def measure(func, rows, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(rows)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    tracemalloc.start()
+    result = func(rows)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del result
+    return best, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--rows", type=int, default=100_000)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    rows = make_rows(args.rows)
+    results = {
+        "dicts + Model(**row)": measure(map_models, rows, args.repeat),
+        "slots records": measure(map_records, rows, args.repeat),
+    }
+
+    baseline_time, baseline_peak = results["dicts + Model(**row)"]
+    print(f"{args.rows} rows, best of {args.repeat}")
+    for name, (elapsed, peak) in results.items():
+        print(
+            f"{name:<22} {elapsed * 1000:9.1f} ms  {peak / 2**20:8.1f} MiB peak"
+            f"  ({baseline_time / elapsed:4.1f}x time,"
+            f" {baseline_peak / peak:4.1f}x memory)"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,190 @@
+#!/usr/bin/env python3
+"""
+Benchmark of the compiled read serializers against DRF.
+
+Renders a page of synthetic musics, each with its album, the album's owner
+and the artist (both with manager and users attached), through
+``MusicSerializer(..., many=True).data`` and through the compiled
+``compiled_music_serializer``, checks that both produce the same data and
+reports the time per page. The artist and manager pages are measured the
+same way. No database is needed.
+
+    python benchmarks/bench_serializers.py [--items 1000] [--repeat 5]
+"""
+
+import argparse
+import datetime
+import os
+import sys
+import time
+import uuid
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), ".."))
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "artist_mgmt.settings.dev")
+
+import django  # noqa: E402
+
+django.setup()
+
+from apps.albums.serializers import (  # noqa: E402
+    AlbumSerializer,
+    compiled_album_serializer,
+)
+from apps.artists.serializers import (  # noqa: E402
+    ArtistSerializer,
+    compiled_artist_serializer,
+)
+from apps.core.models import Album, Artist, Music, User, UserProfile  # noqa: E402
+from apps.core.rows import model_record_class  # noqa: E402
+from apps.musics.serializers import (  # noqa: E402
+    MusicSerializer,
+    compiled_music_serializer,
+)
+from apps.profiles.serializers import (  # noqa: E402
+    UserProfileSerializer,
+    compiled_profile_serializer,
+)
+
+NOW = datetime.datetime(2024, 5, 1, 10, 11, 12, 345678, tzinfo=datetime.timezone.utc)
+
+
+def record(model, **values):
+    columns = tuple(field.attname for field in model._meta.concrete_fields)
+    cls = model_record_class(model, columns)
+    instance = cls(*[values.get(column) for column in columns])
+    for name, value in values.items():
+        if name not in columns:
+            setattr(instance, name, value)
+    return instance
+
+
+def make_user(role):
+    return record(
+        User,
+        uuid=uuid.uuid4(),
+        email=f"{uuid.uuid4().hex[:8]}@example.com",
+        role=role,
+        is_active=True,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+
+def make_manager():
+    user = make_user("ARTIST_MANAGER")
+    return record(
+        UserProfile,
+        uuid=uuid.uuid4(),
+        first_name="Man",
+        last_name="Ager",
+        phone="9800000000",
+        gender="M",
+        address="Kathmandu",
+        dob=datetime.date(1980, 1, 1),
+        user_id=user.uuid,
+        user=user,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+
+def make_artist(manager):
+    user = make_user("ARTIST")
+    return record(
+        Artist,
+        uuid=uuid.uuid4(),
+        name="Artist",
+        dob=datetime.date(1990, 1, 1),
+        gender="F",
+        address="Pokhara",
+        first_released_year=2012,
+        no_of_album_released=4,
+        user_id=user.uuid,
+        user=user,
+        manager_id=manager.uuid,
+        manager=manager,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+
+def make_album(owner, index):
+    return record(
+        Album,
+        uuid=uuid.uuid4(),
+        name=f"Album {index}",
+        image=None,
+        no_of_tracks=10,
+        owner_id=owner.uuid,
+        owner=owner,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+
+def make_music(album, artist, index):
+    return record(
+        Music,
+        uuid=uuid.uuid4(),
+        title=f"Track {index}",
+        genre="POP",
+        album_id=album.uuid,
+        album=album,
+        artist_id=artist.uuid,
+        artist=artist,
+        created_at=NOW,
+        updated_at=NOW,
+    )
+
+
+def best_of(func, items, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(items)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--items", type=int, default=1000)
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    managers = [make_manager() for _ in range(10)]
+    artists = [make_artist(managers[i % 10]) for i in range(args.items)]
+    albums = [make_album(artists[i], i) for i in range(args.items)]
+    musics = [make_music(albums[i], artists[i], i) for i in range(args.items)]
+
+    pages = [
+        ("musics", musics, MusicSerializer, compiled_music_serializer),
+        ("albums", albums, AlbumSerializer, compiled_album_serializer),
+        ("artists", artists, ArtistSerializer, compiled_artist_serializer),
+        (
+            "managers",
+            managers * (args.items // 10),
+            UserProfileSerializer,
+            compiled_profile_serializer,
+        ),
+    ]
+
+    print(f"{args.items}-item pages, best of {args.repeat}")
+    for name, items, serializer_class, compiled in pages:
+        expected = serializer_class(items, many=True).data
+        if compiled.many(items) != expected:
+            sys.exit(f"{name}: compiled output differs from DRF")
+
+        drf = best_of(
+            lambda items: serializer_class(items, many=True).data, items, args.repeat
+        )
+        fast = best_of(compiled.many, items, args.repeat)
+        print(
+            f"{name:<9} DRF {drf * 1000:8.1f} ms  compiled {fast * 1000:7.1f} ms"
+            f"  ({drf / fast:4.1f}x)"
+        )
+
+
+if __name__ == "__main__":
+    main()
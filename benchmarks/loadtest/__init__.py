@@ -0,0 +1,24 @@
+"""
+HTTP load benchmark of the hot API endpoints.
+
+Runs fixed-duration scenarios (the musics and artists lists as each role,
+the artist count, album detail, login and bulk import) against a running
+server whose database was filled by ``manage.py seed_catalog``, with a
+number of concurrent keep-alive connections, and reports the throughput and
+latency percentiles of each scenario as JSON. The JWTs are minted directly
+for the seeded admin, ``manager0`` and ``artist0`` users, so the settings
+must be the server's (``DJANGO_SETTINGS_MODULE``, the same database and
+``JWT_SECRET_KEY``).
+
+    python manage.py seed_catalog --flush
+    DEBUG=0 python manage.py runserver --noreload  # or gunicorn
+    python -m benchmarks.loadtest run --output after.json [--baseline before.json]
+    python -m benchmarks.loadtest compare before.json after.json
+
+``compare`` (and ``run --baseline``) prints the change of every scenario
+against a stored run and exits non-zero when ``--fail-above`` is given and a
+scenario lost more than that percentage of throughput or p95 latency.
+
+The bulk import scenario writes musics, so it is the last by default and
+repeated runs grow the catalog; reseed before measuring a baseline.
+"""
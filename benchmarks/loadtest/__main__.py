@@ -0,0 +1,200 @@
+import argparse
+import datetime
+import json
+import os
+import subprocess
+import sys
+
+ROOT = os.path.join(os.path.dirname(os.path.abspath(__file__)), "..", "..")
+sys.path.insert(0, ROOT)
+os.environ.setdefault("DJANGO_SETTINGS_MODULE", "artist_mgmt.settings.dev")
+
+import django  # noqa: E402
+
+django.setup()
+
+from benchmarks.loadtest import driver, scenarios  # noqa: E402
+
+# Compared between runs, with the direction that counts as a regression
+COMPARED = (
+    ("throughput_rps", "req/s", -1),
+    ("p50", "p50 ms", 1),
+    ("p95", "p95 ms", 1),
+    ("p99", "p99 ms", 1),
+)
+
+
+def git_revision():
+    try:
+        return subprocess.run(
+            ["git", "describe", "--always", "--dirty"],
+            cwd=ROOT,
+            capture_output=True,
+            text=True,
+            check=True,
+        ).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def metric(summary, name):
+    if name in summary:
+        return summary[name]
+    return (summary["latency_ms"] or {}).get(name)
+
+
+def change(before, after):
+    if not before or after is None:
+        return None
+    return (after - before) / before * 100
+
+
+def compare(baseline, current, fail_above=None, out=sys.stdout):
+    """Print the change of every scenario; return the regressed scenarios."""
+    regressions = []
+    header = "".join(f"{label:>28}" for _, label, _ in COMPARED)
+    print(f"{'scenario':<24}{header}", file=out)
+    for name, after in current["scenarios"].items():
+        before = baseline["scenarios"].get(name)
+        if before is None:
+            print(f"{name:<24} not in the baseline", file=out)
+            continue
+        cells = []
+        for key, _, worse in COMPARED:
+            old, new = metric(before, key), metric(after, key)
+            delta = change(old, new)
+            if delta is None:
+                cells.append(f"{'-':>28}")
+                continue
+            cells.append(f"{old:>10.1f} -> {new:>8.1f} {delta:+4.0f}%")
+            if (
+                fail_above is not None
+                and key in ("throughput_rps", "p95")
+                and delta * worse > fail_above
+            ):
+                regressions.append(f"{name} {key} {delta:+.1f}%")
+        print(f"{name:<24}" + "".join(cells), file=out)
+    return regressions
+
+
+def run(args):
+    selected = [s for s in scenarios.SCENARIOS if s.name in args.scenarios]
+    fixtures = scenarios.load_fixtures(args.domain, args.password, args.bulk_rows)
+    result = {
+        "meta": {
+            "started_at": datetime.datetime.now(datetime.timezone.utc).isoformat(),
+            "revision": git_revision(),
+            "base_url": args.base_url,
+            "concurrency": args.concurrency,
+            "duration_s": args.duration,
+            "warmup_s": args.warmup,
+            "bulk_rows": args.bulk_rows,
+            "catalog": scenarios.catalog_size(),
+        },
+        "scenarios": {},
+    }
+    for scenario in selected:
+        scenario.prepare(fixtures)
+        summary = driver.run(
+            args.base_url,
+            scenario,
+            args.concurrency,
+            args.duration,
+            warmup=args.warmup,
+            timeout=args.timeout,
+        )
+        result["scenarios"][scenario.name] = summary
+        latency = summary["latency_ms"] or {}
+        print(
+            f"{scenario.name:<24} {summary['throughput_rps']:8.1f} req/s"
+            f"  p50 {latency.get('p50', 0):7.1f} ms  p95 {latency.get('p95', 0):7.1f}"
+            f" ms  p99 {latency.get('p99', 0):7.1f} ms  errors {summary['errors']}",
+            file=sys.stderr,
+        )
+
+    output = json.dumps(result, indent=2) + "\n"
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output)
+    else:
+        sys.stdout.write(output)
+    if args.baseline:
+        with open(args.baseline) as f:
+            # Keep stdout for the JSON when it is not written to a file
+            out = sys.stdout if args.output else sys.stderr
+            return report(json.load(f), result, args.fail_above, out)
+    return 0
+
+
+def report(baseline, current, fail_above, out=sys.stdout):
+    regressions = compare(baseline, current, fail_above, out)
+    if regressions:
+        print(
+            f"Regressed by more than {fail_above}%: " + ", ".join(regressions),
+            file=out,
+        )
+        return 1
+    return 0
+
+
+def main():
+    parser = argparse.ArgumentParser(
+        prog="python -m benchmarks.loadtest",
+        description="HTTP load benchmark of the hot API endpoints",
+    )
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    run_parser = commands.add_parser("run", help="Run the scenarios")
+    run_parser.add_argument("--base-url", default="http://127.0.0.1:8000")
+    run_parser.add_argument(
+        "--scenarios",
+        nargs="+",
+        choices=scenarios.SCENARIO_NAMES,
+        default=scenarios.SCENARIO_NAMES,
+        metavar="SCENARIO",
+        help=f"Default: all ({', '.join(scenarios.SCENARIO_NAMES)})",
+    )
+    run_parser.add_argument("--concurrency", type=int, default=8)
+    run_parser.add_argument(
+        "--duration", type=float, default=10, help="Seconds measured per scenario"
+    )
+    run_parser.add_argument(
+        "--warmup",
+        type=float,
+        default=2,
+        help="Seconds run and discarded before each scenario",
+    )
+    run_parser.add_argument("--timeout", type=float, default=30)
+    run_parser.add_argument("--domain", default="seed.test")
+    run_parser.add_argument("--password", default="seed-password")
+    run_parser.add_argument(
+        "--bulk-rows", type=int, default=100, help="Rows per bulk import request"
+    )
+    run_parser.add_argument("--output", help="Write the JSON here, not to stdout")
+    run_parser.add_argument("--baseline", help="Compare with this stored run")
+    run_parser.add_argument("--fail-above", type=float)
+
+    compare_parser = commands.add_parser(
+        "compare", help="Compare a run with a stored baseline"
+    )
+    compare_parser.add_argument("baseline")
+    compare_parser.add_argument("current")
+    compare_parser.add_argument(
+        "--fail-above",
+        type=float,
+        help="Exit 1 if a scenario's throughput or p95 got worse by more than "
+        "this percentage",
+    )
+
+    args = parser.parse_args()
+    if args.command == "run":
+        return run(args)
+    with open(args.baseline) as f:
+        baseline = json.load(f)
+    with open(args.current) as f:
+        current = json.load(f)
+    return report(baseline, current, args.fail_above)
+
+
+if __name__ == "__main__":
+    sys.exit(main())
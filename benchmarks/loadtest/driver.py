@@ -0,0 +1,128 @@
+"""
+Load driver: runs one scenario from ``concurrency`` threads for a fixed
+duration, each thread on its own keep-alive ``http.client`` connection, and
+summarizes the latencies and statuses they recorded.
+"""
+
+import http.client
+import itertools
+import math
+import re
+import threading
+import time
+from collections import Counter
+from urllib.parse import urlsplit
+
+SERVER_TIMING_DB = re.compile(r"\bdb;dur=([\d.]+)")
+PERCENTILES = (50, 90, 95, 99)
+
+
+class Worker(threading.Thread):
+    def __init__(self, base_url, scenario, counter, deadline, timeout):
+        super().__init__(daemon=True)
+        url = urlsplit(base_url)
+        self.connection_class = (
+            http.client.HTTPSConnection
+            if url.scheme == "https"
+            else http.client.HTTPConnection
+        )
+        self.netloc = url.netloc
+        self.prefix = url.path.rstrip("/")
+        self.scenario = scenario
+        self.counter = counter
+        self.deadline = deadline
+        self.timeout = timeout
+        self.latencies = []
+        self.db_times = []
+        self.statuses = Counter()
+
+    def run(self):
+        connection = None
+        while time.perf_counter() < self.deadline:
+            path, body, headers = self.scenario.request(next(self.counter))
+            if connection is None:
+                connection = self.connection_class(self.netloc, timeout=self.timeout)
+            start = time.perf_counter()
+            try:
+                connection.request(
+                    self.scenario.method, self.prefix + path, body, headers
+                )
+                response = connection.getresponse()
+                response.read()
+            except (OSError, http.client.HTTPException) as e:
+                self.statuses[type(e).__name__] += 1
+                connection.close()
+                connection = None
+                continue
+            self.latencies.append(time.perf_counter() - start)
+            self.statuses[str(response.status)] += 1
+            match = SERVER_TIMING_DB.search(response.getheader("Server-Timing", ""))
+            if match:
+                self.db_times.append(float(match.group(1)))
+            if response.getheader("Connection", "").lower() == "close":
+                connection.close()
+                connection = None
+        if connection is not None:
+            connection.close()
+
+
+def percentile(ordered, fraction):
+    """Nearest-rank percentile of an already sorted list."""
+    return ordered[max(math.ceil(len(ordered) * fraction) - 1, 0)]
+
+
+def run(base_url, scenario, concurrency, duration, warmup=0, timeout=30):
+    """Run ``scenario`` and return its summary (``summarize``)."""
+    counter = itertools.count()
+    if warmup:
+        workers = start(base_url, scenario, counter, concurrency, warmup, timeout)
+        for worker in workers:
+            worker.join()
+    begin = time.perf_counter()
+    workers = start(base_url, scenario, counter, concurrency, duration, timeout)
+    for worker in workers:
+        worker.join()
+    return summarize(workers, time.perf_counter() - begin)
+
+
+def start(base_url, scenario, counter, concurrency, duration, timeout):
+    deadline = time.perf_counter() + duration
+    workers = [
+        Worker(base_url, scenario, counter, deadline, timeout)
+        for _ in range(concurrency)
+    ]
+    for worker in workers:
+        worker.start()
+    return workers
+
+
+def milliseconds(seconds):
+    return round(seconds * 1000, 3)
+
+
+def summarize(workers, elapsed):
+    latencies = sorted(itertools.chain.from_iterable(w.latencies for w in workers))
+    db_times = list(itertools.chain.from_iterable(w.db_times for w in workers))
+    statuses = sum((worker.statuses for worker in workers), Counter())
+    succeeded = sum(
+        count for status, count in statuses.items() if status[:1] in ("2", "3")
+    )
+    summary = {
+        "requests": sum(statuses.values()),
+        "errors": sum(statuses.values()) - succeeded,
+        "elapsed_s": round(elapsed, 3),
+        "throughput_rps": round(succeeded / elapsed, 2),
+        "statuses": dict(sorted(statuses.items())),
+        "latency_ms": None,
+        "db_ms_mean": round(sum(db_times) / len(db_times), 3) if db_times else None,
+    }
+    if latencies:
+        summary["latency_ms"] = {
+            "mean": milliseconds(sum(latencies) / len(latencies)),
+            **{
+                f"p{p}": milliseconds(percentile(latencies, p / 100))
+                for p in PERCENTILES
+            },
+            "max": milliseconds(latencies[-1]),
+        }
+    return summary
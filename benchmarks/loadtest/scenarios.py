@@ -0,0 +1,139 @@
+"""
+The benchmark scenarios and the seeded data they use.
+
+``load_fixtures`` reads the users, albums and login emails of the catalog
+loaded by ``seed_catalog`` and mints an access token per role; a
+``Scenario`` builds its ``index``-th request from them, cycling through the
+sampled albums and users so consecutive requests do not hit the same row.
+"""
+
+from collections import namedtuple
+
+import orjson
+from django.db import connection
+
+from apps.core.models import User
+from apps.users.utils import JWTManager
+
+API = "/api/v1"
+# Albums and artist users cycled through by the detail, import and login
+# scenarios
+SAMPLE = 1000
+
+Fixtures = namedtuple("Fixtures", "tokens albums emails password bulk_rows")
+
+
+class Scenario:
+    def __init__(self, name, role, method, path, body=None):
+        self.name = name
+        self.role = role
+        self.method = method
+        self.path = path
+        self.body = body
+        self.fixtures = None
+        self.headers = {}
+
+    def prepare(self, fixtures):
+        self.fixtures = fixtures
+        self.headers = {"Accept": "application/json"}
+        if self.role:
+            self.headers["Authorization"] = f"Bearer {fixtures.tokens[self.role]}"
+        if self.body:
+            self.headers["Content-Type"] = "application/json"
+
+    def request(self, index):
+        path = self.path(self.fixtures, index) if callable(self.path) else self.path
+        body = orjson.dumps(self.body(self.fixtures, index)) if self.body else None
+        return path, body, self.headers
+
+
+def album_path(fixtures, index):
+    album_id, _ = fixtures.albums[index % len(fixtures.albums)]
+    return f"{API}/albums/{album_id}/"
+
+
+def login_body(fixtures, index):
+    email = fixtures.emails[index % len(fixtures.emails)]
+    return {"email": email, "password": fixtures.password}
+
+
+def bulk_body(fixtures, index):
+    album_id, artist_id = fixtures.albums[index % len(fixtures.albums)]
+    return {
+        "rows": [
+            {
+                "title": f"Load test {index}-{row}",
+                "genre": "POP",
+                "album_id": album_id,
+                "artist_id": artist_id,
+            }
+            for row in range(fixtures.bulk_rows)
+        ]
+    }
+
+
+SCENARIOS = [
+    Scenario("musics-admin", "SUPER_ADMIN", "GET", f"{API}/musics/"),
+    Scenario("musics-manager", "ARTIST_MANAGER", "GET", f"{API}/musics/"),
+    Scenario("musics-artist", "ARTIST", "GET", f"{API}/musics/"),
+    Scenario("artists-admin", "SUPER_ADMIN", "GET", f"{API}/artists/"),
+    Scenario("artists-manager", "ARTIST_MANAGER", "GET", f"{API}/artists/"),
+    Scenario("artists-count-admin", "SUPER_ADMIN", "GET", f"{API}/artists/count/"),
+    Scenario(
+        "artists-count-manager", "ARTIST_MANAGER", "GET", f"{API}/artists/count/"
+    ),
+    Scenario("album-detail", "SUPER_ADMIN", "GET", album_path),
+    Scenario("login", None, "POST", f"{API}/login/", login_body),
+    Scenario("bulk-import", "SUPER_ADMIN", "POST", f"{API}/musics/bulk/", bulk_body),
+]
+SCENARIO_NAMES = [scenario.name for scenario in SCENARIOS]
+
+
+def role_emails(domain):
+    return {
+        "SUPER_ADMIN": f"admin@{domain}",
+        "ARTIST_MANAGER": f"manager0@{domain}",
+        "ARTIST": f"artist0@{domain}",
+    }
+
+
+def load_fixtures(domain, password, bulk_rows):
+    tokens = {}
+    for role, email in role_emails(domain).items():
+        user = User.objects.filter(email=email).values("uuid", "email", "role").first()
+        if user is None:
+            raise LookupError(f"{email} does not exist; run manage.py seed_catalog")
+        tokens[role], _ = JWTManager(user).generate_jwt_token()
+    with connection.cursor() as c:
+        c.execute(
+            """
+            SELECT uuid::text, owner_id::text
+            FROM albums_album
+            WHERE owner_id IS NOT NULL
+            ORDER BY uuid
+            LIMIT %s
+            """,
+            [SAMPLE],
+        )
+        albums = c.fetchall()
+        c.execute(
+            """
+            SELECT email FROM core_user
+            WHERE role = 'ARTIST' AND email LIKE %s
+            ORDER BY email
+            LIMIT %s
+            """,
+            [f"%@{domain}", SAMPLE],
+        )
+        emails = [row[0] for row in c.fetchall()]
+    return Fixtures(tokens, albums, emails, password, bulk_rows)
+
+
+def catalog_size():
+    """Row counts of the catalog tables, recorded with every run."""
+    sizes = {}
+    with connection.cursor() as c:
+        for table in ("core_user", "artists_artist", "albums_album", "musics_music"):
+            c.execute(f"SELECT count(*) FROM {table}")
+            sizes[table] = c.fetchone()[0]
+    return sizes